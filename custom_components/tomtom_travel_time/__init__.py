@@ -3,24 +3,68 @@
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from custom_components.tomtom_travel_time.coordinator import TomTomDataUpdateCoordinator
+from custom_components.tomtom_travel_time.const import CONF_ENTRY_TYPE, DOMAIN, ENTRY_TYPE_REACHABLE_RANGE, ENTRY_TYPE_ROUTE
+from custom_components.tomtom_travel_time.coordinator import TomTomDataUpdateCoordinator, TomTomReachableRangeCoordinator
+from custom_components.tomtom_travel_time.forecast import async_remove_forecast
+from custom_components.tomtom_travel_time.services import async_setup_services
+from custom_components.tomtom_travel_time.shared import async_acquire_coordinator, async_release_coordinator
+from custom_components.tomtom_travel_time.views import MetricsView, RouteGeometryView
 
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = {
+    ENTRY_TYPE_ROUTE: [Platform.SENSOR, Platform.BINARY_SENSOR],
+    ENTRY_TYPE_REACHABLE_RANGE: [Platform.BINARY_SENSOR],
+}
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)  # pylint: disable=invalid-name
 
-async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry[TomTomDataUpdateCoordinator]) -> bool:
+
+async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
+    """Set up the TomTom Travel Time integration."""
+    async_setup_services(hass)
+    hass.http.register_view(RouteGeometryView())
+    hass.http.register_view(MetricsView())
+
+    return True
+
+
+async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry[TomTomDataUpdateCoordinator | TomTomReachableRangeCoordinator]) -> bool:
     """Setup a config entry."""
     api_key = config_entry.data[CONF_API_KEY]
-    coordinator = TomTomDataUpdateCoordinator(hass, config_entry, api_key)
-    config_entry.runtime_data = coordinator
+    entry_type = config_entry.data.get(CONF_ENTRY_TYPE, ENTRY_TYPE_ROUTE)
+
+    if entry_type == ENTRY_TYPE_REACHABLE_RANGE:
+        coordinator = TomTomReachableRangeCoordinator(hass, config_entry, api_key)
+        config_entry.runtime_data = coordinator
+        await coordinator.async_config_entry_first_refresh()
+    else:
+        # Entries with an identical route share their coordinator, the options are part of the route, so a change moves the entry.
+        config_entry.runtime_data = await async_acquire_coordinator(hass, config_entry)
+        config_entry.async_on_unload(config_entry.add_update_listener(async_reload_entry))
 
-    await coordinator.async_config_entry_first_refresh()
-    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS[entry_type])
 
     return True
 
 
-async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry[TomTomDataUpdateCoordinator]) -> bool:
+async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry[TomTomDataUpdateCoordinator | TomTomReachableRangeCoordinator]) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
+    entry_type = config_entry.data.get(CONF_ENTRY_TYPE, ENTRY_TYPE_ROUTE)
+    unload_ok = await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS[entry_type])
+
+    if unload_ok and entry_type == ENTRY_TYPE_ROUTE:
+        await async_release_coordinator(hass, config_entry)
+
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the saved data of a removed config entry."""
+    await async_remove_forecast(hass, config_entry.entry_id)
+
+
+async def async_reload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(config_entry.entry_id)
@@ -0,0 +1,176 @@
+"""TomTom Travel Time routing backends."""
+
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from dataclasses import replace
+from typing import Any
+
+from aiohttp import ClientError, ClientTimeout
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.hass_dict import HassKey
+
+from custom_components.tomtom_travel_time.cache import TTLCache, async_get_cache, route_cache_key
+from custom_components.tomtom_travel_time.const import (
+    CONF_VEHICLE_TYPE,
+    DOMAIN,
+    LOCAL_ENGINE_PROFILES,
+    LOCAL_ENGINE_TIMEOUT,
+    LOCAL_ENGINE_TRAFFIC_MAX_SIZE,
+    LOCAL_ENGINE_TRAFFIC_TTL,
+)
+from custom_components.tomtom_travel_time.metrics import async_track_request
+from custom_components.tomtom_travel_time.model import RouteEstimate
+from tomtom_apis.models import LatLon
+from tomtom_apis.routing.models import Route
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_LOCAL_ENGINES: HassKey[dict[str, RoutingBackend]] = HassKey(f"{DOMAIN}_local_engines")
+DATA_TRAFFIC_DELAYS: HassKey[TTLCache[Hashable, float]] = HassKey(f"{DOMAIN}_traffic_delays")
+
+
+class RoutingBackendError(Exception):
+    """Error of a routing backend, like an engine that can't be reached or can't plan the route."""
+
+
+def route_points(route: Route) -> list[tuple[float, float]]:
+    """Return the points of a TomTom route, the legs share their start and end points so these are only included once."""
+    points: list[tuple[float, float]] = []
+    for leg in route.legs:
+        leg_points = [(point.latitude, point.longitude) for point in leg.points]
+        points.extend(leg_points[1:] if points and leg_points[:1] == points[-1:] else leg_points)
+    return points
+
+
+class RoutingBackend(ABC):  # pylint: disable=too-few-public-methods
+    """Engine that plans a route between locations with the options of an entry."""
+
+    name: str
+    available = True
+
+    @abstractmethod
+    async def async_route(self, locations: list[LatLon], options: Mapping[str, Any]) -> RouteEstimate:
+        """Return the route between the locations, raise RoutingBackendError when it can't be planned."""
+
+
+class TomTomRoutingBackend(RoutingBackend):  # pylint: disable=too-few-public-methods
+    """TomTom Routing API, with traffic. Requests go through the coordinator, so they use its key pool and route caches."""
+
+    name = "tomtom"
+
+    def __init__(self, request: Callable[[list[LatLon], Mapping[str, Any]], Awaitable[Route]]) -> None:
+        """Initialize with the function that requests a TomTom route."""
+        self._request = request
+
+    async def async_route(self, locations: list[LatLon], options: Mapping[str, Any]) -> RouteEstimate:
+        """Return the route between the locations, including the traffic delay."""
+        route = await self._request(locations, options)
+        return RouteEstimate(
+            duration=route.summary.travelTimeInSeconds - route.summary.trafficDelayInSeconds,
+            distance=route.summary.lengthInMeters,
+            delay=route.summary.trafficDelayInSeconds,
+            points=tuple(route_points(route)),
+        )
+
+
+class OSRMRoutingBackend(RoutingBackend):  # pylint: disable=too-few-public-methods
+    """Self-hosted engine with the OSRM route service, for distance and travel time without traffic, requests are free.
+
+    Engines like OSRM and Valhalla serve a single profile per service or select it by name, the profile in the path follows the vehicle type.
+    """
+
+    name = "osrm"
+
+    def __init__(self, hass: HomeAssistant, url: str) -> None:
+        """Initialize with the base URL of the engine."""
+        self.hass = hass
+        self._session = async_get_clientsession(hass)
+        self.url = url.rstrip("/")
+
+    async def async_route(self, locations: list[LatLon], options: Mapping[str, Any]) -> RouteEstimate:
+        """Return the route between the locations, without traffic."""
+        profile = LOCAL_ENGINE_PROFILES.get(options[CONF_VEHICLE_TYPE], LOCAL_ENGINE_PROFILES["car"])
+        # OSRM takes longitude before latitude.
+        coordinates = ";".join(f"{location.lon},{location.lat}" for location in locations)
+
+        try:
+            result = await async_track_request(self.hass, "local_engine", self._async_request(f"{self.url}/route/v1/{profile}/{coordinates}"))
+        except (ClientError, TimeoutError, ValueError) as exception:
+            msg = f"Cannot reach the routing engine at {self.url}: {exception!r}"
+            raise RoutingBackendError(msg) from exception
+
+        if not isinstance(result, dict) or result.get("code") != "Ok" or not result.get("routes"):
+            msg = f"The routing engine at {self.url} cannot plan the route: {result.get('message') if isinstance(result, dict) else result}"
+            raise RoutingBackendError(msg)
+
+        route = result["routes"][0]
+        return RouteEstimate(
+            duration=float(route["duration"]),
+            distance=float(route["distance"]),
+            delay=None,
+            points=tuple((lat, lon) for lon, lat in route["geometry"]["coordinates"]),
+        )
+
+    async def _async_request(self, url: str) -> object:
+        """Return the decoded response of the route service, with the full geometry as coordinate pairs."""
+        async with self._session.get(
+            url,
+            params={"overview": "full", "geometries": "geojson"},
+            timeout=ClientTimeout(total=LOCAL_ENGINE_TIMEOUT),
+        ) as response:
+            return await response.json(content_type=None)
+
+
+class TrafficDeltaRoutingBackend(RoutingBackend):  # pylint: disable=too-few-public-methods
+    """Route of a local engine with the traffic delay of another backend, which is only asked again when the delay expired.
+
+    Distance and travel time without traffic rarely change, so they come from the local engine on every update. When the local engine
+    fails, the route of the traffic backend is used as is.
+    """
+
+    name = "traffic_delta"
+
+    def __init__(self, local: RoutingBackend, traffic: RoutingBackend, delays: TTLCache[Hashable, float]) -> None:
+        """Initialize with the local engine, the backend for the traffic delay and the cache of delays per route."""
+        self._local = local
+        self._traffic = traffic
+        self._delays = delays
+
+    async def async_route(self, locations: list[LatLon], options: Mapping[str, Any]) -> RouteEstimate:
+        """Return the route of the local engine, with the traffic delay."""
+        try:
+            route = await self._local.async_route(locations, options)
+        except RoutingBackendError as exception:
+            if self._local.available:
+                _LOGGER.warning("%s, using %s until it is back", exception, self._traffic.name)
+                self._local.available = False
+            return await self._traffic.async_route(locations, options)
+
+        if not self._local.available:
+            _LOGGER.info("Routing engine %s is back", self._local.name)
+            self._local.available = True
+
+        key = route_cache_key(locations, options)
+        if (delay := self._delays.get(key)) is None:
+            delay = (await self._traffic.async_route(locations, options)).delay or 0.0
+            self._delays.set(key, delay)
+            _LOGGER.debug("Traffic delay from %s: %s seconds", self._traffic.name, delay)
+
+        return replace(route, delay=delay)
+
+
+@callback
+def async_get_traffic_backend(hass: HomeAssistant, url: str, traffic: RoutingBackend) -> RoutingBackend:
+    """Return the backend for the local engine at the URL with the traffic delay of the traffic backend.
+
+    The engine and the traffic delays are shared by all coordinators, so they aren't kept per route.
+    """
+    engines = hass.data.setdefault(DATA_LOCAL_ENGINES, {})
+    if (engine := engines.get(url)) is None:
+        engine = engines[url] = OSRMRoutingBackend(hass, url)
+    delays = async_get_cache(hass, DATA_TRAFFIC_DELAYS, LOCAL_ENGINE_TRAFFIC_TTL, LOCAL_ENGINE_TRAFFIC_MAX_SIZE)
+    return TrafficDeltaRoutingBackend(engine, traffic, delays)
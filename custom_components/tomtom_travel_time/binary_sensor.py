@@ -0,0 +1,160 @@
+"""TomTom Travel Time binary sensor."""
+
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE, CONF_NAME
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import ATTRIBUTION, CONF_THRESHOLD_HYSTERESIS, CONF_TRACKERS, DEFAULT_NAME, DEFAULT_THRESHOLD_HYSTERESIS, THRESHOLDS
+from .coordinator import TomTomDataUpdateCoordinator, TomTomReachableRangeCoordinator
+from .helpers import entry_device_info
+from .threshold import Threshold
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry[TomTomReachableRangeCoordinator | TomTomDataUpdateCoordinator],
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up the TomTom reachable range binary sensors, or the threshold binary sensors of a route."""
+    name = config_entry.data.get(CONF_NAME, DEFAULT_NAME)
+    coordinator = config_entry.runtime_data
+    device_info = entry_device_info(config_entry.entry_id, name)
+
+    if isinstance(coordinator, TomTomDataUpdateCoordinator):
+        hysteresis = float(config_entry.options.get(CONF_THRESHOLD_HYSTERESIS, DEFAULT_THRESHOLD_HYSTERESIS))
+        async_add_entities(
+            TomTomThresholdSensor(config_entry, Threshold(key, float(config_entry.options[option]), hysteresis), device_info, coordinator)
+            for key, option in THRESHOLDS.items()
+            if config_entry.options.get(option) is not None
+        )
+        return
+
+    async_add_entities(
+        TomTomReachableSensor(
+            config_entry,
+            tracker,
+            _tracker_name(hass, tracker),
+            device_info,
+            coordinator,
+        )
+        for tracker in config_entry.data[CONF_TRACKERS]
+    )
+
+
+def _tracker_name(hass: HomeAssistant, entity_id: str) -> str:
+    """Return the friendly name of a tracker, or its entity ID when it has no state yet."""
+    state = hass.states.get(entity_id)
+    return state.name if state else entity_id
+
+
+class TomTomReachableSensor(CoordinatorEntity[TomTomReachableRangeCoordinator], BinarySensorEntity):
+    """Whether a tracker is within the reachable range.
+
+    The range is refreshed by the coordinator, the position of the tracker is checked locally whenever it changes.
+    """
+
+    _attr_attribution = ATTRIBUTION
+    _attr_has_entity_name = True
+    _attr_translation_key = "reachable"
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        config_entry: ConfigEntry,
+        tracker: str,
+        tracker_name: str,
+        device_info: DeviceInfo,
+        coordinator: TomTomReachableRangeCoordinator,
+    ) -> None:
+        """Initialize the TomTom reachable range binary sensor."""
+        super().__init__(coordinator)
+        self._tracker = tracker
+        self._attr_unique_id = f"{config_entry.entry_id}_{tracker}"
+        self._attr_translation_placeholders = {"name": tracker_name}
+        self._attr_device_info = device_info
+        self._attr_extra_state_attributes = {"tracker": tracker}
+
+    async def async_added_to_hass(self) -> None:
+        """Start tracking the position of the tracker."""
+        await super().async_added_to_hass()
+        self.async_on_remove(async_track_state_change_event(self.hass, self._tracker, self._handle_tracker_change))
+        self._update_is_on()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle an updated reachable range."""
+        self._update_is_on()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _handle_tracker_change(self, _: Event[EventStateChangedData]) -> None:
+        """Handle a changed position of the tracker."""
+        if self._update_is_on():
+            self.async_write_ha_state()
+
+    @callback
+    def _update_is_on(self) -> bool:
+        """Check the tracker position against the reachable range, return whether the state changed."""
+        is_on: bool | None = None
+        state = self.hass.states.get(self._tracker)
+
+        if self.coordinator.data is not None and state is not None:
+            lat = state.attributes.get(ATTR_LATITUDE)
+            lon = state.attributes.get(ATTR_LONGITUDE)
+            if lat is not None and lon is not None:
+                is_on = self.coordinator.data.polygon.contains(float(lat), float(lon))
+
+        changed = is_on != self._attr_is_on
+        self._attr_is_on = is_on
+        return changed
+
+
+class TomTomThresholdSensor(CoordinatorEntity[TomTomDataUpdateCoordinator], BinarySensorEntity):
+    """Whether the travel time of a route is over a threshold.
+
+    The threshold is evaluated by the coordinator, the state is only written when it's crossed or cleared, or the availability changes.
+    """
+
+    _attr_attribution = ATTRIBUTION
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        threshold: Threshold,
+        device_info: DeviceInfo,
+        coordinator: TomTomDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the TomTom threshold binary sensor."""
+        super().__init__(coordinator)
+        self._threshold = threshold
+        self._attr_unique_id = f"{config_entry.entry_id}_{threshold.key}_threshold"
+        self._attr_translation_key = f"{threshold.key}_threshold"
+        self._attr_device_info = device_info
+        self._attr_extra_state_attributes = {"threshold": threshold.limit, "hysteresis": threshold.hysteresis}
+        self._written: tuple[bool | None, bool] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start evaluating the threshold."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_threshold(self._attr_unique_id, self._threshold))  # type: ignore[arg-type]
+        self._written = (self.is_on, self.available)
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return whether the threshold is crossed."""
+        return self._threshold.is_on
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write the state when it changed."""
+        state = (self.is_on, self.available)
+        if state != self._written:
+            self._written = state
+            self.async_write_ha_state()
@@ -0,0 +1,143 @@
+"""TomTom Travel Time cache."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Mapping
+from typing import Any
+
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from custom_components.tomtom_travel_time.const import (
+    CONF_AVOID_TYPE,
+    CONF_BEST_ORDER,
+    CONF_CALENDAR,
+    CONF_LOCAL_ENGINE,
+    CONF_LOCATIONS,
+    CONF_ORIGIN_CELL_SIZE,
+    CONF_PAUSE_ENTITY,
+    CONF_ROUTE_TYPE,
+    CONF_SHARED_STORE,
+    CONF_VEHICLE_TYPE,
+    DOMAIN,
+    LOCATION_PRECISION,
+)
+from custom_components.tomtom_travel_time.geometry import grid_cell
+from custom_components.tomtom_travel_time.helpers import lat_lon_from_coordinates, normalize_location
+from custom_components.tomtom_travel_time.metrics import async_get_metrics
+from tomtom_apis.models import LatLon
+
+
+class TTLCache[K: Hashable, V]:
+    """Small in-memory cache where every item expires after a fixed time to live, lookups are counted as hits and misses."""
+
+    def __init__(self, ttl: float, max_size: int = 256) -> None:
+        """Initialize the cache."""
+        self._ttl = ttl
+        self._max_size = max_size
+        self._items: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of items, including ones that are expired but not purged yet."""
+        return len(self._items)
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value, or None when it is missing or expired."""
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._items[key]
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value, evicting expired and then the oldest items when the cache is full."""
+        now = time.monotonic()
+        self._items.pop(key, None)
+        self._items[key] = (now + self._ttl, value)
+
+        if len(self._items) > self._max_size:
+            self.purge(now)
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+    def purge(self, now: float | None = None) -> None:
+        """Remove all expired items."""
+        now = time.monotonic() if now is None else now
+        for key in [key for key, (expires_at, _) in self._items.items() if expires_at <= now]:
+            del self._items[key]
+
+    def clear(self) -> None:
+        """Remove all items."""
+        self._items.clear()
+
+
+@callback
+def async_get_cache[K: Hashable, V](hass: HomeAssistant, key: HassKey[TTLCache[K, V]], ttl: float, max_size: int) -> TTLCache[K, V]:
+    """Return the cache stored under the key, it's created on first use and reported in the metrics by the key without the domain."""
+    if (cache := hass.data.get(key)) is None:
+        cache = hass.data[key] = TTLCache(ttl, max_size)
+        async_get_metrics(hass).caches[str(key).removeprefix(f"{DOMAIN}_")] = cache
+    return cache
+
+
+def route_cache_key(locations: Iterable[LatLon], options: Mapping[str, Any]) -> tuple[Hashable, ...]:
+    """Return a cache key for a route, with the coordinates rounded so tiny GPS differences share an entry.
+
+    A route with its stops in the best order has another travel time than the route along the stops as given, and the estimate of a local
+    engine isn't a TomTom route, so these options are part of the key.
+    """
+    return (
+        tuple((round(location.lat, LOCATION_PRECISION), round(location.lon, LOCATION_PRECISION)) for location in locations),
+        options[CONF_VEHICLE_TYPE],
+        options[CONF_ROUTE_TYPE],
+        tuple(sorted(options.get(CONF_AVOID_TYPE, []))),
+        bool(options.get(CONF_BEST_ORDER)),
+        options.get(CONF_LOCAL_ENGINE) or None,
+    )
+
+
+def origin_cell_key(locations: list[LatLon], options: Mapping[str, Any], cell_size: float) -> tuple[Hashable, ...]:
+    """Return a cache key for a route with the origin snapped to a grid cell, so nearby and slightly moving origins share an entry."""
+    origin, *others = locations
+    return (cell_size, grid_cell(origin.lat, origin.lon, cell_size), *route_cache_key(others, options))
+
+
+def entry_route_key(data: Mapping[str, Any], options: Mapping[str, Any]) -> tuple[Hashable, ...]:
+    """Return the canonical key of the route of an entry, entries with the same key share their coordinator.
+
+    Coordinates are rounded like in the route cache key. Other locations, like trackers, resolve to a different position on every update,
+    so they are compared by their normalized text instead.
+    """
+    locations = tuple(
+        (round(lat_lon.lat, LOCATION_PRECISION), round(lat_lon.lon, LOCATION_PRECISION))
+        if (lat_lon := lat_lon_from_coordinates(location)) is not None
+        else normalize_location(location)
+        for location in data[CONF_LOCATIONS]
+    )
+
+    return (
+        data[CONF_API_KEY],
+        locations,
+        options[CONF_VEHICLE_TYPE],
+        options[CONF_ROUTE_TYPE],
+        tuple(sorted(options.get(CONF_AVOID_TYPE, []))),
+        options.get(CONF_CALENDAR),
+        options.get(CONF_ORIGIN_CELL_SIZE),
+        options.get(CONF_PAUSE_ENTITY),
+        options.get(CONF_SHARED_STORE),
+        options.get(CONF_BEST_ORDER),
+        options.get(CONF_LOCAL_ENGINE),
+    )
@@ -6,9 +6,16 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant.config_entries import SOURCE_RECONFIGURE, ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
-from homeassistant.const import CONF_API_KEY, CONF_NAME
+from homeassistant.const import CONF_API_KEY, CONF_NAME, Platform, UnitOfLength, UnitOfTime
 from homeassistant.core import callback
 from homeassistant.helpers.selector import (
+    BooleanSelector,
+    EntitySelector,
+    EntitySelectorConfig,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    SelectOptionDict,
     SelectSelector,
     SelectSelectorConfig,
     SelectSelectorMode,
@@ -20,20 +27,53 @@ from homeassistant.helpers.selector import (
 from custom_components.tomtom_travel_time.const import (
     AVOID_TYPES,
     CONF_AVOID_TYPE,
+    CONF_BEST_ORDER,
+    CONF_CALENDAR,
+    CONF_CENTER,
+    CONF_DAILY_QUOTA,
+    CONF_DELAY_THRESHOLD,
+    CONF_DURATION_THRESHOLD,
+    CONF_ENTRY_TYPE,
+    CONF_FORECAST,
+    CONF_KEY_POOL,
+    CONF_LOCAL_ENGINE,
+    CONF_LOCATION,
     CONF_LOCATIONS,
+    CONF_ORIGIN_CELL_SIZE,
+    CONF_PAUSE_ENTITY,
+    CONF_ROUTE_GEOMETRY,
     CONF_ROUTE_TYPE,
+    CONF_SEARCH,
+    CONF_SHARED_STORE,
+    CONF_THRESHOLD_HYSTERESIS,
+    CONF_TIME_BUDGET,
+    CONF_TRACKERS,
     CONF_VEHICLE_TYPE,
     DEFAULT_NAME,
     DEFAULT_OPTIONS,
+    DEFAULT_TIME_BUDGET,
     DOMAIN,
+    ENTRY_TYPE_REACHABLE_RANGE,
+    ENTRY_TYPE_ROUTE,
     ROUTE_TYPES,
+    SHARED_STORE_MEMORY,
     VEHICLE_TYPES,
 )
-from custom_components.tomtom_travel_time.helpers import UserInputLatLan, ValidationError, is_valid_config_entry, lat_lon_from_user_input
+from custom_components.tomtom_travel_time.helpers import (
+    UserInputLatLan,
+    ValidationError,
+    allowed_config_path,
+    is_valid_config_entry,
+    is_valid_reachable_range,
+    lat_lon_from_user_input,
+)
+from custom_components.tomtom_travel_time.model import SearchCandidate
+from custom_components.tomtom_travel_time.search import async_search_locations
+from custom_components.tomtom_travel_time.shared import async_find_duplicate_entry
 from tomtom_apis import TomTomAPIClientError, TomTomAPIConnectionError, TomTomAPIRequestTimeoutError, TomTomAPIServerError
 from tomtom_apis.models import LatLon
 
-OPTIONS_SCHEMA = vol.Schema(
+REACHABLE_RANGE_OPTIONS_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_VEHICLE_TYPE): SelectSelector(
             SelectSelectorConfig(
@@ -60,6 +100,51 @@ OPTIONS_SCHEMA = vol.Schema(
                 multiple=True,
             ),
         ),
+        vol.Optional(CONF_KEY_POOL): BooleanSelector(),
+        vol.Optional(CONF_DAILY_QUOTA): NumberSelector(
+            NumberSelectorConfig(
+                min=1,
+                step=1,
+                mode=NumberSelectorMode.BOX,
+            ),
+        ),
+    },
+)
+
+THRESHOLD_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=0,
+        step=1,
+        mode=NumberSelectorMode.BOX,
+        unit_of_measurement=UnitOfTime.MINUTES,
+    ),
+)
+
+OPTIONS_SCHEMA = REACHABLE_RANGE_OPTIONS_SCHEMA.extend(
+    {
+        vol.Optional(CONF_CALENDAR): EntitySelector(
+            EntitySelectorConfig(domain=Platform.CALENDAR),
+        ),
+        vol.Optional(CONF_PAUSE_ENTITY): EntitySelector(
+            EntitySelectorConfig(domain=[Platform.BINARY_SENSOR, "input_boolean", Platform.SWITCH]),
+        ),
+        vol.Optional(CONF_DELAY_THRESHOLD): THRESHOLD_SELECTOR,
+        vol.Optional(CONF_DURATION_THRESHOLD): THRESHOLD_SELECTOR,
+        vol.Optional(CONF_THRESHOLD_HYSTERESIS): THRESHOLD_SELECTOR,
+        vol.Optional(CONF_ROUTE_GEOMETRY): BooleanSelector(),
+        vol.Optional(CONF_FORECAST): BooleanSelector(),
+        vol.Optional(CONF_BEST_ORDER): BooleanSelector(),
+        vol.Optional(CONF_LOCAL_ENGINE): TextSelector(TextSelectorConfig(type=TextSelectorType.URL)),
+        vol.Optional(CONF_SHARED_STORE): TextSelector(),
+        vol.Optional(CONF_ORIGIN_CELL_SIZE): NumberSelector(
+            NumberSelectorConfig(
+                min=10,
+                max=5000,
+                step=10,
+                mode=NumberSelectorMode.BOX,
+                unit_of_measurement=UnitOfLength.METERS,
+            ),
+        ),
     },
 )
 
@@ -67,12 +152,36 @@ CONFIG_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_NAME, default=DEFAULT_NAME): TextSelector(),
         vol.Required(CONF_API_KEY): TextSelector(),
-        vol.Required(CONF_LOCATIONS): TextSelector(
+        vol.Optional(CONF_LOCATIONS): TextSelector(
             TextSelectorConfig(
                 type=TextSelectorType.TEXT,
                 multiple=True,
             ),
         ),
+        vol.Optional(CONF_SEARCH): TextSelector(),
+    },
+)
+
+REACHABLE_RANGE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME, default=DEFAULT_NAME): TextSelector(),
+        vol.Required(CONF_API_KEY): TextSelector(),
+        vol.Required(CONF_CENTER): TextSelector(),
+        vol.Required(CONF_TIME_BUDGET, default=DEFAULT_TIME_BUDGET): NumberSelector(
+            NumberSelectorConfig(
+                min=1,
+                max=240,
+                step=1,
+                mode=NumberSelectorMode.BOX,
+                unit_of_measurement=UnitOfTime.MINUTES,
+            ),
+        ),
+        vol.Required(CONF_TRACKERS): EntitySelector(
+            EntitySelectorConfig(
+                domain=[Platform.DEVICE_TRACKER, "person"],
+                multiple=True,
+            ),
+        ),
     },
 )
 
@@ -82,20 +191,49 @@ def default_options() -> dict[str, str | bool | list[str]]:
     return DEFAULT_OPTIONS.copy()
 
 
+def search_schema(candidates: tuple[SearchCandidate, ...]) -> vol.Schema:
+    """Get the schema to pick one of the locations found by the search, the value is the coordinates of the location."""
+    return vol.Schema(
+        {
+            vol.Required(CONF_LOCATION): SelectSelector(
+                SelectSelectorConfig(
+                    options=[SelectOptionDict(value=candidate.location.to_comma_separated(), label=candidate.label) for candidate in candidates],
+                    mode=SelectSelectorMode.LIST,
+                ),
+            ),
+        },
+    )
+
+
 class TomTomOptionsFlow(OptionsFlow):
     """Handle an options flow for TomTom Travel Time."""
 
     async def async_step_init(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         """Handle the initial step."""
+        errors = {}
+
         if user_input is not None:
-            return self.async_create_entry(
-                title="",
-                data=user_input,
-            )
+            location = user_input.get(CONF_SHARED_STORE)
+            if (
+                location
+                and location != SHARED_STORE_MEMORY
+                and await self.hass.async_add_executor_job(allowed_config_path, self.hass, location) is None
+            ):
+                errors[CONF_SHARED_STORE] = "shared_store_not_allowed"
+            else:
+                return self.async_create_entry(
+                    title="",
+                    data=user_input,
+                )
+
+        schema = OPTIONS_SCHEMA
+        if self.config_entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_REACHABLE_RANGE:
+            schema = REACHABLE_RANGE_OPTIONS_SCHEMA
 
         return self.async_show_form(
             step_id="init",
-            data_schema=self.add_suggested_values_to_schema(OPTIONS_SCHEMA, self.config_entry.options),
+            data_schema=self.add_suggested_values_to_schema(schema, user_input or self.config_entry.options),
+            errors=errors,
         )
 
 
@@ -104,6 +242,8 @@ class TomTomConfigFlow(ConfigFlow, domain=DOMAIN):  # pylint: disable=abstract-m
 
     VERSION = 1
 
+    _pending_data: dict[str, Any]
+
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -112,15 +252,25 @@ class TomTomConfigFlow(ConfigFlow, domain=DOMAIN):  # pylint: disable=abstract-m
         """Get the options flow for this handler."""
         return TomTomOptionsFlow()
 
-    async def async_step_user(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:  # noqa: C901
+    async def async_step_user(self, _: dict[str, Any] | None = None) -> ConfigFlowResult:
         """Handle the initial step."""
+        return self.async_show_menu(
+            step_id="user",
+            menu_options=[ENTRY_TYPE_ROUTE, ENTRY_TYPE_REACHABLE_RANGE],
+        )
+
+    async def async_step_route(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:  # noqa: C901
+        """Handle the route step."""
         errors = {}
         description_placeholders = {}
         user_input = user_input or {}
 
         if user_input:
             api_key = user_input[CONF_API_KEY]
-            locations = user_input[CONF_LOCATIONS]
+            locations = user_input.setdefault(CONF_LOCATIONS, [])
+            if query := user_input.pop(CONF_SEARCH, None):
+                return await self._async_search(user_input, query)
+
             lat_lon_locations: list[LatLon] = []
 
             try:
@@ -140,17 +290,7 @@ class TomTomConfigFlow(ConfigFlow, domain=DOMAIN):  # pylint: disable=abstract-m
                     lat_lon_locations.append(lat_lon.location)
 
                 if await is_valid_config_entry(self.hass, api_key, lat_lon_locations):
-                    if self.source == SOURCE_RECONFIGURE:
-                        return self.async_update_reload_and_abort(
-                            self._get_reconfigure_entry(),
-                            title=user_input[CONF_NAME],
-                            data=user_input,
-                        )
-                    return self.async_create_entry(
-                        title=user_input.get(CONF_NAME, DEFAULT_NAME),
-                        data=user_input,
-                        options=default_options(),
-                    )
+                    return self._async_create_or_update_entry(user_input)
             except ValidationError as ex:
                 errors["base"] = ex.error_key
                 description_placeholders = ex.description_placeholders or {}
@@ -164,17 +304,141 @@ class TomTomConfigFlow(ConfigFlow, domain=DOMAIN):  # pylint: disable=abstract-m
                 errors["base"] = "cannot_connect"
 
         return self.async_show_form(
-            step_id="user",
+            step_id=ENTRY_TYPE_ROUTE,
             data_schema=self.add_suggested_values_to_schema(CONFIG_SCHEMA, user_input),
             errors=errors,
             description_placeholders=description_placeholders,
         )
 
+    async def _async_search(self, user_input: dict[str, Any], query: str) -> ConfigFlowResult:
+        """Search locations for the query, and let the user pick one of them."""
+        errors = {}
+
+        try:
+            candidates = await async_search_locations(self.hass, user_input[CONF_API_KEY], query)
+        except TomTomAPIClientError:
+            errors["base"] = "client_error"
+        except TomTomAPIRequestTimeoutError:
+            errors["base"] = "timeout_connect"
+        except TomTomAPIServerError:
+            errors["base"] = "server_error"
+        except TomTomAPIConnectionError:
+            errors["base"] = "cannot_connect"
+        else:
+            if candidates:
+                self._pending_data = user_input
+                return self.async_show_form(
+                    step_id=CONF_SEARCH,
+                    data_schema=search_schema(candidates),
+                    description_placeholders={CONF_SEARCH: query},
+                )
+            errors["base"] = "no_search_results"
+
+        return self.async_show_form(
+            step_id=ENTRY_TYPE_ROUTE,
+            data_schema=self.add_suggested_values_to_schema(CONFIG_SCHEMA, {**user_input, CONF_SEARCH: query}),
+            errors=errors,
+            description_placeholders={CONF_SEARCH: query},
+        )
+
+    async def async_step_search(self, user_input: dict[str, Any]) -> ConfigFlowResult:
+        """Handle the picked location, its coordinates are added to the locations so they don't have to be geocoded."""
+        data = self._pending_data
+        data[CONF_LOCATIONS] = [*data[CONF_LOCATIONS], user_input[CONF_LOCATION]]
+
+        return self.async_show_form(
+            step_id=ENTRY_TYPE_ROUTE,
+            data_schema=self.add_suggested_values_to_schema(CONFIG_SCHEMA, data),
+        )
+
+    async def async_step_reachable_range(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Handle the reachable range step."""
+        errors = {}
+        user_input = user_input or {}
+
+        if user_input:
+            api_key = user_input[CONF_API_KEY]
+            user_input[CONF_TIME_BUDGET] = int(user_input[CONF_TIME_BUDGET])
+
+            try:
+                center = await lat_lon_from_user_input(self.hass, api_key, user_input[CONF_CENTER])
+
+                if not isinstance(center, UserInputLatLan):
+                    raise ValidationError("cannot_determine_center")  # noqa: EM101, TRY301
+
+                if center.geocoded:
+                    # If the center was geocoded, we store the lat/lon in the config entry to preserve geocode API calls on state updates.
+                    user_input[CONF_CENTER] = center.location.to_comma_separated()
+
+                if await is_valid_reachable_range(self.hass, api_key, center.location, user_input[CONF_TIME_BUDGET]):
+                    return self._async_create_or_update_entry({**user_input, CONF_ENTRY_TYPE: ENTRY_TYPE_REACHABLE_RANGE})
+            except ValidationError as ex:
+                errors["base"] = ex.error_key
+            except TomTomAPIClientError:
+                errors["base"] = "client_error"
+            except TomTomAPIRequestTimeoutError:
+                errors["base"] = "timeout_connect"
+            except TomTomAPIServerError:
+                errors["base"] = "server_error"
+            except TomTomAPIConnectionError:
+                errors["base"] = "cannot_connect"
+
+        return self.async_show_form(
+            step_id=ENTRY_TYPE_REACHABLE_RANGE,
+            data_schema=self.add_suggested_values_to_schema(REACHABLE_RANGE_SCHEMA, user_input),
+            errors=errors,
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> ConfigFlowResult:
+        """Handle a route of the import service, the route is validated by the service."""
+        return self.async_create_entry(
+            title=import_data[CONF_NAME],
+            data=import_data,
+            options=default_options(),
+        )
+
     async def async_step_reconfigure(self, _: dict[str, Any] | None = None) -> ConfigFlowResult:
         """Handle reconfiguration."""
         data = self._get_reconfigure_entry().data.copy()
 
+        if data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_REACHABLE_RANGE:
+            return self.async_show_form(
+                step_id=ENTRY_TYPE_REACHABLE_RANGE,
+                data_schema=self.add_suggested_values_to_schema(REACHABLE_RANGE_SCHEMA, data),
+            )
+
         return self.async_show_form(
-            step_id="user",
+            step_id=ENTRY_TYPE_ROUTE,
             data_schema=self.add_suggested_values_to_schema(CONFIG_SCHEMA, data),
         )
+
+    async def async_step_duplicate(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Handle the confirmation of a route that is identical to the route of an existing entry."""
+        if user_input is not None:
+            return self._async_create_entry(self._pending_data)
+
+        return self.async_show_form(step_id="duplicate")
+
+    def _async_create_or_update_entry(self, data: dict[str, Any]) -> ConfigFlowResult:
+        """Create a new entry, or update the entry that is being reconfigured."""
+        if self.source == SOURCE_RECONFIGURE:
+            return self.async_update_reload_and_abort(
+                self._get_reconfigure_entry(),
+                title=data[CONF_NAME],
+                data=data,
+            )
+
+        if data.get(CONF_ENTRY_TYPE) != ENTRY_TYPE_REACHABLE_RANGE and (duplicate := async_find_duplicate_entry(self.hass, data, default_options())):
+            # The new entry would share the coordinator of the existing entry, it works, but it's probably not what the user wants.
+            self._pending_data = data
+            return self.async_show_form(step_id="duplicate", description_placeholders={CONF_NAME: duplicate.title})
+
+        return self._async_create_entry(data)
+
+    def _async_create_entry(self, data: dict[str, Any]) -> ConfigFlowResult:
+        """Create a new entry with the default options."""
+        return self.async_create_entry(
+            title=data.get(CONF_NAME, DEFAULT_NAME),
+            data=data,
+            options=default_options(),
+        )
@@ -12,16 +12,140 @@ CONF_LOCATIONS = "locations"
 CONF_VEHICLE_TYPE = "vehicle_type"
 CONF_ROUTE_TYPE = "route_type"
 CONF_AVOID_TYPE = "avoid_type"
+CONF_CALENDAR = "calendar"
+CONF_ENTRY_TYPE = "entry_type"
+CONF_CENTER = "center"
+CONF_TIME_BUDGET = "time_budget"
+CONF_TRACKERS = "trackers"
+CONF_KEY_POOL = "key_pool"
+CONF_DAILY_QUOTA = "daily_quota"
+CONF_DELAY_THRESHOLD = "delay_threshold"
+CONF_DURATION_THRESHOLD = "duration_threshold"
+CONF_THRESHOLD_HYSTERESIS = "threshold_hysteresis"
+CONF_ROUTE_GEOMETRY = "route_geometry"
+CONF_ORIGIN_CELL_SIZE = "origin_cell_size"
+CONF_PAUSE_ENTITY = "pause_entity"
+CONF_SHARED_STORE = "shared_store"
+CONF_FORECAST = "forecast"
+CONF_BEST_ORDER = "best_order"
+CONF_LOCAL_ENGINE = "local_engine"
+CONF_SEARCH = "search"
+CONF_LOCATION = "location"
+
+ENTRY_TYPE_ROUTE = "route"
+ENTRY_TYPE_REACHABLE_RANGE = "reachable_range"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_ROUTES = "routes"
+ATTR_FILE = "file"
+ATTR_REFRESHES = "refreshes"
+
+SERVICE_CALCULATE_ROUTE = "calculate_route"
+SERVICE_IMPORT_ROUTES = "import_routes"
+SERVICE_PROFILE = "profile"
+SERVICE_GET_EVENTS = "get_events"
 
 DEFAULT_NAME = "TomTom Travel Time"
 DEFAULT_SCAN_INTERVAL = 300
 DEFAULT_VEHICLE_TYPE = TravelModeType.CAR.name.lower()
 DEFAULT_ROUTE_TYPE = RouteType.FASTEST.name.lower()
 DEFAULT_AVOID_TYPE: list[str] = []
+DEFAULT_TIME_BUDGET = 20
+# Daily limit of non-tile requests in the free tier.
+DEFAULT_DAILY_QUOTA = 2500
+# Minutes a value has to drop below a threshold before the threshold is cleared.
+DEFAULT_THRESHOLD_HYSTERESIS = 2
+
+# Decimals used when coordinates are part of a cache key, 4 decimals is roughly 11 meters.
+LOCATION_PRECISION = 4
+ROUTE_CACHE_TTL = 120
+ROUTE_CACHE_MAX_SIZE = 256
+# Routes from origins in the same grid cell, in seconds. Shorter than the update interval, so a coordinator never gets its own route back
+# on its next update, only routes that nearby trackers requested in the meantime.
+ORIGIN_CACHE_TTL = 240
+ORIGIN_CACHE_MAX_SIZE = 256
+
+# Results shared with other instances, all values are in seconds. Routes expire a bit before the update interval, so one of the instances
+# refreshes a route every interval. A claim expires when the instance that refreshes a route doesn't publish it, for example on a restart.
+SHARED_STORE_MEMORY = ":memory:"
+SHARED_STORE_ROUTE_TTL = DEFAULT_SCAN_INTERVAL - 30
+SHARED_STORE_GEOCODE_TTL = 24 * 3600
+SHARED_STORE_CLAIM_TTL = 30
+SHARED_STORE_WAIT = 10
+
+# Travel time forecast, horizons and durations are in minutes. The trend is smoothed with the level and trend factors and flattens out
+# towards the trend horizon, the weekly profile keeps an average per weekday and slot. Gaps longer than the maximum restart the trend.
+FORECAST_HORIZONS = (15, 30, 60)
+FORECAST_SLOT = 15
+FORECAST_LEVEL_SMOOTHING = 0.5
+FORECAST_TREND_SMOOTHING = 0.3
+FORECAST_TREND_HORIZON = 30
+FORECAST_PROFILE_SMOOTHING = 0.3
+FORECAST_PROFILE_WEIGHT = 0.5
+FORECAST_MAX_GAP = 60
+# The weekly profile is saved per entry so it survives restarts and reloads. A delayed save is pushed back by every new save, so the delay
+# in seconds is shorter than the update interval.
+FORECAST_STORE_VERSION = 1
+FORECAST_SAVE_DELAY = 60
+
+# Best order of the stops, only routes with at least two stops between origin and destination can be reordered. The order is kept until
+# the delay changes by this number of minutes.
+BEST_ORDER_MIN_LOCATIONS = 4
+BEST_ORDER_DELAY_CHANGE = 5
+
+# Local routing engine, times in seconds. TomTom is asked for the traffic delay when it expired, the engine is asked on every update. The
+# profile of the engine follows the vehicle type, engines that serve one profile ignore it.
+LOCAL_ENGINE_TRAFFIC_TTL = 900
+LOCAL_ENGINE_TRAFFIC_MAX_SIZE = 256
+LOCAL_ENGINE_TIMEOUT = 10
+LOCAL_ENGINE_PROFILES = {
+    "car": "driving",
+    "bicycle": "cycling",
+    "pedestrian": "walking",
+}
+
+# Calendar prefetch, all values are in seconds.
+PREFETCH_LOOKAHEAD = 12 * 3600
+PREFETCH_WINDOW = 3600
+PREFETCH_IDLE_INTERVAL = 1800
+PREFETCH_MIN_INTERVAL = 60
+
+# Bulk import, the geocoding rate is in requests per second and the batch size is the limit of a synchronous batch.
+IMPORT_GEOCODE_RATE = 5
+IMPORT_GEOCODE_CONCURRENCY = 5
+ROUTE_BATCH_SIZE = 100
+
+# Location search in the config flow, shorter queries aren't searched and results are cached in seconds.
+SEARCH_MIN_LENGTH = 3
+SEARCH_LIMIT = 8
+SEARCH_CACHE_TTL = 3600
+SEARCH_CACHE_MAX_SIZE = 128
+
+# Profiling, the timeout is in seconds.
+DEFAULT_PROFILE_REFRESHES = 10
+PROFILE_TIMEOUT = 3600
+PROFILE_TOP_FUNCTIONS = 25
+
+# Upper bounds of the request duration buckets of the metrics, in seconds.
+METRICS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Seconds an API key is skipped after an auth or quota error.
+KEY_POOL_COOLDOWN = 900
+
+# Thresholds per key of the travel time data, the options are in minutes.
+THRESHOLDS = {
+    "delay": CONF_DELAY_THRESHOLD,
+    "duration": CONF_DURATION_THRESHOLD,
+}
+
+# Options are the lowercase names of the enums, the enums are looked up by option on every refresh.
+TRAVEL_MODE_BY_NAME = {item.name.lower(): item for item in TravelModeType}
+ROUTE_TYPE_BY_NAME = {item.name.lower(): item for item in RouteType}
+AVOID_TYPE_BY_NAME = {item.name.lower(): item for item in AvoidType}
 
-VEHICLE_TYPES = [item.name.lower() for item in TravelModeType]
-ROUTE_TYPES = [item.name.lower() for item in RouteType]
-AVOID_TYPES = [item.name.lower() for item in AvoidType]
+VEHICLE_TYPES = list(TRAVEL_MODE_BY_NAME)
+ROUTE_TYPES = list(ROUTE_TYPE_BY_NAME)
+AVOID_TYPES = list(AVOID_TYPE_BY_NAME)
 
 DEFAULT_OPTIONS: dict[str, str | bool | list[str]] = {
     CONF_VEHICLE_TYPE: DEFAULT_VEHICLE_TYPE,
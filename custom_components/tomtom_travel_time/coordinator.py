@@ -2,37 +2,181 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import math
+from collections.abc import Hashable, Mapping
+from dataclasses import asdict
 from datetime import timedelta
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import STATE_ON
+from homeassistant.core import CALLBACK_TYPE, Event, EventStateChangedData, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.json import json_dumps
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
 
+from custom_components.tomtom_travel_time.backend import TomTomRoutingBackend, async_get_traffic_backend, route_points
+from custom_components.tomtom_travel_time.cache import TTLCache, async_get_cache, origin_cell_key, route_cache_key
 from custom_components.tomtom_travel_time.const import (
+    AVOID_TYPE_BY_NAME,
+    BEST_ORDER_DELAY_CHANGE,
+    BEST_ORDER_MIN_LOCATIONS,
     CONF_AVOID_TYPE,
+    CONF_BEST_ORDER,
+    CONF_CALENDAR,
+    CONF_CENTER,
+    CONF_LOCAL_ENGINE,
     CONF_LOCATIONS,
+    CONF_ORIGIN_CELL_SIZE,
+    CONF_PAUSE_ENTITY,
     CONF_ROUTE_TYPE,
+    CONF_SHARED_STORE,
+    CONF_TIME_BUDGET,
     CONF_VEHICLE_TYPE,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    FORECAST_SAVE_DELAY,
+    ORIGIN_CACHE_MAX_SIZE,
+    ORIGIN_CACHE_TTL,
+    ROUTE_TYPE_BY_NAME,
+    SHARED_STORE_ROUTE_TTL,
+    TRAVEL_MODE_BY_NAME,
 )
-from custom_components.tomtom_travel_time.helpers import lat_lon_from_user_input
-from custom_components.tomtom_travel_time.model import TomTomTravelTimeData, UserInputLatLan
+from custom_components.tomtom_travel_time.forecast import ForecastModel
+from custom_components.tomtom_travel_time.geometry import ReachablePolygon, encode_polyline
+from custom_components.tomtom_travel_time.helpers import lat_lon_from_coordinates, lat_lon_from_user_input
+from custom_components.tomtom_travel_time.keypool import async_call_with_key
+from custom_components.tomtom_travel_time.model import (
+    BestOrder,
+    CachedRoute,
+    ReachableRangeData,
+    RouteEstimate,
+    RouteGeometry,
+    TomTomTravelTimeData,
+    UserInputLatLan,
+)
+from custom_components.tomtom_travel_time.prefetch import CalendarPrefetch
+from custom_components.tomtom_travel_time.profiler import async_refresh_done
+from custom_components.tomtom_travel_time.replay import async_get_tomtom_session
+from custom_components.tomtom_travel_time.store import SharedStore, async_get_or_refresh, async_get_shared_store
+from custom_components.tomtom_travel_time.threshold import Threshold
 from tomtom_apis import ApiOptions
 from tomtom_apis.models import LatLon, LatLonList, TravelModeType
 from tomtom_apis.routing import RoutingApi
-from tomtom_apis.routing.models import AvoidType, CalculateRouteParams, RouteType
+from tomtom_apis.routing.models import (
+    AvoidType,
+    CalculatedRouteResponse,
+    CalculateReachableRouteParams,
+    CalculateRouteParams,
+    Route,
+    RouteType,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+DATA_ROUTING_APIS: HassKey[dict[str, RoutingApi]] = HassKey(f"{DOMAIN}_routing_apis")
+DATA_ORIGIN_CACHE: HassKey[TTLCache[Hashable, CachedRoute]] = HassKey(f"{DOMAIN}_origin_cache")
 
-class TomTomDataUpdateCoordinator(DataUpdateCoordinator[TomTomTravelTimeData]):
-    """DataUpdateCoordinator."""
 
-    config_entry: ConfigEntry[DataUpdateCoordinator]
+def route_options(options: Mapping[str, Any]) -> tuple[TravelModeType, RouteType, list[AvoidType]]:
+    """Return the travel mode, route type and avoids from the entry options."""
+    travel_mode = TRAVEL_MODE_BY_NAME[options[CONF_VEHICLE_TYPE]]
+    route_type = ROUTE_TYPE_BY_NAME[options[CONF_ROUTE_TYPE]]
+    avoids = [AVOID_TYPE_BY_NAME[avoid] for avoid in options.get(CONF_AVOID_TYPE, [])]
+
+    return travel_mode, route_type, avoids
+
+
+@callback
+def async_get_routing_api(hass: HomeAssistant, api_key: str) -> RoutingApi:
+    """Return the Routing API client for the key, one client is shared by all coordinators that use the key."""
+    routing_apis = hass.data.setdefault(DATA_ROUTING_APIS, {})
+    if (routing_api := routing_apis.get(api_key)) is None:
+        routing_api = routing_apis[api_key] = RoutingApi(ApiOptions(api_key=api_key), async_get_tomtom_session(hass))
+    return routing_api
+
+
+def route_geometry(route: Route | RouteEstimate | CachedRoute | RouteGeometry) -> RouteGeometry:
+    """Return the geometry of a route of TomTom, of a routing backend or of the origin cache, or a geometry that is already encoded."""
+    if isinstance(route, RouteGeometry):
+        return route
+    if isinstance(route, CachedRoute):
+        return route.geometry
+    points = route.points if isinstance(route, RouteEstimate) else route_points(route)
+    polyline = encode_polyline(points)
+    return RouteGeometry(polyline=polyline, etag=hashlib.blake2b(polyline.encode(), digest_size=8).hexdigest(), points=len(points))
+
+
+def route_params(key: str, options: Mapping[str, Any], *, compute_best_order: bool = False) -> CalculateRouteParams:
+    """Return the parameters to calculate a route with the entry options."""
+    travel_mode, route_type, avoids = route_options(options)
+    return CalculateRouteParams(
+        key=key,
+        maxAlternatives=0,
+        routeType=route_type,
+        travelMode=travel_mode,
+        avoid=avoids,
+        computeBestOrder=compute_best_order or None,
+    )
+
+
+def travel_time_data(route: Route | CachedRoute, waypoint_order: tuple[int, ...] | None = None) -> TomTomTravelTimeData:
+    """Return the travel time data of the summary of a route."""
+    if isinstance(route, CachedRoute):
+        return route.data
+    return TomTomTravelTimeData(
+        duration=math.ceil(route.summary.travelTimeInSeconds / 60),
+        distance=route.summary.lengthInMeters / 1000,
+        delay=math.ceil(route.summary.trafficDelayInSeconds / 60),
+        waypoint_order=waypoint_order,
+    )
+
+
+def cached_route(route: Route) -> CachedRoute:
+    """Return the part of a route that the origin cache keeps, the points of a route take far more memory than its encoded polyline."""
+    return CachedRoute(data=travel_time_data(route), geometry=route_geometry(route))
+
+
+def estimate_data(estimate: RouteEstimate) -> TomTomTravelTimeData:
+    """Return the travel time data of the route of a routing backend, like the summary of a TomTom route."""
+    delay = estimate.delay or 0.0
+    return TomTomTravelTimeData(
+        duration=math.ceil((estimate.duration + delay) / 60),
+        distance=estimate.distance / 1000,
+        delay=math.ceil(delay / 60),
+    )
+
+
+def optimized_waypoint_order(response: dict[str, Any], waypoints: int) -> tuple[int, ...]:
+    """Return the provided index of the stops in their optimized order, or the provided order when TomTom didn't reorder them."""
+    optimized = {item["optimizedIndex"]: item["providedIndex"] for item in response.get("optimizedWaypoints") or []}
+    return tuple(optimized.get(index, index) for index in range(waypoints))
+
+
+class TomTomDataUpdateCoordinator(DataUpdateCoordinator[TomTomTravelTimeData]):  # pylint: disable=too-many-instance-attributes
+    """DataUpdateCoordinator, shared by the config entries with an identical route.
+
+    The coordinator can outlive the entry it was created for, so it isn't bound to that entry and keeps a copy of its locations and options.
+    """
+
+    # Route points are only kept when an entry that shares this coordinator serves them to a map. These are class defaults, so coordinators
+    # without a map don't carry the extra instance attributes.
+    keep_geometry = False
+    geometry: RouteGeometry | None = None
+    _unsub_pause: CALLBACK_TYPE | None = None
+    _store: SharedStore | None = None
+    _best_order: BestOrder | None = None
+    # Forecasts are only made while an entry that shares this coordinator has forecast sensors, by unique ID of the sensors.
+    forecast: ForecastModel | None = None
+    _forecast_sensors: frozenset[str] = frozenset()
+    # The weekly profile is saved in the store of the first entry that forecasts with this coordinator.
+    _forecast_store: Store[dict[str, Any]] | None = None
+    _forecast_saved: dict[str, Any] | None = None
 
     def __init__(
         self,
@@ -44,46 +188,346 @@ class TomTomDataUpdateCoordinator(DataUpdateCoordinator[TomTomTravelTimeData]):
         super().__init__(
             hass,
             _LOGGER,
-            config_entry=config_entry,
+            config_entry=None,
             name=DOMAIN,
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
         )
         self._api_key = api_key
-        self._api = RoutingApi(ApiOptions(api_key=api_key), async_get_clientsession(hass))
+        self._api = async_get_routing_api(hass, api_key)
+        self.locations: list[str] = list(config_entry.data[CONF_LOCATIONS])
+        # Coordinates don't change, so they're parsed once instead of on every refresh.
+        self._coordinates = [lat_lon_from_coordinates(location) for location in self.locations]
+        self.options: dict[str, Any] = dict(config_entry.options)
+        self.prefetch: CalendarPrefetch | None = None
+        # Thresholds of the entries that share this coordinator, by unique ID of their entity.
+        self.thresholds: dict[str, Threshold] = {}
+
+        if calendar_entity_id := self.options.get(CONF_CALENDAR):
+            self.prefetch = CalendarPrefetch(hass, calendar_entity_id, api_key)
+
+        if store_location := self.options.get(CONF_SHARED_STORE):
+            self._store = async_get_shared_store(hass, store_location)
+
+        if pause_entity_id := self.options.get(CONF_PAUSE_ENTITY):
+            self._unsub_pause = async_track_state_change_event(hass, pause_entity_id, self._async_pause_changed)
+
+    @property
+    def paused(self) -> bool:
+        """Return whether updates are paused, because the pause entity is on."""
+        pause_entity_id = self.options.get(CONF_PAUSE_ENTITY)
+        return pause_entity_id is not None and self.hass.states.is_state(pause_entity_id, STATE_ON)
+
+    @callback
+    def _async_pause_changed(self, _: Event[EventStateChangedData]) -> None:
+        """Resume updates with an immediate refresh when the pause entity turns off, a pause takes effect on the next update."""
+        if self.paused or self.update_interval is not None:
+            return
+
+        _LOGGER.debug("Updates resumed, %s is no longer on", self.options[CONF_PAUSE_ENTITY])
+        self.update_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+        self.hass.async_create_task(self.async_request_refresh(), eager_start=True)
+
+    async def async_shutdown(self) -> None:
+        """Stop tracking the pause entity and shut down the coordinator."""
+        if self._unsub_pause is not None:
+            self._unsub_pause()
+            self._unsub_pause = None
+        await super().async_shutdown()
 
     async def _async_update_data(self) -> TomTomTravelTimeData:
+        """Get the latest data from the Routing API, the refresh is counted when profiling."""
+        try:
+            return await self._async_fetch_route()
+        finally:
+            async_refresh_done(self.hass)
+
+    async def _async_fetch_route(self) -> TomTomTravelTimeData:
         """Get the latest data from the Routing API."""
+        # There are no updates scheduled while paused, the first refresh still requests a route so the entities have a state.
+        if self.data is not None and self.paused:
+            self.update_interval = None
+            _LOGGER.debug("Updates paused, %s is on", self.options[CONF_PAUSE_ENTITY])
+            return self.data
+
+        prefetch = self.prefetch
+        if prefetch is not None:
+            now = dt_util.utcnow()
+            await prefetch.async_update(now)
+            if not prefetch.should_refresh(now, self.data):
+                self.update_interval = prefetch.next_interval(now, self.data)
+                _LOGGER.debug("No departure within the prefetch window, next check in %s", self.update_interval)
+                return self.data
+
         _LOGGER.debug("Fetching Route")
 
         locations: list[LatLon] = []
-        for location in self.config_entry.data[CONF_LOCATIONS]:
-            lat_lon = await lat_lon_from_user_input(self.hass, self._api_key, location)
-            if not isinstance(lat_lon, UserInputLatLan):
-                _LOGGER.error("Cannot determine location: %s", location)
-            else:
+        for location, coordinates in zip(self.locations, self._coordinates, strict=True):
+            if coordinates is not None:
+                locations.append(coordinates)
+            elif isinstance(lat_lon := await lat_lon_from_user_input(self.hass, self._api_key, location, self._store), UserInputLatLan):
                 locations.append(lat_lon.location)
+            else:
+                _LOGGER.error("Cannot determine location: %s", location)
+
+        if prefetch is not None and (destination := await prefetch.async_destination()) is not None:
+            locations = [*locations[:-1], destination]
+
+        try:
+            data = await self._async_get_travel_time(locations)
+        except Exception as exception:
+            raise UpdateFailed from exception
+
+        if prefetch is not None:
+            self.update_interval = prefetch.next_interval(dt_util.utcnow(), data)
+            _LOGGER.debug("Next prefetch refresh in %s", self.update_interval)
+
+        self._update_forecast(data)
+        self._evaluate_thresholds(data)
+
+        return data
+
+    async def _async_get_travel_time(self, locations: list[LatLon]) -> TomTomTravelTimeData:
+        """Get the travel time, or the result of another instance that shares the store and refreshed the same route.
+
+        The shared result includes the encoded geometry of the route, so instances that serve the route to a map keep it up to date too.
+        """
+        if self._store is None:
+            data, route = await self._async_request_travel_time(locations)
+            self._update_geometry(route)
+            return data
+
+        async def refresh() -> dict[str, Any]:
+            data, route = await self._async_request_travel_time(locations)
+            return {**asdict(data), "geometry": asdict(route_geometry(route))}
+
+        key = f"route:{json_dumps(route_cache_key(locations, self.options))}"
+        value = await async_get_or_refresh(self._store, key, SHARED_STORE_ROUTE_TTL, refresh)
+        value = dict(value)
+        # Results that were published without a geometry leave the geometry as it is.
+        if (geometry := value.pop("geometry", None)) is not None:
+            self._update_geometry(RouteGeometry(**geometry))
+        if (order := value.get("waypoint_order")) is not None:
+            value["waypoint_order"] = tuple(order)
+        return TomTomTravelTimeData(**value)
+
+    async def _async_request_travel_time(self, locations: list[LatLon]) -> tuple[TomTomTravelTimeData, Route | RouteEstimate | CachedRoute]:
+        """Get the travel time data and the route it is from."""
+        route: Route | CachedRoute
+        if self.options.get(CONF_BEST_ORDER) and len(locations) >= BEST_ORDER_MIN_LOCATIONS:
+            route, order = await self._async_get_best_order_route(locations)
+        elif local_engine := self.options.get(CONF_LOCAL_ENGINE):
+            backend = async_get_traffic_backend(self.hass, local_engine, TomTomRoutingBackend(self._async_request_route))
+            estimate = await backend.async_route(locations, self.options)
+            return estimate_data(estimate), estimate
+        else:
+            route, order = await self._async_get_route(locations, self.options), None
+        return travel_time_data(route, order), route
+
+    async def _async_get_best_order_route(self, locations: list[LatLon]) -> tuple[Route, tuple[int, ...]]:
+        """Get the route along the stops in their best order.
+
+        The best order is computed by TomTom, and kept while the locations are the same. Its delay is compared on every update, when
+        traffic changed significantly the order is computed again on the next update.
+        """
+        origin, *stops, destination = locations
+        key = route_cache_key(locations, self.options)
+        best_order = self._best_order
+
+        if best_order is None or best_order.key != key:
+            route, order = await self._async_request_best_order_route(locations)
+            self._best_order = BestOrder(key=key, order=order, delay=travel_time_data(route).delay)
+            _LOGGER.debug("Best order of the stops: %s", order)
+            return route, order
+
+        route = await self._async_request_route([origin, *(stops[index] for index in best_order.order), destination], self.options)
+        if abs(travel_time_data(route).delay - best_order.delay) >= BEST_ORDER_DELAY_CHANGE:
+            _LOGGER.debug("Traffic changed since the best order was computed, computing it again on the next update")
+            self._best_order = None
+        return route, best_order.order
 
-        travel_mode = TravelModeType[self.config_entry.options[CONF_VEHICLE_TYPE].upper()]
-        route_type = RouteType[self.config_entry.options[CONF_ROUTE_TYPE].upper()]
-        avoids: list[AvoidType] = [AvoidType[avoid.upper()] for avoid in self.config_entry.options[CONF_AVOID_TYPE]]
+    def _update_geometry(self, route: Route | RouteEstimate | CachedRoute | RouteGeometry) -> None:
+        """Keep the geometry of the route, the previous geometry is kept when the points didn't change so its ETag stays valid."""
+        if not self.keep_geometry:
+            if self.geometry is not None:
+                self.geometry = None
+            return
 
-        _LOGGER.debug("Planning route with locations: %s travel_mode: %s, route_type: %s, avoids: %s", locations, travel_mode, route_type, avoids)
+        geometry = route_geometry(route)
+        if self.geometry is None or geometry.etag != self.geometry.etag:
+            _LOGGER.debug("Route geometry changed, %s points", geometry.points)
+            self.geometry = geometry
 
+    def _update_forecast(self, data: TomTomTravelTimeData) -> None:
+        """Add new data to the forecast, when forecasting."""
+        if self.forecast is not None:
+            self.forecast.update(dt_util.utcnow(), data)
+            if self._forecast_store is not None:
+                self._forecast_store.async_delay_save(self.forecast.saved, FORECAST_SAVE_DELAY)
+
+    def _evaluate_thresholds(self, data: TomTomTravelTimeData) -> None:
+        """Evaluate the thresholds on new data, entities only write their state when their threshold is crossed or cleared."""
+        for unique_id, threshold in self.thresholds.items():
+            if threshold.update(data):
+                _LOGGER.debug("Threshold %s is %s: %s", unique_id, "crossed" if threshold.is_on else "cleared", data)
+
+    @callback
+    def async_add_threshold(self, unique_id: str, threshold: Threshold) -> CALLBACK_TYPE:
+        """Evaluate a threshold on every update, return a callback to remove it."""
+        threshold.update(self.data)
+        self.thresholds[unique_id] = threshold
+
+        @callback
+        def remove_threshold() -> None:
+            self.thresholds.pop(unique_id, None)
+
+        return remove_threshold
+
+    async def async_load_forecast(self, store: Store[dict[str, Any]]) -> None:
+        """Load the saved weekly profile of an entry, before its forecast sensors are added."""
+        if self._forecast_store is None:
+            self._forecast_store = store
+            self._forecast_saved = await store.async_load()
+
+    @callback
+    def async_enable_forecast(self, unique_id: str) -> CALLBACK_TYPE:
+        """Start forecasting on every update for a sensor, return a callback to remove it.
+
+        The current data is the first sample after the saved profile. Forecasting stops when the last forecast sensor is removed, so its
+        samples are released.
+        """
+        self._forecast_sensors |= {unique_id}
+        if self.forecast is None:
+            self.forecast = ForecastModel(self._forecast_saved)
+            self._forecast_saved = None
+            if self.data is not None:
+                self.forecast.update(dt_util.utcnow(), self.data)
+
+        @callback
+        def remove_forecast_sensor() -> None:
+            self._forecast_sensors -= {unique_id}
+            if not self._forecast_sensors:
+                self.forecast = None
+                self._forecast_store = None
+
+        return remove_forecast_sensor
+
+    async def async_calculate_route(self, locations: list[LatLon], options: Mapping[str, Any]) -> TomTomTravelTimeData:
+        """Calculate a route with the Routing API client of this config entry."""
+        return travel_time_data(await self._async_get_route(locations, options))
+
+    async def _async_get_route(self, locations: list[LatLon], options: Mapping[str, Any]) -> Route | CachedRoute:
+        """Get the route between the locations, from the routes of origins in the same grid cell when the origin is snapped to a grid.
+
+        The cache only keeps the travel time data and the geometry of a route, which is all that is read from it.
+        """
+        if not (cell_size := options.get(CONF_ORIGIN_CELL_SIZE)):
+            return await self._async_request_route(locations, options)
+
+        cache = async_get_cache(self.hass, DATA_ORIGIN_CACHE, ORIGIN_CACHE_TTL, ORIGIN_CACHE_MAX_SIZE)
+        key = origin_cell_key(locations, options, cell_size)
+
+        if (cached := cache.get(key)) is None:
+            route = await self._async_request_route(locations, options)
+            cache.set(key, cached_route(route))
+            return route
+
+        _LOGGER.debug("Using the route of an origin in the same grid cell for %s", key)
+        return cached
+
+    async def _async_request_route(self, locations: list[LatLon], options: Mapping[str, Any]) -> Route:
+        """Request the route between the locations from the Routing API."""
+        _LOGGER.debug("Planning route with locations: %s options: %s", locations, route_options(options))
+
+        response = await async_call_with_key(
+            self.hass,
+            self._api_key,
+            "calculate_route",
+            lambda key: self._api.get_calculate_route(locations=LatLonList(locations=locations), params=route_params(key, options)),
+        )
+
+        return response.routes[0]
+
+    async def _async_request_best_order_route(self, locations: list[LatLon]) -> tuple[Route, tuple[int, ...]]:
+        """Request the route along the stops in their best order, and the best order of the stops.
+
+        The response model of the client doesn't include the optimized waypoints, so the response is read both as model and as dict.
+        """
+        _LOGGER.debug("Planning route in the best order with locations: %s", locations)
+
+        response = await async_call_with_key(
+            self.hass,
+            self._api_key,
+            "calculate_route_best_order",
+            lambda key: self._api.get(
+                f"/routing/1/calculateRoute/{LatLonList(locations=locations).to_colon_separated()}/json",
+                params=route_params(key, self.options, compute_best_order=True),
+            ),
+        )
+
+        route = (await response.deserialize(CalculatedRouteResponse)).routes[0]
+        return route, optimized_waypoint_order(await response.dict(), len(locations) - 2)
+
+
+class TomTomReachableRangeCoordinator(DataUpdateCoordinator[ReachableRangeData]):
+    """DataUpdateCoordinator for the reachable range around a center."""
+
+    config_entry: ConfigEntry[DataUpdateCoordinator]
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        api_key: str,
+    ) -> None:
+        """Initialize."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+        )
+        self._api_key = api_key
+        self._api = async_get_routing_api(hass, api_key)
+
+    async def _async_update_data(self) -> ReachableRangeData:
+        """Get the latest reachable range from the Routing API, the refresh is counted when profiling."""
         try:
-            response = await self._api.get_calculate_route(
-                locations=LatLonList(locations=locations),
-                params=CalculateRouteParams(
-                    maxAlternatives=0,
-                    routeType=route_type,
-                    travelMode=travel_mode,
-                    avoid=avoids,
-                ),
-            )
+            return await self._async_fetch_reachable_range()
+        finally:
+            async_refresh_done(self.hass)
+
+    async def _async_fetch_reachable_range(self) -> ReachableRangeData:
+        """Get the latest reachable range from the Routing API."""
+        _LOGGER.debug("Fetching reachable range")
 
-            return TomTomTravelTimeData(
-                duration=math.ceil(response.routes[0].summary.travelTimeInSeconds / 60),
-                distance=response.routes[0].summary.lengthInMeters / 1000,
-                delay=math.ceil(response.routes[0].summary.trafficDelayInSeconds / 60),
+        center = await lat_lon_from_user_input(self.hass, self._api_key, self.config_entry.data[CONF_CENTER])
+        if not isinstance(center, UserInputLatLan):
+            msg = f"Cannot determine center: {self.config_entry.data[CONF_CENTER]}"
+            raise UpdateFailed(msg)
+
+        travel_mode, route_type, avoids = route_options(self.config_entry.options)
+
+        try:
+            response = await async_call_with_key(
+                self.hass,
+                self._api_key,
+                "calculate_reachable_range",
+                lambda key: self._api.get_calculate_reachable_range(
+                    origin=center.location,
+                    params=CalculateReachableRouteParams(
+                        key=key,
+                        timeBudgetInSec=self.config_entry.data[CONF_TIME_BUDGET] * 60,
+                        routeType=route_type,
+                        travelMode=travel_mode,
+                        avoid=avoids,
+                    ),
+                ),
             )
         except Exception as exception:
             raise UpdateFailed from exception
+
+        polygon = ReachablePolygon([(point.latitude, point.longitude) for point in response.reachableRange.boundary])
+        _LOGGER.debug("Reachable range has %s points, bounding box: %s", len(polygon), polygon.bounding_box)
+
+        return ReachableRangeData(center=center.location, polygon=polygon)
@@ -10,18 +10,42 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY
 from homeassistant.core import HomeAssistant
 
-from custom_components.tomtom_travel_time.coordinator import TomTomDataUpdateCoordinator
+from custom_components.tomtom_travel_time.coordinator import TomTomDataUpdateCoordinator, TomTomReachableRangeCoordinator
+from custom_components.tomtom_travel_time.keypool import async_get_key_pool
+from custom_components.tomtom_travel_time.metrics import async_get_metrics
+from custom_components.tomtom_travel_time.model import ReachableRangeData
+from custom_components.tomtom_travel_time.profiler import DATA_PROFILE_SUMMARY
 
 TO_REDACT = {CONF_API_KEY}
 
 
-async def async_get_config_entry_diagnostics(_hass: HomeAssistant, config_entry: ConfigEntry[TomTomDataUpdateCoordinator]) -> dict[str, Any]:
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry[TomTomDataUpdateCoordinator | TomTomReachableRangeCoordinator],
+) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
     coordinator = config_entry.runtime_data
 
     data: dict[str, Any] = {
         "config_entry": config_entry.as_dict(),
-        "data": asdict(coordinator.data) if coordinator.data else {},
+        "data": {},
+        "api_keys": async_get_key_pool(hass).as_dict(),
+        "profile": hass.data.get(DATA_PROFILE_SUMMARY),
+        "metrics": async_get_metrics(hass).as_dict(),
     }
 
+    if isinstance(coordinator.data, ReachableRangeData):
+        data["data"] = {
+            "center": asdict(coordinator.data.center),
+            "boundary_points": len(coordinator.data.polygon),
+            "bounding_box": coordinator.data.polygon.bounding_box,
+        }
+    elif coordinator.data:
+        data["data"] = asdict(coordinator.data)
+
+    if isinstance(coordinator, TomTomDataUpdateCoordinator):
+        data["paused"] = coordinator.paused
+        if coordinator.forecast is not None:
+            data["forecast"] = coordinator.forecast.as_dict()
+
     return async_redact_data(data, TO_REDACT)
@@ -0,0 +1,167 @@
+"""TomTom Travel Time forecast."""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from custom_components.tomtom_travel_time.const import (
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    FORECAST_HORIZONS,
+    FORECAST_LEVEL_SMOOTHING,
+    FORECAST_MAX_GAP,
+    FORECAST_PROFILE_SMOOTHING,
+    FORECAST_PROFILE_WEIGHT,
+    FORECAST_SLOT,
+    FORECAST_STORE_VERSION,
+    FORECAST_TREND_HORIZON,
+    FORECAST_TREND_SMOOTHING,
+)
+from custom_components.tomtom_travel_time.model import TomTomTravelTimeData
+
+DATA_FORECAST_STORES: HassKey[dict[str, Store[dict[str, Any]]]] = HassKey(f"{DOMAIN}_forecast_stores")
+
+# A forecast is checked against the sample closest to its target time, samples are one update interval apart.
+FORECAST_TOLERANCE = timedelta(seconds=DEFAULT_SCAN_INTERVAL / 2)
+
+
+def profile_slot(when: datetime) -> tuple[int, int]:
+    """Return the weekday and time slot in local time, traffic follows the local clock."""
+    local = dt_util.as_local(when)
+    return local.weekday(), (local.hour * 60 + local.minute) // FORECAST_SLOT
+
+
+class ForecastError:  # pylint: disable=too-few-public-methods
+    """Mean absolute error of the forecasts for one horizon, next to the error of repeating the duration at the time of the forecast."""
+
+    __slots__ = ("persistence_sum", "samples", "sum")
+
+    def __init__(self) -> None:
+        """Initialize without samples."""
+        self.samples = 0
+        self.sum = 0.0
+        self.persistence_sum = 0.0
+
+    def add(self, forecast: float, persistence: float, actual: float) -> None:
+        """Add the error of a forecast that reached its target time."""
+        self.samples += 1
+        self.sum += abs(forecast - actual)
+        self.persistence_sum += abs(persistence - actual)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the errors in minutes."""
+        return {
+            "samples": self.samples,
+            "mean_absolute_error": round(self.sum / self.samples, 2) if self.samples else None,
+            "persistence_error": round(self.persistence_sum / self.samples, 2) if self.samples else None,
+        }
+
+
+class ForecastModel:  # pylint: disable=too-many-instance-attributes
+    """Forecast of the duration of a route, from the trend of the recent samples blended with the usual change at this time of the week.
+
+    The model is updated with every refreshed sample, so forecasts don't cost extra requests. The trend is smoothed with Holt's linear
+    method, the weekly profile keeps a moving average per weekday and time slot. Forecasts are checked when their target time is reached,
+    and compared to simply repeating the duration at the time of the forecast.
+    """
+
+    __slots__ = ("_errors", "_free_flow", "_pending", "_profile", "_updated", "forecasts", "level", "trend")
+
+    def __init__(self, saved: dict[str, Any] | None = None) -> None:
+        """Initialize without samples, with the weekly profile of a saved model."""
+        self.level: float | None = None
+        # Change of the duration in minutes per minute.
+        self.trend = 0.0
+        self.forecasts: dict[int, float] = {}
+        self._updated: datetime | None = None
+        self._free_flow = 0.0
+        self._profile: dict[tuple[int, int], float] = {(weekday, slot): duration for weekday, slot, duration in (saved or {}).get("profile", [])}
+        # Target time, horizon, forecast and duration at the time of the forecast.
+        self._pending: list[tuple[datetime, int, float, float]] = []
+        self._errors = {horizon: ForecastError() for horizon in FORECAST_HORIZONS}
+
+    def update(self, now: datetime, data: TomTomTravelTimeData) -> None:
+        """Add a sample and forecast the horizons."""
+        duration = float(data.duration)
+        self._check_forecasts(now, duration)
+
+        elapsed = (now - self._updated).total_seconds() / 60 if self._updated is not None else None
+        level = self.level
+        if level is None or elapsed is None or elapsed > FORECAST_MAX_GAP:
+            level = duration
+            self.trend = 0.0
+        elif elapsed > 0:
+            previous = level
+            level = FORECAST_LEVEL_SMOOTHING * duration + (1 - FORECAST_LEVEL_SMOOTHING) * (previous + self.trend * elapsed)
+            self.trend = FORECAST_TREND_SMOOTHING * (level - previous) / elapsed + (1 - FORECAST_TREND_SMOOTHING) * self.trend
+        self.level = level
+        self._updated = now
+        self._free_flow = duration - data.delay
+
+        # The forecasts use the profile of previous days, the current sample is only added to the profile afterwards.
+        self.forecasts = {horizon: self._forecast(now, level, horizon) for horizon in FORECAST_HORIZONS}
+        self._pending.extend((now + timedelta(minutes=horizon), horizon, forecast, duration) for horizon, forecast in self.forecasts.items())
+
+        slot = profile_slot(now)
+        usual = self._profile.get(slot)
+        self._profile[slot] = duration if usual is None else FORECAST_PROFILE_SMOOTHING * duration + (1 - FORECAST_PROFILE_SMOOTHING) * usual
+
+    def _forecast(self, now: datetime, level: float, horizon: int) -> float:
+        """Return the forecast duration after the horizon in minutes, never below the duration without traffic."""
+        # The trend flattens out, traffic doesn't keep getting worse at the same rate.
+        trend_change = self.trend * FORECAST_TREND_HORIZON * (1 - math.exp(-horizon / FORECAST_TREND_HORIZON))
+
+        change = trend_change
+        current = self._profile.get(profile_slot(now))
+        target = self._profile.get(profile_slot(now + timedelta(minutes=horizon)))
+        if current is not None and target is not None:
+            change = FORECAST_PROFILE_WEIGHT * (target - current) + (1 - FORECAST_PROFILE_WEIGHT) * trend_change
+
+        return round(max(level + change, self._free_flow), 1)
+
+    def _check_forecasts(self, now: datetime, duration: float) -> None:
+        """Add the errors of the forecasts with a target time around now, and drop the ones that were missed, for example while paused."""
+        pending: list[tuple[datetime, int, float, float]] = []
+        for forecast in self._pending:
+            target, horizon, value, persistence = forecast
+            if target - now > FORECAST_TOLERANCE:
+                pending.append(forecast)
+            elif now - target <= FORECAST_TOLERANCE:
+                self._errors[horizon].add(value, persistence, duration)
+        self._pending = pending
+
+    def saved(self) -> dict[str, Any]:
+        """Return the weekly profile to save, the trend is only about the recent samples and is learned again quickly."""
+        return {"profile": [[weekday, slot, duration] for (weekday, slot), duration in self._profile.items()]}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the model and the accuracy per horizon, for diagnostics."""
+        return {
+            "forecasts": self.forecasts,
+            "level": self.level,
+            "trend": self.trend,
+            "profile_slots": len(self._profile),
+            "accuracy": {horizon: error.as_dict() for horizon, error in self._errors.items()},
+        }
+
+
+@callback
+def async_get_forecast_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the saved forecast of an entry, one store per entry so a reload reads a save that is still pending."""
+    stores = hass.data.setdefault(DATA_FORECAST_STORES, {})
+    if (store := stores.get(entry_id)) is None:
+        store = stores[entry_id] = Store(hass, FORECAST_STORE_VERSION, f"{DOMAIN}.forecast.{entry_id}")
+    return store
+
+
+async def async_remove_forecast(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the saved forecast of a removed entry."""
+    await async_get_forecast_store(hass, entry_id).async_remove()
+    hass.data[DATA_FORECAST_STORES].pop(entry_id, None)
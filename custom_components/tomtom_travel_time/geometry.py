@@ -0,0 +1,107 @@
+"""TomTom Travel Time geometry."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Sequence
+
+# Edges are stored as (lat1, lon1, lat2, lon2).
+type Edge = tuple[float, float, float, float]
+
+DEFAULT_BANDS = 32
+DEFAULT_POLYLINE_PRECISION = 5
+# Length of a degree of latitude, and of longitude at the equator.
+METERS_PER_DEGREE = 111_320
+
+
+class ReachablePolygon:
+    """Polygon with a precomputed bounding box and latitude band index for fast point-in-polygon checks.
+
+    Every edge is stored in each latitude band it overlaps, so a lookup only ray casts against the few edges near the latitude of the point.
+    """
+
+    __slots__ = ("_band_height", "_bands", "max_lat", "max_lon", "min_lat", "min_lon", "points")
+
+    def __init__(self, points: Sequence[tuple[float, float]], bands: int = DEFAULT_BANDS) -> None:
+        """Initialize the polygon from (lat, lon) points, the polygon is closed automatically."""
+        self.points = tuple(points)
+        lats = [lat for lat, _ in self.points] or [0.0]
+        lons = [lon for _, lon in self.points] or [0.0]
+        self.min_lat, self.max_lat = min(lats), max(lats)
+        self.min_lon, self.max_lon = min(lons), max(lons)
+
+        edges: list[Edge] = [(*start, *end) for start, end in zip(self.points, self.points[1:] + self.points[:1], strict=True)]
+        band_count = max(1, min(bands, len(edges)))
+        self._band_height = (self.max_lat - self.min_lat) / band_count or 1.0
+        self._bands: list[list[Edge]] = [[] for _ in range(band_count)]
+
+        for edge in edges:
+            lat1, _, lat2, _ = edge
+            for band in range(self._band(min(lat1, lat2)), self._band(max(lat1, lat2)) + 1):
+                self._bands[band].append(edge)
+
+    def __len__(self) -> int:
+        """Return the number of points."""
+        return len(self.points)
+
+    def _band(self, lat: float) -> int:
+        """Return the index of the band for a latitude within the bounding box."""
+        return min(math.floor((lat - self.min_lat) / self._band_height), len(self._bands) - 1)
+
+    @property
+    def bounding_box(self) -> tuple[float, float, float, float]:
+        """Return the bounding box as (min_lat, min_lon, max_lat, max_lon)."""
+        return (self.min_lat, self.min_lon, self.max_lat, self.max_lon)
+
+    def contains(self, lat: float, lon: float) -> bool:
+        """Return whether the point is inside the polygon."""
+        if len(self.points) < 3 or not (self.min_lat <= lat <= self.max_lat and self.min_lon <= lon <= self.max_lon):  # noqa: PLR2004
+            return False
+
+        inside = False
+        for lat1, lon1, lat2, lon2 in self._bands[self._band(lat)]:
+            if (lat1 > lat) != (lat2 > lat) and lon < lon1 + (lat - lat1) * (lon2 - lon1) / (lat2 - lat1):
+                inside = not inside
+
+        return inside
+
+
+def grid_cell(lat: float, lon: float, size: float) -> tuple[int, int]:
+    """Return the (row, column) of the grid cell with sides of about size meters that contains the point.
+
+    Degrees of longitude get shorter towards the poles, so the width of the cells of a row is taken at the middle of the row.
+    """
+    row = math.floor(lat * METERS_PER_DEGREE / size)
+    row_lat = (row + 0.5) * size / METERS_PER_DEGREE
+    column = math.floor(lon * METERS_PER_DEGREE * math.cos(math.radians(row_lat)) / size)
+
+    return row, column
+
+
+def _encode_polyline_value(value: int) -> str:
+    """Return a delta of the encoded polyline format, in chunks of 5 bits with a continuation bit."""
+    value = ~(value << 1) if value < 0 else value << 1
+    chunks: list[str] = []
+    while value >= 0x20:  # noqa: PLR2004
+        chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+    return "".join(chunks)
+
+
+def encode_polyline(points: Iterable[tuple[float, float]], precision: int = DEFAULT_POLYLINE_PRECISION) -> str:
+    """Return (lat, lon) points in the encoded polyline format, which map libraries like Leaflet can decode.
+
+    Every point is stored as the difference with the previous point, so a route of a thousand points only takes a few kilobytes.
+    """
+    factor = 10**precision
+    previous_lat = previous_lon = 0
+    encoded: list[str] = []
+
+    for lat, lon in points:
+        lat_e, lon_e = round(lat * factor), round(lon * factor)
+        encoded.append(_encode_polyline_value(lat_e - previous_lat))
+        encoded.append(_encode_polyline_value(lon_e - previous_lon))
+        previous_lat, previous_lon = lat_e, lon_e
+
+    return "".join(encoded)
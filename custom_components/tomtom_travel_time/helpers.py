@@ -1,56 +1,116 @@
 """TomTom Travel Time helpers."""
 
+from __future__ import annotations
+
 import logging
 import re
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.location import find_coordinates
 
+from custom_components.tomtom_travel_time.const import DOMAIN, SHARED_STORE_GEOCODE_TTL
+from custom_components.tomtom_travel_time.keypool import async_call_with_key
 from custom_components.tomtom_travel_time.model import UserInputLatLan
+from custom_components.tomtom_travel_time.replay import async_get_tomtom_session
 from tomtom_apis import ApiOptions
 from tomtom_apis.models import LatLon, LatLonList
-from tomtom_apis.places import GeocodingApi
 from tomtom_apis.routing import RoutingApi
-from tomtom_apis.routing.models import CalculateRouteParams
+from tomtom_apis.routing.models import CalculateReachableRouteParams, CalculateRouteParams
+
+if TYPE_CHECKING:
+    from custom_components.tomtom_travel_time.store import SharedStore
 
 _LOGGER = logging.getLogger(__name__)
 
+COORDINATES_PATTERN = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
 
-async def lat_lon_from_user_input(hass: HomeAssistant, api_key: str, user_input: str) -> UserInputLatLan | None:
-    """Attempt to make a LatLon object from user input."""
-    # Step 1: Check if user_input is already 'float,float' or 'float, float'.
-    match = re.match(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$", user_input)
+
+def normalize_location(location: str) -> str:
+    """Return the location with normalized whitespace and case, to find identical addresses."""
+    return " ".join(location.split()).casefold()
+
+
+def allowed_config_path(hass: HomeAssistant, file: str) -> Path | None:
+    """Return the resolved path of a file relative to the config directory, or None when it isn't in the config directory or an allowed directory."""
+    path = Path(hass.config.path(file)).resolve()
+
+    if not path.is_relative_to(Path(hass.config.config_dir).resolve()) and not hass.config.is_allowed_path(str(path)):
+        return None
+    return path
+
+
+def lat_lon_from_coordinates(value: str) -> LatLon | None:
+    """Return a LatLon object if the value is 'float,float' or 'float, float'."""
+    match = COORDINATES_PATTERN.match(value)
     if match:
         lat, lon = map(float, match.groups())
-        return UserInputLatLan(location=LatLon(lat=lat, lon=lon))
+        return LatLon(lat=lat, lon=lon)
+
+    return None
+
+
+async def lat_lon_from_user_input(hass: HomeAssistant, api_key: str, user_input: str, store: SharedStore | None = None) -> UserInputLatLan | None:
+    """Attempt to make a LatLon object from user input, geocoded locations are shared with other instances through the store."""
+    # Step 1: Check if user_input is already 'float,float' or 'float, float'.
+    if (location := lat_lon_from_coordinates(user_input)) is not None:
+        return UserInputLatLan(location=location)
 
     # Step 2: Try Home Assistant's find_coordinates.
     coords_str = find_coordinates(hass, user_input)
-    if coords_str:
-        match = re.match(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$", coords_str)
-        if match:
-            lat, lon = map(float, match.groups())
-            return UserInputLatLan(location=LatLon(lat=lat, lon=lon))
+    if coords_str and (location := lat_lon_from_coordinates(coords_str)) is not None:
+        return UserInputLatLan(location=location)
 
     # Step 3: Fallback to geocoding API to determine the location.
-    async with GeocodingApi(ApiOptions(api_key=api_key), async_get_clientsession(hass)) as geo_coding_api:
-        response = await geo_coding_api.get_geocode(query=user_input)
+    key = f"geocode:{normalize_location(user_input)}"
+    if store is not None and (shared := await store.async_get(key)) is not None:
+        return UserInputLatLan(LatLon(lat=shared["lat"], lon=shared["lon"]), geocoded=True)
+
+    # The Places API is only needed for free-text locations, so it isn't imported when the integration is loaded.
+    from tomtom_apis.places import GeocodingApi  # noqa: PLC0415 # pylint: disable=import-outside-toplevel
+    from tomtom_apis.places.models import GeocodeParams  # noqa: PLC0415 # pylint: disable=import-outside-toplevel
+
+    async with GeocodingApi(ApiOptions(api_key=api_key), async_get_tomtom_session(hass)) as geo_coding_api:
+        response = await async_call_with_key(
+            hass,
+            api_key,
+            "geocode",
+            lambda key: geo_coding_api.get_geocode(query=user_input, params=GeocodeParams(key=key)),
+        )
 
         if len(response.results) > 0:
-            _LOGGER.info("Geocoding location response: %s", response.results[0].position)
-            return UserInputLatLan(response.results[0].position, geocoded=True)
+            position = response.results[0].position
+            _LOGGER.info("Geocoding location response: %s", position)
+            if store is not None:
+                await store.async_set(key, {"lat": position.lat, "lon": position.lon}, SHARED_STORE_GEOCODE_TTL)
+            return UserInputLatLan(position, geocoded=True)
 
     return None
 
 
+def entry_device_info(entry_id: str, name: str) -> DeviceInfo:
+    """Return the device info of an entry, to share between all entities of the entry."""
+    return DeviceInfo(
+        entry_type=DeviceEntryType.SERVICE,
+        identifiers={(DOMAIN, entry_id)},
+        name=name,
+        configuration_url="https://developer.tomtom.com/user/login",
+        manufacturer="TomTom",
+    )
+
+
 async def is_valid_config_entry(hass: HomeAssistant, api_key: str, locations: list[LatLon]) -> bool:
     """Return whether the config entry data is valid."""
-    async with RoutingApi(ApiOptions(api_key=api_key), async_get_clientsession(hass)) as routing_api:
-        response = await routing_api.get_calculate_route(
-            locations=LatLonList(locations=locations),
-            params=CalculateRouteParams(
-                maxAlternatives=0,
+    async with RoutingApi(ApiOptions(api_key=api_key), async_get_tomtom_session(hass)) as routing_api:
+        response = await async_call_with_key(
+            hass,
+            api_key,
+            "calculate_route",
+            lambda key: routing_api.get_calculate_route(
+                locations=LatLonList(locations=locations),
+                params=CalculateRouteParams(key=key, maxAlternatives=0),
             ),
         )
 
@@ -61,6 +121,26 @@ async def is_valid_config_entry(hass: HomeAssistant, api_key: str, locations: li
     raise ValidationError("cannot_plan_route")  # noqa: EM101
 
 
+async def is_valid_reachable_range(hass: HomeAssistant, api_key: str, center: LatLon, time_budget: int) -> bool:
+    """Return whether a reachable range can be calculated for the center and time budget in minutes."""
+    async with RoutingApi(ApiOptions(api_key=api_key), async_get_tomtom_session(hass)) as routing_api:
+        response = await async_call_with_key(
+            hass,
+            api_key,
+            "calculate_reachable_range",
+            lambda key: routing_api.get_calculate_reachable_range(
+                origin=center,
+                params=CalculateReachableRouteParams(key=key, timeBudgetInSec=time_budget * 60),
+            ),
+        )
+
+    if len(response.reachableRange.boundary) > 2:  # noqa: PLR2004
+        return True
+
+    _LOGGER.error("No reachable range found for the provided center.")
+    raise ValidationError("cannot_calculate_reachable_range")  # noqa: EM101
+
+
 class ValidationError(Exception):
     """Exception raised when user input validation fails."""
 
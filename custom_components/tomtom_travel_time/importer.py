@@ -0,0 +1,213 @@
+"""TomTom Travel Time bulk route import."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import logging
+import time
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+from homeassistant.config_entries import SOURCE_IMPORT
+from homeassistant.const import CONF_API_KEY, CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.util.yaml import load_yaml
+
+from custom_components.tomtom_travel_time.const import (
+    CONF_LOCATIONS,
+    DEFAULT_OPTIONS,
+    DOMAIN,
+    IMPORT_GEOCODE_CONCURRENCY,
+    IMPORT_GEOCODE_RATE,
+    LOCATION_PRECISION,
+    ROUTE_BATCH_SIZE,
+)
+from custom_components.tomtom_travel_time.coordinator import route_options
+from custom_components.tomtom_travel_time.helpers import lat_lon_from_coordinates, lat_lon_from_user_input, normalize_location
+from custom_components.tomtom_travel_time.keypool import async_call_with_key
+from custom_components.tomtom_travel_time.model import ImportRow, UserInputLatLan
+from custom_components.tomtom_travel_time.replay import async_get_tomtom_session
+from tomtom_apis import ApiOptions, TomTomAPIError
+from tomtom_apis.api import BaseParams
+from tomtom_apis.models import LatLon, LatLonList
+from tomtom_apis.routing import RoutingApi
+from tomtom_apis.routing.models import CalculateRouteParams
+
+_LOGGER = logging.getLogger(__name__)
+
+ROUTE_BATCH_ENDPOINT = "/routing/1/batch/sync/json"
+
+type RouteKey = tuple[tuple[float, float], ...]
+
+
+class RateLimiter:
+    """Limits the number of concurrent calls, and spaces the start of calls to a maximum rate per second."""
+
+    def __init__(self, rate: float, concurrency: int) -> None:
+        """Initialize."""
+        self._interval = 1 / rate
+        self._next_start = 0.0
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self) -> None:
+        """Wait for a free slot."""
+        await self._semaphore.acquire()
+        now = time.monotonic()
+        start = max(now, self._next_start)
+        self._next_start = start + self._interval
+
+        if start > now:
+            try:
+                await asyncio.sleep(start - now)
+            except BaseException:
+                self._semaphore.release()
+                raise
+
+    async def __aexit__(self, *_: object) -> None:
+        """Release the slot."""
+        self._semaphore.release()
+
+
+def route_key(locations: list[LatLon]) -> RouteKey:
+    """Return a key for a route, locations are rounded so a geocoded address matches stored coordinates."""
+    return tuple((round(location.lat, LOCATION_PRECISION), round(location.lon, LOCATION_PRECISION)) for location in locations)
+
+
+def load_routes_file(path: Path) -> list[dict[str, Any]]:
+    """Load routes from a CSV file with a name and the locations per line, or a YAML file with a list of routes."""
+    if path.suffix.lower() != ".csv":
+        return load_yaml(path)  # type: ignore[return-value]
+
+    with path.open(newline="", encoding="utf-8") as file:
+        return [{CONF_NAME: line[0], CONF_LOCATIONS: [location for location in line[1:] if location.strip()]} for line in csv.reader(file) if line]
+
+
+async def _async_resolve_location(hass: HomeAssistant, api_key: str, limiter: RateLimiter, location: str) -> UserInputLatLan | None:
+    """Resolve a location, only locations that might need geocoding are rate limited."""
+    if (lat_lon := lat_lon_from_coordinates(location)) is not None:
+        return UserInputLatLan(location=lat_lon)
+
+    async with limiter:
+        try:
+            return await lat_lon_from_user_input(hass, api_key, location)
+        except TomTomAPIError:
+            _LOGGER.exception("Cannot geocode location: %s", location)
+            return None
+
+
+async def _async_validate_routes(hass: HomeAssistant, api_key: str, routes: list[list[LatLon]]) -> list[str | None]:
+    """Validate routes with batch routing requests, return an error per route or None when the route is valid."""
+    # The Places API models are only needed for an import, so they aren't imported when the integration is loaded.
+    from tomtom_apis.places.models import BatchItem, BatchPostData  # noqa: PLC0415 # pylint: disable=import-outside-toplevel
+
+    travel_mode, route_type, avoids = route_options(DEFAULT_OPTIONS)
+    query = urlencode(CalculateRouteParams(maxAlternatives=0, routeType=route_type, travelMode=travel_mode, avoid=avoids).to_dict(), doseq=True)
+    routing_api = RoutingApi(ApiOptions(api_key=api_key), async_get_tomtom_session(hass))
+    errors: list[str | None] = []
+
+    for start in range(0, len(routes), ROUTE_BATCH_SIZE):
+        data = BatchPostData(
+            batchItems=[
+                BatchItem(query=f"/calculateRoute/{LatLonList(locations=locations).to_colon_separated()}/json?{query}")
+                for locations in routes[start : start + ROUTE_BATCH_SIZE]
+            ],
+        )
+        response = await async_call_with_key(
+            hass,
+            api_key,
+            "batch",
+            lambda key, data=data: routing_api.post(ROUTE_BATCH_ENDPOINT, params=BaseParams(key=key), data=data),  # type: ignore[misc]
+        )
+        items = (await response.dict())["batchItems"]
+        errors.extend(None if item["statusCode"] == HTTPStatus.OK and item["response"].get("routes") else "cannot_plan_route" for item in items)
+
+    return errors
+
+
+def _existing_routes(hass: HomeAssistant) -> set[RouteKey]:
+    """Return the keys of the routes of existing entries, with locations that are stored as coordinates."""
+    existing: set[RouteKey] = set()
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        stored = [lat_lon_from_coordinates(location) for location in entry.data.get(CONF_LOCATIONS, [])]
+        locations = [location for location in stored if location is not None]
+        if locations and len(locations) == len(stored):
+            existing.add(route_key(locations))
+
+    return existing
+
+
+async def _async_resolve_locations(hass: HomeAssistant, api_key: str, rows: list[ImportRow]) -> dict[str, UserInputLatLan | None]:
+    """Resolve the unique locations of the rows concurrently, by normalized location."""
+    unique = {normalize_location(location): location for row in rows for location in row.locations}
+    limiter = RateLimiter(IMPORT_GEOCODE_RATE, IMPORT_GEOCODE_CONCURRENCY)
+    resolved = await asyncio.gather(*(_async_resolve_location(hass, api_key, limiter, location) for location in unique.values()))
+    _LOGGER.debug("Resolved %s unique locations for %s routes", len(unique), len(rows))
+
+    return dict(zip(unique, resolved, strict=True))
+
+
+async def _async_create_entry(hass: HomeAssistant, api_key: str, row: ImportRow, lat_lons: list[UserInputLatLan]) -> None:
+    """Create the entry of a validated row."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": SOURCE_IMPORT},
+        data={
+            CONF_NAME: row.name,
+            CONF_API_KEY: api_key,
+            # Geocoded locations are stored as coordinates, like the config flow does, to preserve geocode API calls on state updates.
+            CONF_LOCATIONS: [
+                lat_lon.location.to_comma_separated() if lat_lon.geocoded else location
+                for location, lat_lon in zip(row.locations, lat_lons, strict=True)
+            ],
+        },
+    )
+    if result["type"] is FlowResultType.CREATE_ENTRY:
+        row.entry_id = result["result"].entry_id
+
+
+async def async_import_routes(hass: HomeAssistant, api_key: str, rows: list[ImportRow]) -> list[ImportRow]:
+    """Import routes as config entries, the outcome is set on every row.
+
+    Identical addresses are geocoded once, concurrently under a rate limit. All routes are validated with batch routing requests, instead
+    of one request per route.
+    """
+    for row in rows:
+        if len(row.locations) < 2:  # noqa: PLR2004
+            row.error = "at_least_two_locations"
+
+    pending = [row for row in rows if row.error is None]
+    resolved = await _async_resolve_locations(hass, api_key, pending)
+    existing = _existing_routes(hass)
+    seen: dict[RouteKey, int] = {}
+    valid: list[tuple[ImportRow, list[UserInputLatLan]]] = []
+
+    for row in pending:
+        lat_lons: list[UserInputLatLan] = []
+        for location in row.locations:
+            if (lat_lon := resolved[normalize_location(location)]) is None:
+                row.error, row.detail = "cannot_determine_location", location
+                break
+            lat_lons.append(lat_lon)
+        else:
+            key = route_key([lat_lon.location for lat_lon in lat_lons])
+            if key in existing:
+                row.error = "already_configured"
+            elif key in seen:
+                row.error, row.detail = "duplicate", str(seen[key])
+            else:
+                seen[key] = row.row
+                valid.append((row, lat_lons))
+
+    errors = await _async_validate_routes(hass, api_key, [[lat_lon.location for lat_lon in lat_lons] for _, lat_lons in valid]) if valid else []
+
+    for (row, lat_lons), error in zip(valid, errors, strict=True):
+        if error is None:
+            await _async_create_entry(hass, api_key, row, lat_lons)
+        else:
+            row.error = error
+
+    return rows
@@ -0,0 +1,162 @@
+"""TomTom Travel Time API key pool."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import ClientResponseError
+from homeassistant.config_entries import SIGNAL_CONFIG_ENTRY_CHANGED, ConfigEntry, ConfigEntryChange
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from custom_components.tomtom_travel_time.const import CONF_DAILY_QUOTA, CONF_KEY_POOL, DEFAULT_DAILY_QUOTA, DOMAIN, KEY_POOL_COOLDOWN
+from custom_components.tomtom_travel_time.metrics import async_track_request
+from custom_components.tomtom_travel_time.model import ApiKeyUsage
+from tomtom_apis import TomTomAPIClientError
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_KEY_POOL: HassKey[ApiKeyPool] = HassKey(f"{DOMAIN}_key_pool")
+
+# Statuses TomTom returns for an invalid key, or a key that is over its quota or QPS limit.
+FAILOVER_STATUSES = {HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN, HTTPStatus.TOO_MANY_REQUESTS}
+
+
+def mask_api_key(api_key: str) -> str:
+    """Return a masked API key that is safe to log."""
+    return f"...{api_key[-4:]}"
+
+
+def is_key_error(exception: TomTomAPIClientError) -> bool:
+    """Return whether the client error is caused by the API key, rather than by the request."""
+    cause = exception.__cause__
+    return isinstance(cause, ClientResponseError) and cause.status in FAILOVER_STATUSES
+
+
+class ApiKeyPool:
+    """Spreads requests over the API keys of all loaded entries that share their key.
+
+    Keys are picked with a smooth weighted round-robin, weighted by the remaining daily quota. TomTom doesn't report the remaining quota,
+    so it's derived from the requests counted here. A key that fails with an auth or quota error is skipped for a while and the request is
+    retried with the next key. Keys of entries that don't share their key are only used by those entries, but their usage is tracked too.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._usage: dict[str, ApiKeyUsage] = {}
+        self._weights: dict[str, int] = {}
+        # The quotas are collected on first use, and again after an entry of this integration is loaded, unloaded or updated.
+        self._quotas: dict[str, int] | None = None
+        async_dispatcher_connect(hass, SIGNAL_CONFIG_ENTRY_CHANGED, self._async_entry_changed)
+
+    @callback
+    def _async_entry_changed(self, _change: ConfigEntryChange, entry: ConfigEntry) -> None:
+        """Collect the quotas again when an entry of this integration changes."""
+        if entry.domain == DOMAIN:
+            self._quotas = None
+
+    def _shared_quotas(self) -> dict[str, int]:
+        """Return the daily quota of every shared key."""
+        if self._quotas is None:
+            quotas: dict[str, int] = {}
+            for entry in self.hass.config_entries.async_loaded_entries(DOMAIN):
+                if entry.options.get(CONF_KEY_POOL):
+                    api_key = entry.data[CONF_API_KEY]
+                    quotas[api_key] = max(quotas.get(api_key, 0), int(entry.options.get(CONF_DAILY_QUOTA, DEFAULT_DAILY_QUOTA)))
+            self._quotas = quotas
+        return self._quotas
+
+    def _get_usage(self, api_key: str, now: datetime) -> ApiKeyUsage:
+        """Return the usage of a key, reset when a new day has started."""
+        usage = self._usage.get(api_key)
+        if usage is None or usage.day != now.date():
+            usage = self._usage[api_key] = ApiKeyUsage(day=now.date())
+        return usage
+
+    def _next_key(self, api_key: str, tried: set[str]) -> str | None:
+        """Return the next key to use for a request with the given key, or None when all keys have been tried."""
+        now = dt_util.utcnow()
+        quotas = self._shared_quotas()
+        candidates = list(quotas) if api_key in quotas else [api_key]
+
+        weights: dict[str, int] = {}
+        for candidate in candidates:
+            usage = self._get_usage(candidate, now)
+            if candidate in tried or (usage.cooldown_until is not None and usage.cooldown_until > now):
+                continue
+            weights[candidate] = max(quotas.get(candidate, DEFAULT_DAILY_QUOTA) - usage.requests, 0)
+
+        if not weights:
+            # Always try the key of the caller once, even when it's cooling down.
+            return api_key if api_key not in tried else None
+        if not any(weights.values()):
+            # All quotas are used according to our own count, which can be off when a key is used elsewhere too.
+            weights = dict.fromkeys(weights, 1)
+
+        total = sum(weights.values())
+        for candidate, weight in weights.items():
+            self._weights[candidate] = self._weights.get(candidate, 0) + weight
+        key = max(weights, key=lambda candidate: self._weights[candidate])
+        self._weights[key] -= total
+
+        return key
+
+    async def async_call[T](self, api_key: str, endpoint: str, call: Callable[[str], Awaitable[T]]) -> T:
+        """Call the endpoint with a key from the pool, failing over to the next key on auth or quota errors, every try is a request in the metrics."""
+        tried: set[str] = set()
+        key = self._next_key(api_key, tried) or api_key
+
+        while True:
+            tried.add(key)
+            usage = self._get_usage(key, dt_util.utcnow())
+            usage.requests += 1
+
+            try:
+                return await async_track_request(self.hass, endpoint, call(key))
+            except TomTomAPIClientError as exception:
+                if not is_key_error(exception):
+                    raise
+                usage.failures += 1
+                usage.cooldown_until = dt_util.utcnow() + timedelta(seconds=KEY_POOL_COOLDOWN)
+                _LOGGER.warning("API key %s was rejected, skipping it for %s seconds", mask_api_key(key), KEY_POOL_COOLDOWN)
+
+                if (next_key := self._next_key(api_key, tried)) is None:
+                    raise
+                key = next_key
+
+    @callback
+    def as_dict(self) -> dict[str, Any]:
+        """Return the usage per key with masked keys, for diagnostics."""
+        quotas = self._shared_quotas()
+        return {
+            mask_api_key(api_key): {
+                "shared": api_key in quotas,
+                "day": usage.day.isoformat(),
+                "requests": usage.requests,
+                "failures": usage.failures,
+                "remaining": max(quotas.get(api_key, DEFAULT_DAILY_QUOTA) - usage.requests, 0),
+                "cooldown_until": usage.cooldown_until.isoformat() if usage.cooldown_until else None,
+            }
+            for api_key, usage in self._usage.items()
+        }
+
+
+@callback
+def async_get_key_pool(hass: HomeAssistant) -> ApiKeyPool:
+    """Return the API key pool, it's created on first use so the config flow can use it too."""
+    if (pool := hass.data.get(DATA_KEY_POOL)) is None:
+        pool = hass.data[DATA_KEY_POOL] = ApiKeyPool(hass)
+    return pool
+
+
+async def async_call_with_key[T](hass: HomeAssistant, api_key: str, endpoint: str, call: Callable[[str], Awaitable[T]]) -> T:
+    """Call the endpoint with the given key, or with a key from the pool when the given key is shared."""
+    return await async_get_key_pool(hass).async_call(api_key, endpoint, call)
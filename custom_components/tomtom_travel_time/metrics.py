@@ -0,0 +1,188 @@
+"""TomTom Travel Time metrics."""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable
+from itertools import accumulate
+from typing import Any, Protocol
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from custom_components.tomtom_travel_time.const import DOMAIN, METRICS_LATENCY_BUCKETS
+
+DATA_METRICS: HassKey[MetricsRegistry] = HassKey(f"{DOMAIN}_metrics")
+
+METRIC_PREFIX = DOMAIN
+
+
+class CacheStats(Protocol):  # pylint: disable=too-few-public-methods
+    """Cache that counts its hits and misses."""
+
+    hits: int
+    misses: int
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+
+
+class Counter:  # pylint: disable=too-few-public-methods
+    """Counter that only goes up."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        """Initialize at zero."""
+        self.value = 0
+
+    def inc(self) -> None:
+        """Count one."""
+        self.value += 1
+
+
+class Histogram:
+    """Histogram with fixed buckets, an observation only increments the count of its bucket and doesn't create containers."""
+
+    __slots__ = ("bounds", "count", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Initialize with the upper bounds of the buckets, the last bucket is unbounded."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Count a value in the first bucket with an upper bound of at least the value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[int]:
+        """Return the number of values up to each upper bound, like Prometheus buckets."""
+        return list(accumulate(self.counts))
+
+
+class MetricFamily[M: (Counter, Histogram)]:  # pylint: disable=too-few-public-methods
+    """Metric with one label, there is a child per label value that is created on first use."""
+
+    __slots__ = ("_factory", "children", "description", "label", "name")
+
+    def __init__(self, name: str, description: str, label: str, factory: Callable[[], M]) -> None:
+        """Initialize without children."""
+        self.name = f"{METRIC_PREFIX}_{name}"
+        self.description = description
+        self.label = label
+        self._factory: Callable[[], M] = factory
+        self.children: dict[str, M] = {}
+
+    def labels(self, value: str) -> M:
+        """Return the child for the label value."""
+        if (child := self.children.get(value)) is None:
+            child = self.children[value] = self._factory()
+        return child
+
+
+class MetricsRegistry:
+    """Metrics of all entries, like requests per endpoint, errors per exception type, request durations and cache hits.
+
+    The metrics only live in memory and start at zero when Home Assistant starts. Cache hits and misses are counted by the caches
+    themselves and collected when the metrics are read.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without samples."""
+        self.started = time.monotonic()
+        self.requests = MetricFamily("requests_total", "Requests by endpoint.", "endpoint", Counter)
+        self.errors = MetricFamily("request_errors_total", "Failed requests by exception type.", "exception", Counter)
+        self.durations = MetricFamily(
+            "request_duration_seconds",
+            "Duration of requests by endpoint.",
+            "endpoint",
+            lambda: Histogram(METRICS_LATENCY_BUCKETS),
+        )
+        self.caches: dict[str, CacheStats] = {}
+
+    def record_request(self, endpoint: str, seconds: float, exception: Exception | None = None) -> None:
+        """Count a request and its duration, and its exception when it failed."""
+        self.requests.labels(endpoint).inc()
+        self.durations.labels(endpoint).observe(seconds)
+        if exception is not None:
+            self.errors.labels(type(exception).__name__).inc()
+
+    def as_prometheus(self) -> str:
+        """Return the metrics in the Prometheus text format."""
+        lines: list[str] = []
+        for family in (self.requests, self.errors):
+            lines.extend((f"# HELP {family.name} {family.description}", f"# TYPE {family.name} counter"))
+            lines.extend(f'{family.name}{{{family.label}="{value}"}} {counter.value}' for value, counter in family.children.items())
+
+        durations = self.durations
+        lines.extend((f"# HELP {durations.name} {durations.description}", f"# TYPE {durations.name} histogram"))
+        for value, histogram in durations.children.items():
+            for bound, count in zip((*histogram.bounds, "+Inf"), histogram.cumulative(), strict=True):
+                lines.append(f'{durations.name}_bucket{{{durations.label}="{value}",le="{bound}"}} {count}')
+            lines.extend(
+                (
+                    f'{durations.name}_sum{{{durations.label}="{value}"}} {histogram.sum}',
+                    f'{durations.name}_count{{{durations.label}="{value}"}} {histogram.count}',
+                ),
+            )
+
+        for name, kind, description, read in (
+            ("cache_hits_total", "counter", "Cache lookups that found a value.", lambda cache: cache.hits),
+            ("cache_misses_total", "counter", "Cache lookups that found no value or an expired value.", lambda cache: cache.misses),
+            ("cache_size", "gauge", "Items in the cache, including expired items that aren't purged yet.", len),
+        ):
+            lines.extend((f"# HELP {METRIC_PREFIX}_{name} {description}", f"# TYPE {METRIC_PREFIX}_{name} {kind}"))
+            lines.extend(f'{METRIC_PREFIX}_{name}{{cache="{cache_name}"}} {read(cache)}' for cache_name, cache in self.caches.items())
+
+        return "\n".join(lines) + "\n"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the metrics, for diagnostics."""
+        minutes = max((time.monotonic() - self.started) / 60, 1)
+        requests = sum(counter.value for counter in self.requests.children.values())
+        errors = sum(counter.value for counter in self.errors.children.values())
+
+        return {
+            "requests": {endpoint: counter.value for endpoint, counter in self.requests.children.items()},
+            "requests_per_minute": {endpoint: round(counter.value / minutes, 2) for endpoint, counter in self.requests.children.items()},
+            "errors": {exception: counter.value for exception, counter in self.errors.children.items()},
+            "error_rate": round(errors / requests, 4) if requests else None,
+            "mean_duration": {
+                endpoint: round(histogram.sum / histogram.count, 3) for endpoint, histogram in self.durations.children.items() if histogram.count
+            },
+            "caches": {
+                name: {
+                    "size": len(cache),
+                    "hits": cache.hits,
+                    "misses": cache.misses,
+                    "hit_ratio": round(cache.hits / (cache.hits + cache.misses), 4) if cache.hits + cache.misses else None,
+                }
+                for name, cache in self.caches.items()
+            },
+        }
+
+
+@callback
+def async_get_metrics(hass: HomeAssistant) -> MetricsRegistry:
+    """Return the metrics registry, it's created on first use."""
+    if (metrics := hass.data.get(DATA_METRICS)) is None:
+        metrics = hass.data[DATA_METRICS] = MetricsRegistry()
+    return metrics
+
+
+async def async_track_request[T](hass: HomeAssistant, endpoint: str, request: Awaitable[T]) -> T:
+    """Await the request and record it in the metrics, cancelled requests aren't recorded."""
+    metrics = async_get_metrics(hass)
+    start = time.perf_counter()
+    try:
+        result = await request
+    except Exception as exception:
+        metrics.record_request(endpoint, time.perf_counter() - start, exception)
+        raise
+    metrics.record_request(endpoint, time.perf_counter() - start)
+    return result
@@ -2,23 +2,111 @@
 
 from __future__ import annotations
 
+from collections.abc import Hashable
 from dataclasses import dataclass
+from datetime import date, datetime
 
+from custom_components.tomtom_travel_time.geometry import ReachablePolygon
 from tomtom_apis.models import LatLon
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TomTomTravelTimeData:
     """Routing information."""
 
     duration: float
     distance: float
     delay: float
+    # Stops between origin and destination in the best order, as index in the stops of the entry, when the best order is computed.
+    waypoint_order: tuple[int, ...] | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class ReachableRangeData:
+    """Reachable range information."""
+
+    center: LatLon
+    polygon: ReachablePolygon
+
+
+@dataclass(frozen=True, slots=True)
+class BestOrder:
+    """Best order of the stops of a route, with the delay when it was computed to notice when traffic changed."""
+
+    key: tuple[Hashable, ...]
+    order: tuple[int, ...]
+    delay: float
+
+
+@dataclass(frozen=True, slots=True)
+class RouteEstimate:
+    """Route of a routing backend, the duration is without traffic and the delay is None when the backend doesn't know the traffic."""
+
+    duration: float
+    distance: float
+    delay: float | None
+    points: tuple[tuple[float, float], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class RouteGeometry:
+    """Points of the current route as encoded polyline, the ETag changes when the points change."""
+
+    polyline: str
+    etag: str
+    points: int
+
+
+@dataclass(frozen=True, slots=True)
+class CachedRoute:
+    """Route of the origin cache, only the travel time data and the encoded geometry of the TomTom route are kept."""
+
+    data: TomTomTravelTimeData
+    geometry: RouteGeometry
+
+
+@dataclass(frozen=True, slots=True)
 class UserInputLatLan:
     """Dataclass to handle user input for LatLon."""
 
     location: LatLon
     geocoded: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class UpcomingEvent:
+    """Calendar event with a location that a route can be planned to."""
+
+    summary: str
+    start: datetime
+    location: str
+
+
+@dataclass(slots=True)
+class ApiKeyUsage:
+    """Usage of an API key for the current (UTC) day."""
+
+    day: date
+    requests: int = 0
+    failures: int = 0
+    cooldown_until: datetime | None = None
+
+
+@dataclass(slots=True)
+class ImportRow:
+    """Route to import, with the outcome of the import."""
+
+    row: int
+    name: str
+    locations: list[str]
+    error: str | None = None
+    detail: str | None = None
+    entry_id: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class SearchCandidate:
+    """Location found by the location search, that the user can pick."""
+
+    label: str
+    location: LatLon
@@ -0,0 +1,121 @@
+"""TomTom Travel Time calendar prefetch."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, cast
+
+from homeassistant.const import ATTR_ENTITY_ID, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from custom_components.tomtom_travel_time.const import (
+    DEFAULT_SCAN_INTERVAL,
+    PREFETCH_IDLE_INTERVAL,
+    PREFETCH_LOOKAHEAD,
+    PREFETCH_MIN_INTERVAL,
+    PREFETCH_WINDOW,
+    SERVICE_GET_EVENTS,
+)
+from custom_components.tomtom_travel_time.helpers import lat_lon_from_user_input
+from custom_components.tomtom_travel_time.model import TomTomTravelTimeData, UpcomingEvent
+from tomtom_apis import TomTomAPIError
+from tomtom_apis.models import LatLon
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CalendarPrefetch:
+    """Plan route refreshes around the departure time of the next calendar event.
+
+    Outside the prefetch window no routes are requested, inside the window the refresh rate increases as the departure gets closer.
+    """
+
+    def __init__(self, hass: HomeAssistant, entity_id: str, api_key: str) -> None:
+        """Initialize the calendar prefetch."""
+        self.hass = hass
+        self.entity_id = entity_id
+        self._api_key = api_key
+        self._available = False
+        self._destinations: dict[str, LatLon | None] = {}
+        self.event: UpcomingEvent | None = None
+
+    async def async_update(self, now: datetime) -> None:
+        """Fetch the next event with a location from the calendar."""
+        try:
+            response = await self.hass.services.async_call(
+                Platform.CALENDAR,
+                SERVICE_GET_EVENTS,
+                {ATTR_ENTITY_ID: self.entity_id, "duration": timedelta(seconds=PREFETCH_LOOKAHEAD)},
+                blocking=True,
+                return_response=True,
+            )
+        except HomeAssistantError:
+            _LOGGER.warning("Cannot get events from %s, falling back to regular updates", self.entity_id)
+            self._available = False
+            self.event = None
+            return
+
+        self._available = True
+        upcoming: list[UpcomingEvent] = []
+        calendar = cast(dict[str, Any], (response or {}).get(self.entity_id) or {})
+        for event in calendar.get("events", []):
+            # All-day events only have a date (parsed without timezone), there is no departure time to plan for.
+            start = dt_util.parse_datetime(str(event.get("start")))
+            location = event.get("location")
+            if start is None or start.tzinfo is None or not location or start <= now:
+                continue
+            upcoming.append(UpcomingEvent(summary=str(event.get("summary", "")), start=start, location=str(location)))
+
+        self.event = min(upcoming, key=lambda event: event.start, default=None)
+        _LOGGER.debug("Next event from %s: %s", self.entity_id, self.event)
+
+    async def async_destination(self) -> LatLon | None:
+        """Return the location of the next event, resolved once per distinct location."""
+        if self.event is None:
+            return None
+
+        location = self.event.location
+        if location not in self._destinations:
+            try:
+                lat_lon = await lat_lon_from_user_input(self.hass, self._api_key, location)
+            except TomTomAPIError:
+                _LOGGER.warning("Cannot resolve event location: %s", location)
+                return None
+            self._destinations[location] = lat_lon.location if lat_lon else None
+
+        return self._destinations[location]
+
+    def departure(self, data: TomTomTravelTimeData | None) -> datetime | None:
+        """Return the estimated departure time for the next event."""
+        if self.event is None:
+            return None
+
+        return self.event.start - timedelta(minutes=data.duration if data else 0)
+
+    def should_refresh(self, now: datetime, data: TomTomTravelTimeData | None) -> bool:
+        """Return whether a route should be requested now."""
+        if data is None or not self._available:
+            return True
+
+        departure = self.departure(data)
+        return departure is not None and departure - now <= timedelta(seconds=PREFETCH_WINDOW)
+
+    def next_interval(self, now: datetime, data: TomTomTravelTimeData | None) -> timedelta:
+        """Return the time until the next refresh."""
+        if not self._available:
+            return timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+        departure = self.departure(data)
+        if departure is None:
+            return timedelta(seconds=PREFETCH_IDLE_INTERVAL)
+
+        until_departure = departure - now
+        window = timedelta(seconds=PREFETCH_WINDOW)
+        if until_departure > window:
+            # Idle until the window opens, but check the calendar regularly for new events.
+            return min(until_departure - window, timedelta(seconds=PREFETCH_IDLE_INTERVAL))
+
+        return min(max(until_departure / 4, timedelta(seconds=PREFETCH_MIN_INTERVAL)), timedelta(seconds=DEFAULT_SCAN_INTERVAL))
@@ -0,0 +1,121 @@
+"""TomTom Travel Time refresh profiler."""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import pstats
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from custom_components.tomtom_travel_time.const import DOMAIN, PROFILE_TIMEOUT, PROFILE_TOP_FUNCTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PROFILER: HassKey[RefreshProfiler] = HassKey(f"{DOMAIN}_profiler")
+DATA_PROFILE_SUMMARY: HassKey[dict[str, Any]] = HassKey(f"{DOMAIN}_profile_summary")
+
+
+def _function_name(function: tuple[str, int, str]) -> str:
+    """Return a short name for a function in the stats, like 'coordinator.py:96(_async_update_data)'."""
+    filename, line, name = function
+    return f"{Path(filename).name}:{line}({name})"
+
+
+def _write_profile(profile: cProfile.Profile, path: str) -> list[dict[str, Any]]:
+    """Write the profile to the file, and return the functions with the highest cumulative time."""
+    profile.dump_stats(path)
+    stats: dict[tuple[str, int, str], tuple[int, int, float, float, Any]] = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+    top = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP_FUNCTIONS]
+
+    return [
+        {
+            "function": _function_name(function),
+            "calls": calls,
+            "own_time": round(own_time, 6),
+            "cumulative_time": round(cumulative_time, 6),
+        }
+        for function, (_, calls, own_time, cumulative_time, _) in top
+    ]
+
+
+class RefreshProfiler:
+    """Profiles the event loop with cProfile until a number of coordinator refreshes is done.
+
+    The profiler only exists while profiling, so coordinators only pay a lookup per refresh when it's disabled. Profiling stops after the
+    listeners of the last refresh have been called, or when it takes longer than the timeout.
+    """
+
+    def __init__(self, hass: HomeAssistant, refreshes: int) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.refreshes = refreshes
+        self.remaining = refreshes
+        self.started = dt_util.utcnow()
+        self._profile = cProfile.Profile()
+        self._cancel_timeout: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start profiling, raises ValueError when another profiler is active."""
+        self._profile.enable()
+        self.started = dt_util.utcnow()
+        self.hass.data[DATA_PROFILER] = self
+        self._cancel_timeout = async_call_later(self.hass, PROFILE_TIMEOUT, self._async_timeout)
+        _LOGGER.info("Profiling the next %s refreshes", self.refreshes)
+
+    @callback
+    def async_refreshed(self) -> None:
+        """Count a refresh, and stop once the listeners of the last refresh are called."""
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.hass.loop.call_soon(self._async_stop)
+
+    @callback
+    def _async_timeout(self, _: datetime) -> None:
+        """Stop profiling when the refreshes take too long."""
+        _LOGGER.warning(
+            "Profiling stopped after %s seconds, %s of %s refreshes were done", PROFILE_TIMEOUT, self.refreshes - self.remaining, self.refreshes
+        )
+        self._cancel_timeout = None
+        self._async_stop()
+
+    @callback
+    def _async_stop(self) -> None:
+        """Stop profiling and write the results in the background."""
+        if self.hass.data.get(DATA_PROFILER) is not self:
+            return
+
+        self._profile.disable()
+        self.hass.data.pop(DATA_PROFILER, None)
+        if self._cancel_timeout is not None:
+            self._cancel_timeout()
+            self._cancel_timeout = None
+        self.hass.async_create_task(self._async_write(), eager_start=False)
+
+    async def _async_write(self) -> None:
+        """Write the profile file, and keep the summary for the diagnostics."""
+        path = self.hass.config.path(f"{DOMAIN}_profile_{self.started:%Y%m%d_%H%M%S}.prof")
+        functions = await self.hass.async_add_executor_job(_write_profile, self._profile, path)
+
+        self.hass.data[DATA_PROFILE_SUMMARY] = {
+            "file": path,
+            "started": self.started.isoformat(),
+            "duration": round((dt_util.utcnow() - self.started).total_seconds(), 3),
+            "refreshes": self.refreshes - self.remaining,
+            "functions": functions,
+        }
+        _LOGGER.info("Profile of %s refreshes written to %s", self.refreshes - self.remaining, path)
+
+
+@callback
+def async_refresh_done(hass: HomeAssistant) -> None:
+    """Count a coordinator refresh for the profiler, when profiling."""
+    if (profiler := hass.data.get(DATA_PROFILER)) is not None:
+        profiler.async_refreshed()
@@ -0,0 +1,164 @@
+"""TomTom Travel Time record and replay of TomTom responses, for development and performance tests without network or API key."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, cast
+
+from aiohttp import ClientResponse, ClientResponseError, ClientSession, RequestInfo
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.hass_dict import HassKey
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from custom_components.tomtom_travel_time.const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_TOMTOM_SESSION: HassKey[ClientSession] = HassKey(f"{DOMAIN}_tomtom_session")
+
+# Archive to record to or replay from, relative to the configuration directory, and the latency of replayed responses in seconds or
+# "recorded" for the latency of the recording.
+ENV_RECORD = "TOMTOM_RECORD"
+ENV_REPLAY = "TOMTOM_REPLAY"
+ENV_REPLAY_LATENCY = "TOMTOM_REPLAY_LATENCY"
+REPLAY_LATENCY_RECORDED = "recorded"
+
+# Parameters that aren't part of the request key, the API key isn't recorded and times change on every request.
+IGNORED_PARAMS = frozenset({"key", "departAt", "arriveAt"})
+
+
+def request_key(method: str, url: str | URL, params: dict[str, Any] | None, data: Any) -> str:  # noqa: ANN401
+    """Return the key of a request, the method, path, sorted parameters and body, without the API key and times."""
+    query = "&".join(f"{name}={value}" for name, value in sorted((params or {}).items()) if name not in IGNORED_PARAMS)
+    key = f"{method.upper()} {URL(url).path}?{query}"
+    return f"{key} {json.dumps(data, sort_keys=True)}" if data is not None else key
+
+
+def load_archive(path: Path) -> dict[str, list[dict[str, Any]]]:
+    """Return the recorded responses per request key, in the order they were recorded."""
+    records: dict[str, list[dict[str, Any]]] = {}
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            records.setdefault(record["request"], []).append(record)
+    return records
+
+
+def append_archive(path: Path, record: dict[str, Any]) -> None:
+    """Append a response to the archive, every append adds a gzip member so earlier records are never rewritten."""
+    with gzip.open(path, "at", encoding="utf-8") as file:
+        file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+class RecordingSession:  # pylint: disable=too-few-public-methods
+    """Session that records the responses of a real session to an archive."""
+
+    def __init__(self, hass: HomeAssistant, session: ClientSession, path: Path) -> None:
+        """Initialize with the session that makes the requests."""
+        self.hass = hass
+        self._session = session
+        self._path = path
+
+    async def request(self, method: str, url: str | URL, **kwargs: Any) -> ClientResponse:  # noqa: ANN401
+        """Make the request and record its response, the body is read here and kept by the response for the client."""
+        start = time.perf_counter()
+        response = await self._session.request(method, url, **kwargs)
+        body = await response.text()
+        record = {
+            "request": request_key(method, url, kwargs.get("params"), kwargs.get("json")),
+            "status": response.status,
+            "content_type": response.content_type,
+            "seconds": round(time.perf_counter() - start, 3),
+            "body": body,
+        }
+        await self.hass.async_add_executor_job(append_archive, self._path, record)
+        return response
+
+
+class ReplayResponse:
+    """Recorded response, with the part of the aiohttp response that the TomTom clients use."""
+
+    def __init__(self, method: str, url: URL, record: dict[str, Any]) -> None:
+        """Initialize with the record of the response."""
+        self.method = method
+        self.url = url
+        self.status: int = record["status"]
+        self.headers = CIMultiDictProxy(CIMultiDict({"Content-Type": record["content_type"]}))
+        self._body: str = record["body"]
+
+    def raise_for_status(self) -> None:
+        """Raise like aiohttp does for error statuses."""
+        if self.status >= HTTPStatus.BAD_REQUEST:
+            request_info = RequestInfo(self.url, self.method, CIMultiDictProxy(CIMultiDict()), self.url)
+            raise ClientResponseError(request_info, (), status=self.status, message=HTTPStatus(self.status).phrase)
+
+    async def text(self) -> str:
+        """Return the body."""
+        return self._body
+
+    async def read(self) -> bytes:
+        """Return the body as bytes."""
+        return self._body.encode()
+
+
+class ReplaySession:  # pylint: disable=too-few-public-methods
+    """Session that answers requests from an archive without network, recorded responses of a request are served in turn.
+
+    A request that wasn't recorded gets a 404 response, like an unknown location would.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: Path, latency: str | None = None) -> None:
+        """Initialize with the archive, which is loaded on the first request."""
+        self.hass = hass
+        self._path = path
+        self._latency = latency
+        self._records: dict[str, list[dict[str, Any]]] | None = None
+        self._served: dict[str, int] = {}
+
+    async def request(self, method: str, url: str | URL, **kwargs: Any) -> ReplayResponse:  # noqa: ANN401
+        """Return the next recorded response of the request."""
+        if self._records is None:
+            self._records = await self.hass.async_add_executor_job(load_archive, self._path)
+
+        key = request_key(method, url, kwargs.get("params"), kwargs.get("json"))
+        if not (records := self._records.get(key)):
+            _LOGGER.warning("No recorded response for %s", key)
+            return ReplayResponse(method, URL(url), {"status": HTTPStatus.NOT_FOUND, "content_type": "application/json", "body": "{}"})
+
+        served = self._served.get(key, 0)
+        self._served[key] = served + 1
+        record = records[served % len(records)]
+
+        if self._latency == REPLAY_LATENCY_RECORDED:
+            await asyncio.sleep(record["seconds"])
+        elif self._latency:
+            await asyncio.sleep(float(self._latency))
+        return ReplayResponse(method, URL(url), record)
+
+
+@callback
+def async_get_tomtom_session(hass: HomeAssistant) -> ClientSession:
+    """Return the session for the TomTom clients, which records or replays responses when the environment asks for it."""
+    if (session := hass.data.get(DATA_TOMTOM_SESSION)) is not None:
+        return session
+
+    session = async_get_clientsession(hass)
+    if replay := os.environ.get(ENV_REPLAY):
+        _LOGGER.warning("Replaying TomTom responses from %s, no requests are sent to TomTom", replay)
+        # The fake sessions only implement the request method that the TomTom clients use.
+        session = cast("ClientSession", ReplaySession(hass, Path(hass.config.path(replay)), os.environ.get(ENV_REPLAY_LATENCY)))
+    elif record := os.environ.get(ENV_RECORD):
+        _LOGGER.warning("Recording TomTom responses to %s", record)
+        session = cast("ClientSession", RecordingSession(hass, session, Path(hass.config.path(record))))
+
+    hass.data[DATA_TOMTOM_SESSION] = session
+    return session
@@ -0,0 +1,103 @@
+"""TomTom Travel Time location search."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util.hass_dict import HassKey
+
+from custom_components.tomtom_travel_time.cache import TTLCache, async_get_cache
+from custom_components.tomtom_travel_time.const import DOMAIN, SEARCH_CACHE_MAX_SIZE, SEARCH_CACHE_TTL, SEARCH_LIMIT, SEARCH_MIN_LENGTH
+from custom_components.tomtom_travel_time.helpers import normalize_location
+from custom_components.tomtom_travel_time.keypool import async_call_with_key
+from custom_components.tomtom_travel_time.model import SearchCandidate
+from custom_components.tomtom_travel_time.replay import async_get_tomtom_session
+from tomtom_apis import ApiOptions
+
+if TYPE_CHECKING:
+    from tomtom_apis.places.models import Result
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SEARCH_CACHE: HassKey[TTLCache[str, tuple[SearchCandidate, ...]]] = HassKey(f"{DOMAIN}_search_cache")
+
+
+def search_terms(value: str) -> list[str]:
+    """Return the normalized words of a query or label, commas are ignored."""
+    return normalize_location(value.replace(",", " ")).split()
+
+
+def candidate_matches(candidate: SearchCandidate, terms: list[str]) -> bool:
+    """Return whether every term is the start of a word of the label, the last term is usually still being typed."""
+    words = search_terms(candidate.label)
+    return all(any(word.startswith(term) for word in words) for term in terms)
+
+
+def candidate_from_result(result: Result) -> SearchCandidate:
+    """Return the candidate of a search result, points of interest are labeled with their name."""
+    label = result.address.freeformAddress or result.position.to_comma_separated()
+    if result.poi is not None:
+        label = f"{result.poi.name}, {label}"
+
+    return SearchCandidate(label=label, location=result.position)
+
+
+def cached_candidates(cache: TTLCache[str, tuple[SearchCandidate, ...]], query: str) -> tuple[SearchCandidate, ...] | None:
+    """Return the cached candidates of the query, or of a shorter query that the query extends.
+
+    The candidates of a shorter query can only be reused when TomTom returned fewer than the limit, so the list wasn't cut off.
+    """
+    if (candidates := cache.get(query)) is not None:
+        return candidates
+
+    terms = search_terms(query)
+    for length in range(len(query) - 1, SEARCH_MIN_LENGTH - 1, -1):
+        prefix = cache.get(query[:length])
+        if prefix is None or len(prefix) >= SEARCH_LIMIT:
+            continue
+
+        if candidates := tuple(candidate for candidate in prefix if candidate_matches(candidate, terms)):
+            return candidates
+
+    return None
+
+
+async def async_search_locations(hass: HomeAssistant, api_key: str, query: str) -> tuple[SearchCandidate, ...]:
+    """Search locations that match the query, biased towards the home location, and cache them by query."""
+    query = normalize_location(query)
+    if len(query) < SEARCH_MIN_LENGTH:
+        return ()
+
+    cache = async_get_cache(hass, DATA_SEARCH_CACHE, SEARCH_CACHE_TTL, SEARCH_CACHE_MAX_SIZE)
+    if (candidates := cached_candidates(cache, query)) is not None:
+        _LOGGER.debug("Using cached search results for %s", query)
+        cache.set(query, candidates)
+        return candidates
+
+    # The Places API is only needed while searching in the config flow, so it isn't imported when the integration is loaded.
+    from tomtom_apis.places import SearchApi  # noqa: PLC0415 # pylint: disable=import-outside-toplevel
+    from tomtom_apis.places.models import SearchParams  # noqa: PLC0415 # pylint: disable=import-outside-toplevel
+
+    async with SearchApi(ApiOptions(api_key=api_key), async_get_tomtom_session(hass)) as search_api:
+        response = await async_call_with_key(
+            hass,
+            api_key,
+            "search",
+            lambda key: search_api.get_search(
+                query=query,
+                params=SearchParams(
+                    key=key,
+                    typeahead=True,
+                    limit=SEARCH_LIMIT,
+                    lat=hass.config.latitude,
+                    lon=hass.config.longitude,
+                ),
+            ),
+        )
+
+    candidates = tuple(candidate_from_result(result) for result in response.results)
+    cache.set(query, candidates)
+
+    return candidates
@@ -3,22 +3,25 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from typing import Any
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorEntityDescription, SensorStateClass, StateType
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME, UnitOfLength, UnitOfTime
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ATTRIBUTION, DEFAULT_NAME, DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import ATTRIBUTION, CONF_BEST_ORDER, CONF_FORECAST, DEFAULT_NAME, DEFAULT_SCAN_INTERVAL, FORECAST_HORIZONS
 from .coordinator import TomTomDataUpdateCoordinator
+from .forecast import async_get_forecast_store
+from .helpers import entry_device_info
 
 SCAN_INTERVAL = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
 
 
-SENSOR_DESCRIPTIONS: list[SensorEntityDescription] = [
+SENSOR_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
     SensorEntityDescription(
         translation_key="duration",
         icon="mdi:car-clock",
@@ -41,28 +44,51 @@ SENSOR_DESCRIPTIONS: list[SensorEntityDescription] = [
         device_class=SensorDeviceClass.DISTANCE,
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
     ),
-]
+)
+
+FORECAST_DESCRIPTION = SensorEntityDescription(
+    translation_key="duration_forecast",
+    icon="mdi:clock-fast",
+    key="duration_forecast",
+    state_class=SensorStateClass.MEASUREMENT,
+    native_unit_of_measurement=UnitOfTime.MINUTES,
+)
+
+WAYPOINT_ORDER_DESCRIPTION = SensorEntityDescription(
+    translation_key="waypoint_order",
+    icon="mdi:map-marker-path",
+    key="waypoint_order",
+)
 
 
 async def async_setup_entry(
-    _: HomeAssistant,
+    hass: HomeAssistant,
     config_entry: ConfigEntry[TomTomDataUpdateCoordinator],
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up a TomTom travel time sensor entry."""
     name = config_entry.data.get(CONF_NAME, DEFAULT_NAME)
     coordinator = config_entry.runtime_data
+    # The sensors of an entry share one device info, the descriptions are shared by all entries.
+    device_info = entry_device_info(config_entry.entry_id, name)
 
     sensors: list[TomTomSensor] = [
         TomTomSensor(
             config_entry,
-            name,
+            device_info,
             sensor_description,
             coordinator,
         )
         for sensor_description in SENSOR_DESCRIPTIONS
     ]
 
+    if config_entry.options.get(CONF_FORECAST):
+        await coordinator.async_load_forecast(async_get_forecast_store(hass, config_entry.entry_id))
+        sensors.extend(TomTomForecastSensor(config_entry, device_info, horizon, coordinator) for horizon in FORECAST_HORIZONS)
+
+    if config_entry.options.get(CONF_BEST_ORDER):
+        sensors.append(TomTomWaypointOrderSensor(config_entry, device_info, WAYPOINT_ORDER_DESCRIPTION, coordinator))
+
     async_add_entities(sensors)
 
 
@@ -75,7 +101,7 @@ class TomTomSensor(CoordinatorEntity[TomTomDataUpdateCoordinator], SensorEntity)
     def __init__(
         self,
         config_entry: ConfigEntry,
-        name: str,
+        device_info: DeviceInfo,
         sensor_description: SensorEntityDescription,
         coordinator: TomTomDataUpdateCoordinator,
     ) -> None:
@@ -83,16 +109,54 @@ class TomTomSensor(CoordinatorEntity[TomTomDataUpdateCoordinator], SensorEntity)
         super().__init__(coordinator)
         self.entity_description = sensor_description
         self._attr_unique_id = f"{config_entry.entry_id}_{sensor_description.key}"
-        self._config_entry = config_entry
-        self._attr_device_info = DeviceInfo(
-            entry_type=DeviceEntryType.SERVICE,
-            identifiers={(DOMAIN, config_entry.entry_id)},
-            name=name,
-            configuration_url="https://developer.tomtom.com/user/login",
-            manufacturer="TomTom",
-        )
+        self._attr_device_info = device_info
 
     @property
     def native_value(self) -> StateType:
         """Return the value reported by the sensor."""
         return getattr(self.coordinator.data, self.entity_description.key, None)
+
+
+class TomTomForecastSensor(TomTomSensor):
+    """Forecast of the travel time of a route after a number of minutes, made by the coordinator without extra requests."""
+
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        device_info: DeviceInfo,
+        horizon: int,
+        coordinator: TomTomDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the TomTom travel time forecast sensor."""
+        super().__init__(config_entry, device_info, FORECAST_DESCRIPTION, coordinator)
+        self._horizon = horizon
+        self._attr_unique_id = f"{config_entry.entry_id}_duration_forecast_{horizon}"
+        self._attr_translation_placeholders = {"minutes": str(horizon)}
+
+    async def async_added_to_hass(self) -> None:
+        """Start forecasting, until the sensor is removed."""
+        self.async_on_remove(self.coordinator.async_enable_forecast(self._attr_unique_id))  # type: ignore[arg-type]
+        await super().async_added_to_hass()
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the forecast duration."""
+        forecast = self.coordinator.forecast
+        return forecast.forecasts.get(self._horizon) if forecast is not None else None
+
+
+class TomTomWaypointOrderSensor(TomTomSensor):
+    """Best order of the stops of a route, numbered by their position between origin and destination in the entry."""
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the numbers of the stops in their best order."""
+        order = getattr(self.coordinator.data, "waypoint_order", None)
+        return ", ".join(str(index + 1) for index in order) if order is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the stops in their best order."""
+        order = getattr(self.coordinator.data, "waypoint_order", None)
+        stops = self.coordinator.locations[1:-1]
+        return {"stops": [stops[index] for index in order]} if order is not None else None
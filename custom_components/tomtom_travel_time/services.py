@@ -0,0 +1,238 @@
+"""TomTom Travel Time services."""
+
+from __future__ import annotations
+
+import csv
+import logging
+from collections.abc import Hashable
+from dataclasses import asdict
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import CONF_API_KEY, CONF_NAME
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util.hass_dict import HassKey
+
+from custom_components.tomtom_travel_time.cache import TTLCache, async_get_cache, route_cache_key
+from custom_components.tomtom_travel_time.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_FILE,
+    ATTR_REFRESHES,
+    ATTR_ROUTES,
+    AVOID_TYPES,
+    CONF_AVOID_TYPE,
+    CONF_ENTRY_TYPE,
+    CONF_LOCATIONS,
+    CONF_ROUTE_TYPE,
+    CONF_VEHICLE_TYPE,
+    DEFAULT_NAME,
+    DEFAULT_PROFILE_REFRESHES,
+    DOMAIN,
+    ENTRY_TYPE_ROUTE,
+    ROUTE_CACHE_MAX_SIZE,
+    ROUTE_CACHE_TTL,
+    ROUTE_TYPES,
+    SERVICE_CALCULATE_ROUTE,
+    SERVICE_IMPORT_ROUTES,
+    SERVICE_PROFILE,
+    VEHICLE_TYPES,
+)
+from custom_components.tomtom_travel_time.coordinator import TomTomDataUpdateCoordinator
+from custom_components.tomtom_travel_time.helpers import allowed_config_path, lat_lon_from_user_input
+from custom_components.tomtom_travel_time.importer import async_import_routes, load_routes_file
+from custom_components.tomtom_travel_time.model import ImportRow, TomTomTravelTimeData, UserInputLatLan
+from custom_components.tomtom_travel_time.profiler import DATA_PROFILER, RefreshProfiler
+from tomtom_apis import TomTomAPIError
+from tomtom_apis.models import LatLon
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_ROUTE_CACHE: HassKey[TTLCache[Hashable, TomTomTravelTimeData]] = HassKey(f"{DOMAIN}_route_cache")
+
+SERVICE_CALCULATE_ROUTE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(CONF_LOCATIONS): vol.All(cv.ensure_list, [cv.string], vol.Length(min=2)),
+        vol.Optional(CONF_VEHICLE_TYPE): vol.In(VEHICLE_TYPES),
+        vol.Optional(CONF_ROUTE_TYPE): vol.In(ROUTE_TYPES),
+        vol.Optional(CONF_AVOID_TYPE): vol.All(cv.ensure_list, [vol.In(AVOID_TYPES)]),
+    },
+)
+
+ROUTES_SCHEMA = vol.Schema(
+    [
+        {
+            vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
+            vol.Required(CONF_LOCATIONS): vol.All(cv.ensure_list, [cv.string]),
+        },
+    ],
+)
+
+SERVICE_IMPORT_ROUTES_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Exclusive(ATTR_ROUTES, "source"): ROUTES_SCHEMA,
+            vol.Exclusive(ATTR_FILE, "source"): cv.string,
+        },
+    ),
+    cv.has_at_least_one_key(ATTR_ROUTES, ATTR_FILE),
+)
+
+SERVICE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_REFRESHES, default=DEFAULT_PROFILE_REFRESHES): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+    },
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up the services for the TomTom Travel Time integration."""
+    async_get_cache(hass, DATA_ROUTE_CACHE, ROUTE_CACHE_TTL, ROUTE_CACHE_MAX_SIZE)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CALCULATE_ROUTE,
+        _async_calculate_route,
+        schema=SERVICE_CALCULATE_ROUTE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_ROUTES,
+        _async_import_routes,
+        schema=SERVICE_IMPORT_ROUTES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=SERVICE_PROFILE_SCHEMA,
+    )
+
+
+def _get_loaded_config_entry(hass: HomeAssistant, entry_id: str) -> ConfigEntry[TomTomDataUpdateCoordinator]:
+    """Return the loaded config entry for the given id."""
+    config_entry: ConfigEntry[TomTomDataUpdateCoordinator] | None = hass.config_entries.async_get_entry(entry_id)
+
+    if config_entry is None or config_entry.domain != DOMAIN or config_entry.data.get(CONF_ENTRY_TYPE, ENTRY_TYPE_ROUTE) != ENTRY_TYPE_ROUTE:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_config_entry",
+            translation_placeholders={"config_entry_id": entry_id},
+        )
+    if config_entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="config_entry_not_loaded",
+            translation_placeholders={"name": config_entry.title},
+        )
+
+    return config_entry
+
+
+async def _async_calculate_route(call: ServiceCall) -> ServiceResponse:
+    """Calculate an ad-hoc route with the client of an existing config entry."""
+    config_entry = _get_loaded_config_entry(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    api_key = config_entry.data[CONF_API_KEY]
+    options = {
+        **config_entry.options,
+        **{key: call.data[key] for key in (CONF_VEHICLE_TYPE, CONF_ROUTE_TYPE, CONF_AVOID_TYPE) if key in call.data},
+    }
+
+    locations: list[LatLon] = []
+    for index, location in enumerate(call.data[CONF_LOCATIONS]):
+        try:
+            lat_lon = await lat_lon_from_user_input(call.hass, api_key, location)
+        except TomTomAPIError as exception:
+            raise HomeAssistantError(translation_domain=DOMAIN, translation_key="cannot_calculate_route") from exception
+
+        if not isinstance(lat_lon, UserInputLatLan):
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="cannot_determine_location",
+                translation_placeholders={"num": str(index + 1)},
+            )
+        locations.append(lat_lon.location)
+
+    cache = call.hass.data[DATA_ROUTE_CACHE]
+    cache_key = route_cache_key(locations, options)
+
+    if (data := cache.get(cache_key)) is None:
+        try:
+            data = await config_entry.runtime_data.async_calculate_route(locations, options)
+        except TomTomAPIError as exception:
+            raise HomeAssistantError(translation_domain=DOMAIN, translation_key="cannot_calculate_route") from exception
+        cache.set(cache_key, data)
+    else:
+        _LOGGER.debug("Using cached route for %s", cache_key)
+
+    # The stops of a route aren't ordered by the service, so the response only has the travel time.
+    return {
+        "duration": data.duration,
+        "distance": data.distance,
+        "delay": data.delay,
+        CONF_LOCATIONS: [location.to_comma_separated() for location in locations],
+    }
+
+
+def _load_routes_file(hass: HomeAssistant, file: str) -> list[dict[str, Any]]:
+    """Load and validate the routes of a file in the config directory, or in an allowed directory."""
+    if (path := allowed_config_path(hass, file)) is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="import_file_not_allowed",
+            translation_placeholders={"file": file},
+        )
+
+    try:
+        return ROUTES_SCHEMA(load_routes_file(path))  # type: ignore[no-any-return]
+    except (OSError, csv.Error, HomeAssistantError, vol.Invalid) as exception:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_import_file",
+            translation_placeholders={"file": file, "error": str(exception)},
+        ) from exception
+
+
+async def _async_import_routes(call: ServiceCall) -> ServiceResponse:
+    """Import routes as config entries in bulk, with the API key of an existing config entry."""
+    config_entry = _get_loaded_config_entry(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    routes: list[dict[str, Any]] | None = call.data.get(ATTR_ROUTES)
+    if routes is None:
+        routes = await call.hass.async_add_executor_job(_load_routes_file, call.hass, call.data[ATTR_FILE])
+
+    rows = [ImportRow(row=index, name=route[CONF_NAME], locations=route[CONF_LOCATIONS]) for index, route in enumerate(routes, start=1)]
+
+    try:
+        await async_import_routes(call.hass, config_entry.data[CONF_API_KEY], rows)
+    except TomTomAPIError as exception:
+        raise HomeAssistantError(translation_domain=DOMAIN, translation_key="cannot_validate_routes") from exception
+
+    _LOGGER.info("Imported %s of %s routes", sum(row.entry_id is not None for row in rows), len(rows))
+
+    return {
+        "created": sum(row.entry_id is not None for row in rows),
+        "failed": sum(row.error is not None for row in rows),
+        ATTR_ROUTES: [asdict(row) for row in rows],
+    }
+
+
+@callback
+def _async_profile(call: ServiceCall) -> None:
+    """Profile the next refreshes of all entries, the results are written in the background."""
+    if DATA_PROFILER in call.hass.data:
+        raise ServiceValidationError(translation_domain=DOMAIN, translation_key="profile_running")
+
+    try:
+        RefreshProfiler(call.hass, call.data[ATTR_REFRESHES]).async_start()
+    except ValueError as exception:
+        # Only one profiler can be active at a time, for example the profiler integration might be running.
+        raise HomeAssistantError(translation_domain=DOMAIN, translation_key="cannot_start_profiler") from exception
@@ -0,0 +1,94 @@
+"""TomTom Travel Time shared coordinators."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.util.hass_dict import HassKey
+
+from custom_components.tomtom_travel_time.cache import entry_route_key
+from custom_components.tomtom_travel_time.const import CONF_LOCATIONS, CONF_ROUTE_GEOMETRY, DOMAIN
+from custom_components.tomtom_travel_time.coordinator import TomTomDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SHARED_COORDINATORS: HassKey[dict[Hashable, SharedCoordinator]] = HassKey(f"{DOMAIN}_shared_coordinators")
+
+
+@dataclass
+class SharedCoordinator:
+    """Coordinator with the IDs of the entries that use it."""
+
+    coordinator: TomTomDataUpdateCoordinator
+    first_refresh: asyncio.Task[bool]
+    entry_ids: set[str] = field(default_factory=set)
+
+
+async def _async_first_refresh(coordinator: TomTomDataUpdateCoordinator) -> bool:
+    """Refresh the coordinator for the first time, return whether it succeeded."""
+    await coordinator.async_refresh()
+    return coordinator.last_update_success
+
+
+def _update_keep_geometry(hass: HomeAssistant, shared: SharedCoordinator) -> None:
+    """Keep the route geometry while at least one of the entries that use the coordinator serves it."""
+    shared.coordinator.keep_geometry = any(
+        (entry := hass.config_entries.async_get_entry(entry_id)) is not None and entry.options.get(CONF_ROUTE_GEOMETRY, False)
+        for entry_id in shared.entry_ids
+    )
+
+
+async def async_acquire_coordinator(hass: HomeAssistant, config_entry: ConfigEntry) -> TomTomDataUpdateCoordinator:
+    """Return the coordinator for the route of the entry, shared with other entries that have an identical route."""
+    coordinators = hass.data.setdefault(DATA_SHARED_COORDINATORS, {})
+    key = entry_route_key(config_entry.data, config_entry.options)
+
+    if (shared := coordinators.get(key)) is None:
+        coordinator = TomTomDataUpdateCoordinator(hass, config_entry, config_entry.data[CONF_API_KEY])
+        if config_entry.options.get(CONF_ROUTE_GEOMETRY, False):
+            coordinator.keep_geometry = True
+        # Registered before the first refresh, so entries that are set up at the same time wait for the same refresh.
+        shared = coordinators[key] = SharedCoordinator(coordinator, hass.async_create_task(_async_first_refresh(coordinator)))
+    else:
+        _LOGGER.debug("Entry %s shares the coordinator of entries %s", config_entry.title, shared.entry_ids)
+
+    shared.entry_ids.add(config_entry.entry_id)
+    _update_keep_geometry(hass, shared)
+
+    if not await shared.first_refresh:
+        await async_release_coordinator(hass, config_entry)
+        raise ConfigEntryNotReady from shared.coordinator.last_exception
+
+    return shared.coordinator
+
+
+async def async_release_coordinator(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Release the coordinator of the entry, it's shut down when no entry uses it anymore."""
+    coordinators = hass.data.get(DATA_SHARED_COORDINATORS, {})
+
+    for key, shared in list(coordinators.items()):
+        if config_entry.entry_id not in shared.entry_ids:
+            continue
+
+        shared.entry_ids.discard(config_entry.entry_id)
+        if not shared.entry_ids:
+            del coordinators[key]
+            await shared.coordinator.async_shutdown()
+        else:
+            _update_keep_geometry(hass, shared)
+
+
+def async_find_duplicate_entry(hass: HomeAssistant, data: dict, options: dict) -> ConfigEntry | None:
+    """Return an existing entry with the same route key, if any."""
+    key = entry_route_key(data, options)
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if CONF_LOCATIONS in entry.data and entry_route_key(entry.data, entry.options) == key:
+            return entry
+    return None
@@ -0,0 +1,227 @@
+"""TomTom Travel Time shared result store."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from contextlib import closing
+from pathlib import Path
+from typing import Any, cast
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryError
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.json import json_loads_object
+
+from custom_components.tomtom_travel_time.const import DOMAIN, SHARED_STORE_CLAIM_TTL, SHARED_STORE_MEMORY, SHARED_STORE_WAIT
+from custom_components.tomtom_travel_time.helpers import allowed_config_path
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SHARED_STORES: HassKey[dict[str, SharedStore]] = HassKey(f"{DOMAIN}_shared_stores")
+
+# Errors of a store, like a shared volume that is gone or a database that is locked for too long.
+STORE_ERRORS = (OSError, sqlite3.Error)
+
+# Connections are opened per operation, an operation waits this many seconds for a lock of another instance.
+SQLITE_TIMEOUT = 5
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS claims (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL);
+"""
+
+
+class SharedStore(ABC):
+    """Store for results that are shared with other Home Assistant instances, values are JSON objects that expire after their TTL.
+
+    A claim on a key makes sure only one instance refreshes the key, the others wait for the result it publishes. Timestamps are wall clock
+    time, as the instances don't share a monotonic clock. Stores don't raise on errors of the storage, a value is missing and a claim succeeds
+    instead, so the instance refreshes on its own.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the store with an owner ID for the claims of this instance."""
+        self.owner = uuid.uuid4().hex
+
+    @abstractmethod
+    async def async_get(self, key: str) -> dict[str, Any] | None:
+        """Return the value of the key, or None when it is missing or expired."""
+
+    @abstractmethod
+    async def async_set(self, key: str, value: dict[str, Any], ttl: float) -> None:
+        """Publish the value of the key for ttl seconds."""
+
+    @abstractmethod
+    async def async_claim(self, key: str, ttl: float) -> bool:
+        """Claim the refresh of the key for ttl seconds, return whether the claim succeeded."""
+
+    @abstractmethod
+    async def async_release(self, key: str) -> None:
+        """Release the claim of this instance on the key."""
+
+
+class MemorySharedStore(SharedStore):
+    """Store that is only shared within this instance, the reference for other stores and useful to try a configuration."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        super().__init__()
+        self._results: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._claims: dict[str, tuple[float, str]] = {}
+
+    async def async_get(self, key: str) -> dict[str, Any] | None:
+        """Return the value of the key, or None when it is missing or expired."""
+        expires_at, value = self._results.get(key, (0.0, None))
+        if expires_at <= time.time():
+            self._results.pop(key, None)
+            return None
+        return value
+
+    async def async_set(self, key: str, value: dict[str, Any], ttl: float) -> None:
+        """Publish the value of the key for ttl seconds."""
+        now = time.time()
+        for expired in [item for item, (expires_at, _) in self._results.items() if expires_at <= now]:
+            del self._results[expired]
+        self._results[key] = (now + ttl, value)
+
+    async def async_claim(self, key: str, ttl: float) -> bool:
+        """Claim the refresh of the key for ttl seconds, return whether the claim succeeded."""
+        now = time.time()
+        expires_at, owner = self._claims.get(key, (0.0, self.owner))
+        if expires_at > now and owner != self.owner:
+            return False
+        self._claims[key] = (now + ttl, self.owner)
+        return True
+
+    async def async_release(self, key: str) -> None:
+        """Release the claim of this instance on the key."""
+        if self._claims.get(key, (0.0, None))[1] == self.owner:
+            del self._claims[key]
+
+
+class SQLiteSharedStore(SharedStore):
+    """Store in an SQLite file, for instances that share a volume. Queries run in the executor, with a connection per operation."""
+
+    def __init__(self, hass: HomeAssistant, path: Path) -> None:
+        """Initialize."""
+        super().__init__()
+        self.hass = hass
+        self.path = path
+        self._schema_created = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, and create the tables on first use."""
+        connection = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT, isolation_level=None)
+        if not self._schema_created:
+            connection.executescript(SQLITE_SCHEMA)
+            self._schema_created = True
+        return connection
+
+    def _get(self, key: str) -> str | None:
+        """Return the value of the key as JSON."""
+        with closing(self._connect()) as connection:
+            row = connection.execute("SELECT value FROM results WHERE key = ? AND expires_at > ?", (key, time.time())).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: str, ttl: float) -> None:
+        """Replace the value of the key and remove expired values."""
+        now = time.time()
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("DELETE FROM results WHERE expires_at <= ?", (now,))
+            connection.execute("INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)", (key, value, now + ttl))
+            connection.execute("COMMIT")
+
+    def _claim(self, key: str, ttl: float) -> bool:
+        """Claim the key in one transaction, so two instances can't both claim it."""
+        now = time.time()
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("DELETE FROM claims WHERE key = ? AND (expires_at <= ? OR owner = ?)", (key, now, self.owner))
+            claimed = connection.execute(
+                "INSERT OR IGNORE INTO claims (key, owner, expires_at) VALUES (?, ?, ?)",
+                (key, self.owner, now + ttl),
+            ).rowcount
+            connection.execute("COMMIT")
+        return claimed == 1
+
+    def _release(self, key: str) -> None:
+        """Remove the claim of this instance on the key."""
+        with closing(self._connect()) as connection:
+            connection.execute("DELETE FROM claims WHERE key = ? AND owner = ?", (key, self.owner))
+
+    async def _async_run[T, *Ts](self, default: T, job: Callable[[*Ts], T], *args: *Ts) -> T:
+        """Run a query in the executor, errors are logged and return the default, so a broken shared volume doesn't stop the updates."""
+        try:
+            return await self.hass.async_add_executor_job(job, *args)
+        except STORE_ERRORS as exception:
+            _LOGGER.warning("Cannot use the shared store %s: %s", self.path, exception)
+            return default
+
+    async def async_get(self, key: str) -> dict[str, Any] | None:
+        """Return the value of the key, or None when it is missing or expired."""
+        value = await self._async_run(None, self._get, key)
+        return cast(dict[str, Any], json_loads_object(value)) if value is not None else None
+
+    async def async_set(self, key: str, value: dict[str, Any], ttl: float) -> None:
+        """Publish the value of the key for ttl seconds."""
+        await self._async_run(None, self._set, key, json_dumps(value), ttl)
+
+    async def async_claim(self, key: str, ttl: float) -> bool:
+        """Claim the refresh of the key for ttl seconds, return whether the claim succeeded. Without the store the key is refreshed locally."""
+        return await self._async_run(True, self._claim, key, ttl)  # noqa: FBT003
+
+    async def async_release(self, key: str) -> None:
+        """Release the claim of this instance on the key."""
+        await self._async_run(None, self._release, key)
+
+
+@callback
+def async_get_shared_store(hass: HomeAssistant, location: str) -> SharedStore:
+    """Return the store for the location, a file relative to the config directory or the in-memory store, one store per location."""
+    stores = hass.data.setdefault(DATA_SHARED_STORES, {})
+    if (store := stores.get(location)) is None:
+        if location == SHARED_STORE_MEMORY:
+            store = stores[location] = MemorySharedStore()
+        elif (path := allowed_config_path(hass, location)) is None:
+            raise ConfigEntryError(
+                translation_domain=DOMAIN,
+                translation_key="shared_store_not_allowed",
+                translation_placeholders={"file": location},
+            )
+        else:
+            store = stores[location] = SQLiteSharedStore(hass, path)
+    return store
+
+
+async def async_get_or_refresh(store: SharedStore, key: str, ttl: float, refresh: Callable[[], Awaitable[dict[str, Any]]]) -> dict[str, Any]:
+    """Return the published value of the key, or refresh and publish it when this instance can claim the key.
+
+    When another instance holds the claim, its result is awaited for a while before refreshing anyway.
+    """
+    if (value := await store.async_get(key)) is not None:
+        _LOGGER.debug("Using the shared result of %s", key)
+        return value
+
+    claimed = await store.async_claim(key, SHARED_STORE_CLAIM_TTL)
+    for _ in range(0 if claimed else SHARED_STORE_WAIT):
+        await asyncio.sleep(1)
+        if (value := await store.async_get(key)) is not None:
+            _LOGGER.debug("Using the shared result of %s, refreshed by another instance", key)
+            return value
+
+    try:
+        value = await refresh()
+        await store.async_set(key, value, ttl)
+    finally:
+        if claimed:
+            await store.async_release(key)
+
+    return value
@@ -0,0 +1,39 @@
+"""TomTom Travel Time thresholds."""
+
+from __future__ import annotations
+
+from custom_components.tomtom_travel_time.model import TomTomTravelTimeData
+
+
+class Threshold:  # pylint: disable=too-few-public-methods
+    """Threshold on a value of the travel time data, with hysteresis so a value around the limit doesn't flap.
+
+    The threshold is crossed when the value reaches the limit, and cleared when the value drops below the limit minus the hysteresis.
+    """
+
+    __slots__ = ("hysteresis", "is_on", "key", "limit")
+
+    def __init__(self, key: str, limit: float, hysteresis: float) -> None:
+        """Initialize the threshold for the data attribute with the key."""
+        self.key = key
+        self.limit = limit
+        self.hysteresis = hysteresis
+        self.is_on: bool | None = None
+
+    def update(self, data: TomTomTravelTimeData | None) -> bool:
+        """Evaluate the data, return whether the threshold was crossed or cleared."""
+        value: float | None = getattr(data, self.key, None)
+
+        is_on: bool | None
+        if value is None:
+            is_on = None
+        elif value >= self.limit:
+            is_on = True
+        elif value < self.limit - self.hysteresis:
+            is_on = False
+        else:
+            is_on = bool(self.is_on)
+
+        changed = is_on != self.is_on
+        self.is_on = is_on
+        return changed
@@ -0,0 +1,64 @@
+"""TomTom Travel Time HTTP views."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+
+from aiohttp import hdrs, web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.config_entries import ConfigEntryState
+
+from custom_components.tomtom_travel_time.const import CONF_ROUTE_GEOMETRY, DOMAIN
+from custom_components.tomtom_travel_time.coordinator import TomTomDataUpdateCoordinator
+from custom_components.tomtom_travel_time.geometry import DEFAULT_POLYLINE_PRECISION
+from custom_components.tomtom_travel_time.metrics import async_get_metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RouteGeometryView(HomeAssistantView):
+    """Serves the geometry of the current route of an entry, so it isn't written to the state machine and recorder on every update.
+
+    Clients revalidate with the ETag, which only changes when the route changes, so an unchanged route costs a 304 without a body.
+    """
+
+    url = f"/api/{DOMAIN}/route_geometry/{{entry_id}}"
+    name = f"api:{DOMAIN}:route_geometry"
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return the route geometry as encoded polyline."""
+        hass = request.app[KEY_HASS]
+        config_entry = hass.config_entries.async_get_entry(entry_id)
+
+        if (
+            config_entry is None
+            or config_entry.domain != DOMAIN
+            or config_entry.state is not ConfigEntryState.LOADED
+            or not config_entry.options.get(CONF_ROUTE_GEOMETRY)
+            or not isinstance(config_entry.runtime_data, TomTomDataUpdateCoordinator)
+        ):
+            return self.json_message("Route geometry not found", HTTPStatus.NOT_FOUND)
+
+        if (geometry := config_entry.runtime_data.geometry) is None:
+            return self.json_message("Route geometry not available yet", HTTPStatus.NOT_FOUND)
+
+        headers = {hdrs.ETAG: f'"{geometry.etag}"', hdrs.CACHE_CONTROL: "no-cache"}
+        if any(etag.value == geometry.etag for etag in request.if_none_match or ()):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        return self.json(
+            {"polyline": geometry.polyline, "precision": DEFAULT_POLYLINE_PRECISION, "points": geometry.points},
+            headers=headers,
+        )
+
+
+class MetricsView(HomeAssistantView):
+    """Serves the metrics of all entries in the Prometheus text format, for a scraper with a long-lived access token."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics."""
+        metrics = async_get_metrics(request.app[KEY_HASS])
+        return web.Response(text=metrics.as_prometheus(), headers={hdrs.CONTENT_TYPE: PROMETHEUS_CONTENT_TYPE})
@@ -1,10 +1,21 @@
 """Integration tests."""
 
+from typing import Any
+
 from homeassistant.const import CONF_API_KEY, CONF_NAME
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.tomtom_travel_time.const import CONF_LOCATIONS, DEFAULT_OPTIONS, DOMAIN
+from custom_components.tomtom_travel_time.const import (
+    CONF_CENTER,
+    CONF_ENTRY_TYPE,
+    CONF_LOCATIONS,
+    CONF_TIME_BUDGET,
+    CONF_TRACKERS,
+    DEFAULT_OPTIONS,
+    DOMAIN,
+    ENTRY_TYPE_REACHABLE_RANGE,
+)
 
 
 def get_mock_config_data() -> dict[str, str | list[str]]:
@@ -19,19 +30,43 @@ def get_mock_config_data() -> dict[str, str | list[str]]:
     }
 
 
-def get_mock_config_entry() -> MockConfigEntry:
-    """Create a mock config entry for testing."""
+def get_mock_config_entry(
+    entry_id: str = "test_entry", *, data: dict[str, Any] | None = None, options: dict[str, Any] | None = None
+) -> MockConfigEntry:
+    """Create a mock config entry for testing, the data and options are added to the mock configuration and the default options."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        entry_id=entry_id,
+        data={**get_mock_config_data(), **(data or {})},
+        options={**DEFAULT_OPTIONS, **(options or {})},
+    )
+
+
+def get_mock_reachable_range_config_data() -> dict[str, str | int | list[str]]:
+    """Create a mock reachable range configuration for testing."""
+    return {
+        CONF_NAME: "Office",
+        CONF_API_KEY: "test_api_key",
+        CONF_CENTER: "52.3676, 4.9041",
+        CONF_TIME_BUDGET: 20,
+        CONF_TRACKERS: ["device_tracker.car", "person.alice"],
+        CONF_ENTRY_TYPE: ENTRY_TYPE_REACHABLE_RANGE,
+    }
+
+
+def get_mock_reachable_range_config_entry(entry_id: str = "test_range_entry") -> MockConfigEntry:
+    """Create a mock reachable range config entry for testing."""
     return MockConfigEntry(
         domain=DOMAIN,
-        entry_id="test_entry",
-        data=get_mock_config_data(),
+        entry_id=entry_id,
+        data=get_mock_reachable_range_config_data(),
         options=DEFAULT_OPTIONS,
     )
 
 
-async def setup_integration(hass: HomeAssistant) -> MockConfigEntry:
+async def setup_integration(hass: HomeAssistant, config_entry: MockConfigEntry | None = None) -> MockConfigEntry:
     """Set up the custom component for tests."""
-    config_entry = get_mock_config_entry()
+    config_entry = config_entry or get_mock_config_entry()
     config_entry.add_to_hass(hass)
     assert await hass.config_entries.async_setup(config_entry.entry_id)
     await hass.async_block_till_done()
@@ -1,14 +1,36 @@
 """Global fixtures."""
 
 from collections.abc import Generator
-from unittest.mock import AsyncMock, Mock, PropertyMock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, PropertyMock, patch
+from urllib.parse import unquote
 
 import pytest
 from pytest_homeassistant_custom_component.common import load_fixture
 
-from tomtom_apis.places import GeocodingApi
+from custom_components.tomtom_travel_time.helpers import normalize_location
+from tomtom_apis.models import LatLon
+from tomtom_apis.places import GeocodingApi, SearchApi
+from tomtom_apis.places.models import BatchPostData, Result
 from tomtom_apis.routing import RoutingApi
-from tomtom_apis.routing.models import CalculatedRouteResponse
+from tomtom_apis.routing.models import CalculatedReachableRangeResponse, CalculatedRouteResponse
+
+GEOCODED = {
+    "Dam 1, Amsterdam": LatLon(lat=52.3731, lon=4.8926),
+    "Coolsingel 40, Rotterdam": LatLon(lat=51.9225, lon=4.4792),
+}
+
+SEARCHABLE = [
+    Result.from_dict({"id": "1", "address": {"freeformAddress": "Dam 1, 1012 JS Amsterdam"}, "position": {"lat": 52.3731, "lon": 4.8926}}),
+    Result.from_dict({"id": "2", "address": {"freeformAddress": "Damrak 1, 1012 LG Amsterdam"}, "position": {"lat": 52.3766, "lon": 4.8979}}),
+    Result.from_dict(
+        {
+            "id": "3",
+            "poi": {"name": "Rotterdam Centraal"},
+            "address": {"freeformAddress": "Stationsplein 1, 3013 AJ Rotterdam"},
+            "position": {"lat": 51.9244, "lon": 4.4689},
+        },
+    ),
+]
 
 
 @pytest.fixture(autouse=True)
@@ -34,7 +56,19 @@ def fixture_mock_geocoding_api() -> Generator[AsyncMock]:
     mock_client_class = Mock(return_value=mock_client)
 
     with (
-        patch("custom_components.tomtom_travel_time.helpers.GeocodingApi", mock_client_class),
+        patch("tomtom_apis.places.GeocodingApi", mock_client_class),
+    ):
+        yield mock_client
+
+
+@pytest.fixture(autouse=True, name="mock_search_api")
+def fixture_mock_search_api() -> Generator[AsyncMock]:
+    """Auto-patch SearchApi in all tests and return the mock for configuration."""
+    mock_client = AsyncMock(spec=SearchApi)
+    mock_client_class = Mock(return_value=mock_client)
+
+    with (
+        patch("tomtom_apis.places.SearchApi", mock_client_class),
     ):
         yield mock_client
 
@@ -48,6 +82,7 @@ def fixture_mock_routing_api() -> Generator[AsyncMock]:
     with (
         patch("custom_components.tomtom_travel_time.coordinator.RoutingApi", mock_client_class),
         patch("custom_components.tomtom_travel_time.helpers.RoutingApi", mock_client_class),
+        patch("custom_components.tomtom_travel_time.importer.RoutingApi", mock_client_class),
     ):
         yield mock_client
 
@@ -59,3 +94,61 @@ def fixture_mocked_data(request: pytest.FixtureRequest, mock_routing_api: AsyncM
     response_json = load_fixture(json_file)
     mock_response = CalculatedRouteResponse.from_json(response_json)
     mock_routing_api.get_calculate_route.return_value = mock_response
+
+
+@pytest.fixture(name="mocked_reachable_range")
+def fixture_mocked_reachable_range(mock_routing_api: AsyncMock) -> None:
+    """Fixture for mocking a reachable range response."""
+    response_json = load_fixture("reachable_range.json")
+    mock_response = CalculatedReachableRangeResponse.from_json(response_json)
+    mock_routing_api.get_calculate_reachable_range.return_value = mock_response
+
+
+@pytest.fixture(name="mock_geocode")
+def fixture_mock_geocode(mock_geocoding_api: AsyncMock) -> AsyncMock:
+    """Geocode the known addresses, regardless of case and whitespace."""
+
+    async def get_geocode(query: str, **_: object) -> MagicMock:
+        known = {normalize_location(address): position for address, position in GEOCODED.items()}
+        position = known.get(normalize_location(query))
+        return MagicMock(results=[MagicMock(position=position)] if position else [])
+
+    mock_geocoding_api.__aenter__.return_value = mock_geocoding_api
+    mock_geocoding_api.get_geocode.side_effect = get_geocode
+    return mock_geocoding_api.get_geocode
+
+
+@pytest.fixture(name="mock_search")
+def fixture_mock_search(mock_search_api: AsyncMock) -> AsyncMock:
+    """Search the known results where every word of the query starts a word of the name or address."""
+
+    async def get_search(query: str, **_: object) -> MagicMock:
+        terms = normalize_location(query.replace(",", " ")).split()
+        results = []
+        for result in SEARCHABLE:
+            label = f"{result.poi.name if result.poi else ''} {result.address.freeformAddress}".replace(",", " ")
+            words = normalize_location(label).split()
+            if all(any(word.startswith(term) for word in words) for term in terms):
+                results.append(result)
+        return MagicMock(results=results)
+
+    mock_search_api.__aenter__.return_value = mock_search_api
+    mock_search_api.get_search.side_effect = get_search
+    return mock_search_api.get_search
+
+
+@pytest.fixture(name="mock_batch")
+def fixture_mock_batch(mock_routing_api: AsyncMock) -> AsyncMock:
+    """Return a successful batch item for every route, except routes that start at the north pole."""
+
+    async def post(_endpoint: str, *, data: BatchPostData, **_: object) -> MagicMock:
+        items = [
+            {"statusCode": 400, "response": {"error": {"description": "No route"}}}
+            if unquote(item.query).startswith("/calculateRoute/90.0")
+            else {"statusCode": 200, "response": {"routes": [{}]}}
+            for item in data.batchItems
+        ]
+        return MagicMock(dict=AsyncMock(return_value={"batchItems": items}))
+
+    mock_routing_api.post.side_effect = post
+    return mock_routing_api.post
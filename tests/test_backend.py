@@ -0,0 +1,112 @@
+"""Test the routing backends."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+from aiohttp import ClientError
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.tomtom_travel_time.backend import OSRMRoutingBackend, RoutingBackendError
+from custom_components.tomtom_travel_time.const import CONF_LOCAL_ENGINE, CONF_VEHICLE_TYPE, DEFAULT_OPTIONS
+from custom_components.tomtom_travel_time.coordinator import TomTomDataUpdateCoordinator
+from custom_components.tomtom_travel_time.model import RouteEstimate, TomTomTravelTimeData
+from tomtom_apis.models import LatLon
+
+from . import get_mock_config_entry
+
+ENGINE = "http://osrm.local:5000"
+ROUTE_URL = f"{ENGINE}/route/v1/driving/4.897071,52.377956;4.462456,51.926517"
+LOCATIONS = [LatLon(lat=52.377956, lon=4.897071), LatLon(lat=51.926517, lon=4.462456)]
+OSRM_RESPONSE = {
+    "code": "Ok",
+    "routes": [
+        {
+            "duration": 1500.4,
+            "distance": 25000.0,
+            "geometry": {"type": "LineString", "coordinates": [[4.897071, 52.377956], [4.7, 52.2], [4.462456, 51.926517]]},
+        },
+    ],
+}
+
+
+def get_local_engine_config_entry() -> MockConfigEntry:
+    """Create a mock config entry with a local routing engine."""
+    return get_mock_config_entry(options={CONF_LOCAL_ENGINE: f"{ENGINE}/"})
+
+
+async def test_osrm_route(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker) -> None:
+    """Test that the route is requested with longitude first and the profile of the vehicle type, and parsed without traffic."""
+    aioclient_mock.get(ROUTE_URL, json=OSRM_RESPONSE)
+
+    route = await OSRMRoutingBackend(hass, ENGINE).async_route(LOCATIONS, DEFAULT_OPTIONS)
+
+    assert route == RouteEstimate(
+        duration=1500.4,
+        distance=25000.0,
+        delay=None,
+        points=((52.377956, 4.897071), (52.2, 4.7), (51.926517, 4.462456)),
+    )
+    assert aioclient_mock.mock_calls[0][1].query == {"overview": "full", "geometries": "geojson"}
+
+
+async def test_osrm_route_profile(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker) -> None:
+    """Test that vehicle types without a profile of their own use the car profile."""
+    aioclient_mock.get(f"{ENGINE}/route/v1/cycling/4.897071,52.377956;4.462456,51.926517", json=OSRM_RESPONSE)
+    aioclient_mock.get(ROUTE_URL, json=OSRM_RESPONSE)
+    backend = OSRMRoutingBackend(hass, ENGINE)
+
+    await backend.async_route(LOCATIONS, {**DEFAULT_OPTIONS, CONF_VEHICLE_TYPE: "bicycle"})
+    await backend.async_route(LOCATIONS, {**DEFAULT_OPTIONS, CONF_VEHICLE_TYPE: "truck"})
+
+    assert [call[1].path.split("/")[3] for call in aioclient_mock.mock_calls] == ["cycling", "driving"]
+
+
+@pytest.mark.parametrize(
+    ("response", "message"),
+    [
+        ({"json": {"code": "NoRoute", "message": "Impossible route between points"}}, "cannot plan the route: Impossible route"),
+        ({"exc": ClientError()}, "Cannot reach the routing engine"),
+        ({"text": "Bad gateway", "status": 502}, "Cannot reach the routing engine"),
+    ],
+)
+async def test_osrm_route_error(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, response: dict, message: str) -> None:
+    """Test that failed routes raise a backend error."""
+    aioclient_mock.get(ROUTE_URL, **response)
+
+    with pytest.raises(RoutingBackendError, match=message):
+        await OSRMRoutingBackend(hass, ENGINE).async_route(LOCATIONS, DEFAULT_OPTIONS)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_local_engine_traffic_delay(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, mock_routing_api: AsyncMock) -> None:
+    """Test that the local route is combined with the traffic delay of TomTom, which is only requested once while it is fresh."""
+    aioclient_mock.get(ROUTE_URL, json=OSRM_RESPONSE)
+    coordinator = TomTomDataUpdateCoordinator(hass=hass, config_entry=get_local_engine_config_entry(), api_key="dummy_api")
+
+    results = [await coordinator._async_update_data() for _ in range(2)]  # pylint: disable=protected-access # noqa: SLF001
+
+    # 1500 seconds without traffic and 117 seconds of delay.
+    assert results == [TomTomTravelTimeData(duration=27, distance=25.0, delay=2)] * 2
+    assert aioclient_mock.call_count == 2
+    mock_routing_api.get_calculate_route.assert_awaited_once()
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_local_engine_fallback(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    mock_routing_api: AsyncMock,
+    caplog: LogCaptureFixture,
+) -> None:
+    """Test that the TomTom route is used while the local engine fails, and the failure is logged once."""
+    aioclient_mock.get(ROUTE_URL, exc=ClientError())
+    coordinator = TomTomDataUpdateCoordinator(hass=hass, config_entry=get_local_engine_config_entry(), api_key="dummy_api")
+
+    results = [await coordinator._async_update_data() for _ in range(2)]  # pylint: disable=protected-access # noqa: SLF001
+
+    assert results == [TomTomTravelTimeData(duration=6, distance=1.146, delay=2)] * 2
+    assert mock_routing_api.get_calculate_route.await_count == 2
+    assert caplog.text.count("Cannot reach the routing engine") == 1
@@ -0,0 +1,110 @@
+"""Tests binary sensor."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE, STATE_OFF, STATE_ON, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+
+from custom_components.tomtom_travel_time.const import CONF_DELAY_THRESHOLD, CONF_THRESHOLD_HYSTERESIS
+
+from . import get_mock_config_entry, get_mock_reachable_range_config_entry, setup_integration, unload_integration
+
+INSIDE = {ATTR_LATITUDE: 52.3676, ATTR_LONGITUDE: 4.9041}
+# Within the bounding box, but in the notch north of the center.
+IN_NOTCH = {ATTR_LATITUDE: 52.43, ATTR_LONGITUDE: 4.9041}
+OUTSIDE = {ATTR_LATITUDE: 52.2, ATTR_LONGITUDE: 4.9}
+
+
+@pytest.mark.parametrize(
+    ("attributes", "value"),
+    [
+        (INSIDE, STATE_ON),
+        (IN_NOTCH, STATE_OFF),
+        (OUTSIDE, STATE_OFF),
+        ({}, STATE_UNKNOWN),
+    ],
+)
+@pytest.mark.usefixtures("mocked_reachable_range")
+async def test_state(hass: HomeAssistant, attributes: dict[str, float], value: str) -> None:
+    """Test binary sensor state."""
+    hass.states.async_set("device_tracker.car", "not_home", attributes)
+    config_entry = await setup_integration(hass, get_mock_reachable_range_config_entry())
+
+    state = hass.states.get("binary_sensor.office_car_reachable")
+    assert state
+    assert state.state == value
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_reachable_range")
+async def test_tracker_moves(hass: HomeAssistant) -> None:
+    """Test that the binary sensor follows the tracker without a new request."""
+    config_entry = await setup_integration(hass, get_mock_reachable_range_config_entry())
+
+    # The tracker had no state during setup, so the entity ID is used as name.
+    entity_id = "binary_sensor.office_person_alice_reachable"
+    state = hass.states.get(entity_id)
+    assert state
+    assert state.state == STATE_UNKNOWN
+
+    hass.states.async_set("person.alice", "not_home", INSIDE)
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+    assert state
+    assert state.state == STATE_ON
+
+    hass.states.async_set("person.alice", "not_home", OUTSIDE)
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+    assert state
+    assert state.state == STATE_OFF
+
+    config_entry.runtime_data.async_set_updated_data(config_entry.runtime_data.data)
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+    assert state
+    assert state.state == STATE_OFF
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_threshold(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that the threshold binary sensor only changes when the threshold is crossed or cleared."""
+    config_entry = get_mock_config_entry()
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={**config_entry.options, CONF_DELAY_THRESHOLD: 2, CONF_THRESHOLD_HYSTERESIS: 1},
+    )
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+    summary = mock_routing_api.get_calculate_route.return_value.routes[0].summary
+
+    # Only the configured threshold gets a binary sensor.
+    assert hass.states.get("binary_sensor.from_a_to_b_duration_over_threshold") is None
+    entity_id = "binary_sensor.from_a_to_b_delay_over_threshold"
+    state = hass.states.get(entity_id)
+    assert state
+    assert state.state == STATE_ON
+    assert state.attributes["threshold"] == 2
+    last_reported = state.last_reported
+
+    # Within the hysteresis, the state isn't written at all.
+    summary.trafficDelayInSeconds = 60
+    await coordinator.async_refresh()
+    state = hass.states.get(entity_id)
+    assert state
+    assert state.state == STATE_ON
+    assert state.last_reported == last_reported
+
+    summary.trafficDelayInSeconds = 0
+    await coordinator.async_refresh()
+    state = hass.states.get(entity_id)
+    assert state
+    assert state.state == STATE_OFF
+
+    await unload_integration(hass, config_entry)
+    assert not coordinator.thresholds
@@ -0,0 +1,72 @@
+"""Test cache."""
+
+from unittest.mock import patch
+
+from custom_components.tomtom_travel_time.cache import TTLCache, origin_cell_key, route_cache_key
+from custom_components.tomtom_travel_time.const import DEFAULT_OPTIONS
+from tomtom_apis.models import LatLon
+
+
+def test_ttl_cache_expiry() -> None:
+    """Test that items expire after the time to live."""
+    cache: TTLCache[str, int] = TTLCache(ttl=10)
+
+    with patch("custom_components.tomtom_travel_time.cache.time.monotonic", return_value=100):
+        cache.set("key", 1)
+        assert cache.get("key") == 1
+        assert cache.get("missing") is None
+
+    with patch("custom_components.tomtom_travel_time.cache.time.monotonic", return_value=110):
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+
+def test_ttl_cache_max_size() -> None:
+    """Test that expired items are evicted first and then the oldest items."""
+    cache: TTLCache[str, int] = TTLCache(ttl=10, max_size=2)
+
+    with patch("custom_components.tomtom_travel_time.cache.time.monotonic", return_value=100):
+        cache.set("expired", 0)
+    with patch("custom_components.tomtom_travel_time.cache.time.monotonic", return_value=105):
+        cache.set("first", 1)
+    with patch("custom_components.tomtom_travel_time.cache.time.monotonic", return_value=111):
+        cache.set("second", 2)
+        assert cache.get("expired") is None
+        assert cache.get("first") == 1
+
+        cache.set("third", 3)
+        assert cache.get("first") is None
+        assert cache.get("second") == 2
+        assert cache.get("third") == 3
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_route_cache_key() -> None:
+    """Test that nearby locations share a cache key and options are part of it."""
+    key = route_cache_key([LatLon(lat=52.377956, lon=4.897071), LatLon(lat=51.926517, lon=4.462456)], DEFAULT_OPTIONS)
+    nearby_key = route_cache_key([LatLon(lat=52.377951, lon=4.897069), LatLon(lat=51.926517, lon=4.462456)], DEFAULT_OPTIONS)
+    other_key = route_cache_key(
+        [LatLon(lat=52.377956, lon=4.897071), LatLon(lat=51.926517, lon=4.462456)],
+        {**DEFAULT_OPTIONS, "vehicle_type": "bicycle"},
+    )
+
+    assert key == nearby_key
+    assert key != other_key
+    assert key != route_cache_key([LatLon(lat=52.377956, lon=4.897071), LatLon(lat=51.926517, lon=4.462456)], {**DEFAULT_OPTIONS, "best_order": True})
+    assert key != route_cache_key(
+        [LatLon(lat=52.377956, lon=4.897071), LatLon(lat=51.926517, lon=4.462456)],
+        {**DEFAULT_OPTIONS, "local_engine": "http://osrm.local:5000"},
+    )
+
+
+def test_origin_cell_key() -> None:
+    """Test that origins in the same cell share a cache key, but the destination and cell size are part of it."""
+    destination = LatLon(lat=51.926517, lon=4.462456)
+    key = origin_cell_key([LatLon(lat=52.37795, lon=4.89707), destination], DEFAULT_OPTIONS, 500)
+
+    assert key == origin_cell_key([LatLon(lat=52.37805, lon=4.89702), destination], DEFAULT_OPTIONS, 500)
+    assert key != origin_cell_key([LatLon(lat=52.37795, lon=4.89707), destination], DEFAULT_OPTIONS, 100)
+    assert key != origin_cell_key([LatLon(lat=52.37795, lon=4.89707), LatLon(lat=51.9, lon=4.4)], DEFAULT_OPTIONS, 500)
+    assert key != origin_cell_key([LatLon(lat=52.37795, lon=4.89707), destination], {**DEFAULT_OPTIONS, "route_type": "eco"}, 500)
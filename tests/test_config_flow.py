@@ -1,21 +1,44 @@
 """Test config flow."""
 
 from collections.abc import Generator
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
-from homeassistant.config_entries import SOURCE_USER
+from homeassistant.config_entries import SOURCE_USER, ConfigFlowResult
 from homeassistant.const import CONF_API_KEY, CONF_NAME
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
-from custom_components.tomtom_travel_time.const import CONF_AVOID_TYPE, CONF_LOCATIONS, CONF_ROUTE_TYPE, CONF_VEHICLE_TYPE, DOMAIN
+from custom_components.tomtom_travel_time.const import (
+    CONF_AVOID_TYPE,
+    CONF_CALENDAR,
+    CONF_CENTER,
+    CONF_ENTRY_TYPE,
+    CONF_LOCATION,
+    CONF_LOCATIONS,
+    CONF_ROUTE_TYPE,
+    CONF_SEARCH,
+    CONF_SHARED_STORE,
+    CONF_TIME_BUDGET,
+    CONF_VEHICLE_TYPE,
+    DOMAIN,
+    ENTRY_TYPE_REACHABLE_RANGE,
+    ENTRY_TYPE_ROUTE,
+)
+from custom_components.tomtom_travel_time.helpers import ValidationError
 from custom_components.tomtom_travel_time.model import UserInputLatLan
 from tomtom_apis import TomTomAPIClientError, TomTomAPIConnectionError, TomTomAPIRequestTimeoutError, TomTomAPIServerError
 from tomtom_apis.models import LatLon, TravelModeType
 from tomtom_apis.routing.models import AvoidType, RouteType
 
-from . import get_mock_config_data, setup_integration, unload_integration
+from . import (
+    get_mock_config_data,
+    get_mock_config_entry,
+    get_mock_reachable_range_config_data,
+    get_mock_reachable_range_config_entry,
+    setup_integration,
+    unload_integration,
+)
 
 MOCK_UPDATE_CONFIG = {
     CONF_VEHICLE_TYPE: TravelModeType.BICYCLE.name.lower(),
@@ -34,20 +57,33 @@ def fixture_bypass_setup_fixture() -> Generator[None]:
 @pytest.fixture(autouse=False, name="bypass_validation")
 def fixture_bypass_validation() -> Generator[None]:
     """Prevent actual setup of the integration during tests."""
-    with patch("custom_components.tomtom_travel_time.helpers.is_valid_config_entry", return_value=True):
+    with patch("custom_components.tomtom_travel_time.config_flow.is_valid_config_entry", return_value=True):
         yield
 
 
+async def start_config_flow(hass: HomeAssistant, entry_type: str) -> ConfigFlowResult:
+    """Start a config flow and pick the entry type from the menu."""
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
+
+    # Check that the config flow shows the menu as the first step
+    assert result["type"] == FlowResultType.MENU
+    assert result["step_id"] == "user"
+
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], user_input={"next_step_id": entry_type})
+
+    # Check that the config flow shows the form of the entry type
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == entry_type
+
+    return result
+
+
 @pytest.mark.usefixtures("bypass_validation")
 async def test_successful_config_flow(hass: HomeAssistant) -> None:
     """Test a successful config flow."""
     config_data = get_mock_config_data()
     # Initialize a config flow
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
-
-    # Check that the config flow shows the user form as the first step
-    assert result["type"] == FlowResultType.FORM
-    assert result["step_id"] == "user"
+    result = await start_config_flow(hass, ENTRY_TYPE_ROUTE)
 
     # If a user were to fill in all fields, it would result in this function call
     result2 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input=config_data)
@@ -60,6 +96,25 @@ async def test_successful_config_flow(hass: HomeAssistant) -> None:
     assert result2["result"]
 
 
+@pytest.mark.usefixtures("bypass_validation")
+async def test_config_flow_duplicate_route(hass: HomeAssistant) -> None:
+    """Test that a route identical to an existing entry asks for confirmation."""
+    get_mock_config_entry().add_to_hass(hass)
+    config_data = get_mock_config_data()
+    result = await start_config_flow(hass, ENTRY_TYPE_ROUTE)
+
+    result2 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input=config_data)
+
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["step_id"] == "duplicate"
+    assert result2["description_placeholders"] == {CONF_NAME: "Mock Title"}
+
+    result3 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input={})
+
+    assert result3["type"] == FlowResultType.CREATE_ENTRY
+    assert result3["data"] == config_data
+
+
 @pytest.mark.usefixtures("bypass_validation")
 async def test_successful_config_flow_geocoded(hass: HomeAssistant) -> None:
     """Test a successful config flow, location was geocoded."""
@@ -73,11 +128,7 @@ async def test_successful_config_flow_geocoded(hass: HomeAssistant) -> None:
             "52.377956,4.897071",
         ]
         # Initialize a config flow
-        result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
-
-        # Check that the config flow shows the user form as the first step
-        assert result["type"] == FlowResultType.FORM
-        assert result["step_id"] == "user"
+        result = await start_config_flow(hass, ENTRY_TYPE_ROUTE)
 
         # If a user were to fill in all fields, it would result in this function call
         result2 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input=config_data)
@@ -95,11 +146,7 @@ async def test_unsuccessful_config_flow_locations_length(hass: HomeAssistant) ->
     config_data = get_mock_config_data()
     config_data[CONF_LOCATIONS] = ["52.377956, 4.897070"]
     # Initialize a config flow
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
-
-    # Check that the config flow shows the user form as the first step
-    assert result["type"] == FlowResultType.FORM
-    assert result["step_id"] == "user"
+    result = await start_config_flow(hass, ENTRY_TYPE_ROUTE)
 
     # If a user were to fill in all fields, it would result in this function call
     result2 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input=config_data)
@@ -114,11 +161,7 @@ async def test_unsuccessful_config_flow_cannot_determine_location(hass: HomeAssi
     with patch("custom_components.tomtom_travel_time.config_flow.lat_lon_from_user_input", return_value=None):
         config_data = get_mock_config_data()
         # Initialize a config flow
-        result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
-
-        # Check that the config flow shows the user form as the first step
-        assert result["type"] == FlowResultType.FORM
-        assert result["step_id"] == "user"
+        result = await start_config_flow(hass, ENTRY_TYPE_ROUTE)
 
         # If a user were to fill in all fields, it would result in this function call
         result2 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input=config_data)
@@ -144,11 +187,7 @@ async def test_unsuccessful_config_flow_api_errors(side_effect: Exception, error
         mock_validation.side_effect = side_effect
 
         # Initialize a config flow
-        result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
-
-        # Check that the config flow shows the user form as the first step
-        assert result["type"] == FlowResultType.FORM
-        assert result["step_id"] == "user"
+        result = await start_config_flow(hass, ENTRY_TYPE_ROUTE)
 
         # If a user were to fill in an incomplete form, it would result in this function call
         result2 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input=config_data)
@@ -158,6 +197,67 @@ async def test_unsuccessful_config_flow_api_errors(side_effect: Exception, error
         assert result2["errors"] == {"base": error}
 
 
+@pytest.mark.usefixtures("bypass_validation")
+async def test_config_flow_search(hass: HomeAssistant, mock_search: AsyncMock, mock_geocode: AsyncMock) -> None:
+    """Test that a searched location is added to the locations with its coordinates, so it isn't geocoded."""
+    config_data = {CONF_NAME: "Station to Dam", CONF_API_KEY: "dummy_api", CONF_LOCATIONS: ["51.926517, 4.462456"]}
+    result = await start_config_flow(hass, ENTRY_TYPE_ROUTE)
+
+    result2 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input={**config_data, CONF_SEARCH: "Dam 1 JS"})
+
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["step_id"] == CONF_SEARCH
+    assert result2["description_placeholders"] == {CONF_SEARCH: "Dam 1 JS"}
+    assert result2["data_schema"] is not None
+    assert [option["label"] for option in result2["data_schema"].schema[CONF_LOCATION].config["options"]] == ["Dam 1, 1012 JS Amsterdam"]
+
+    result3 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input={CONF_LOCATION: "52.3731,4.8926"})
+
+    assert result3["type"] == FlowResultType.FORM
+    assert result3["step_id"] == ENTRY_TYPE_ROUTE
+    locations = ["51.926517, 4.462456", "52.3731,4.8926"]
+    assert result3["data_schema"] is not None
+    suggested = {key: key.description["suggested_value"] for key in result3["data_schema"].schema if key.description}
+    assert suggested == {**config_data, CONF_LOCATIONS: locations}
+
+    result4 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input={**config_data, CONF_LOCATIONS: locations})
+
+    assert result4["type"] == FlowResultType.CREATE_ENTRY
+    assert result4["data"] == {**config_data, CONF_LOCATIONS: locations}
+    mock_search.assert_awaited_once()
+    mock_geocode.assert_not_awaited()
+
+
+@pytest.mark.usefixtures("mock_search")
+async def test_config_flow_search_no_results(hass: HomeAssistant) -> None:
+    """Test that the route form is shown again when nothing is found."""
+    result = await start_config_flow(hass, ENTRY_TYPE_ROUTE)
+
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        user_input={CONF_NAME: "Nowhere", CONF_API_KEY: "dummy_api", CONF_SEARCH: "Nowhere street"},
+    )
+
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["step_id"] == ENTRY_TYPE_ROUTE
+    assert result2["errors"] == {"base": "no_search_results"}
+
+
+async def test_config_flow_search_api_error(hass: HomeAssistant, mock_search_api: AsyncMock) -> None:
+    """Test that an API error of the search is shown on the route form."""
+    mock_search_api.__aenter__.return_value = mock_search_api
+    mock_search_api.get_search.side_effect = TomTomAPIConnectionError
+    result = await start_config_flow(hass, ENTRY_TYPE_ROUTE)
+
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        user_input={CONF_NAME: "Dam", CONF_API_KEY: "dummy_api", CONF_SEARCH: "Dam 1"},
+    )
+
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["errors"] == {"base": "cannot_connect"}
+
+
 @pytest.mark.usefixtures("bypass_validation")
 async def test_step_reconfigure(hass: HomeAssistant) -> None:
     """Test for reconfigure step."""
@@ -173,7 +273,7 @@ async def test_step_reconfigure(hass: HomeAssistant) -> None:
 
     result = await config_entry.start_reconfigure_flow(hass)
     assert result["type"] == FlowResultType.FORM
-    assert result["step_id"] == "user"
+    assert result["step_id"] == ENTRY_TYPE_ROUTE
 
     result2 = await hass.config_entries.flow.async_configure(
         result["flow_id"],
@@ -212,3 +312,133 @@ async def test_options_flow(hass: HomeAssistant) -> None:
     assert config_entry.options == MOCK_UPDATE_CONFIG
 
     await unload_integration(hass, config_entry)
+
+
+async def test_options_flow_shared_store_not_allowed(hass: HomeAssistant) -> None:
+    """Test that the options flow only accepts a shared store in the config directory or an allowed directory."""
+    config_entry = await setup_integration(hass)
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+
+    result2 = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={**MOCK_UPDATE_CONFIG, CONF_SHARED_STORE: "/etc/tomtom.db"}
+    )
+
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["errors"] == {CONF_SHARED_STORE: "shared_store_not_allowed"}
+
+    result3 = await hass.config_entries.options.async_configure(result["flow_id"], user_input={**MOCK_UPDATE_CONFIG, CONF_SHARED_STORE: "tomtom.db"})
+
+    assert result3["type"] == FlowResultType.CREATE_ENTRY
+    assert config_entry.options == {**MOCK_UPDATE_CONFIG, CONF_SHARED_STORE: "tomtom.db"}
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_successful_reachable_range_config_flow(hass: HomeAssistant) -> None:
+    """Test a successful reachable range config flow."""
+    config_data = get_mock_reachable_range_config_data()
+    del config_data[CONF_ENTRY_TYPE]
+    result = await start_config_flow(hass, ENTRY_TYPE_REACHABLE_RANGE)
+
+    with patch("custom_components.tomtom_travel_time.config_flow.is_valid_reachable_range", return_value=True) as mock_validate:
+        result2 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input=config_data)
+
+    # Check that the config flow is complete and a new entry is created
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert result2["title"] == config_data[CONF_NAME]
+    assert result2["data"] == {**config_data, CONF_ENTRY_TYPE: ENTRY_TYPE_REACHABLE_RANGE}
+    mock_validate.assert_awaited_once_with(hass, config_data[CONF_API_KEY], LatLon(lat=52.3676, lon=4.9041), 20)
+
+
+async def test_reachable_range_config_flow_geocoded_center(hass: HomeAssistant) -> None:
+    """Test that a geocoded center is stored as coordinates."""
+    config_data = {**get_mock_reachable_range_config_data(), CONF_CENTER: "Dam 1, Amsterdam"}
+    del config_data[CONF_ENTRY_TYPE]
+    result = await start_config_flow(hass, ENTRY_TYPE_REACHABLE_RANGE)
+
+    with (
+        patch(
+            "custom_components.tomtom_travel_time.config_flow.lat_lon_from_user_input",
+            return_value=UserInputLatLan(location=LatLon(lat=52.3731, lon=4.8926), geocoded=True),
+        ),
+        patch("custom_components.tomtom_travel_time.config_flow.is_valid_reachable_range", return_value=True),
+    ):
+        result2 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input=config_data)
+
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert result2["data"][CONF_CENTER] == "52.3731,4.8926"
+
+
+async def test_reachable_range_config_flow_invalid_center(hass: HomeAssistant) -> None:
+    """Test the reachable range config flow with a center that can't be resolved."""
+    config_data = get_mock_reachable_range_config_data()
+    del config_data[CONF_ENTRY_TYPE]
+    result = await start_config_flow(hass, ENTRY_TYPE_REACHABLE_RANGE)
+
+    with patch("custom_components.tomtom_travel_time.config_flow.lat_lon_from_user_input", return_value=None):
+        result2 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input=config_data)
+
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["errors"] == {"base": "cannot_determine_center"}
+
+
+@pytest.mark.parametrize(
+    ("exception", "error"),
+    [
+        (ValidationError("cannot_calculate_reachable_range"), "cannot_calculate_reachable_range"),
+        (TomTomAPIClientError, "client_error"),
+        (TomTomAPIRequestTimeoutError, "timeout_connect"),
+        (TomTomAPIServerError, "server_error"),
+        (TomTomAPIConnectionError, "cannot_connect"),
+    ],
+)
+async def test_reachable_range_config_flow_errors(hass: HomeAssistant, exception: Exception, error: str) -> None:
+    """Test the reachable range config flow with API errors."""
+    config_data = get_mock_reachable_range_config_data()
+    del config_data[CONF_ENTRY_TYPE]
+    result = await start_config_flow(hass, ENTRY_TYPE_REACHABLE_RANGE)
+
+    with patch("custom_components.tomtom_travel_time.config_flow.is_valid_reachable_range", side_effect=exception):
+        result2 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input=config_data)
+
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["errors"] == {"base": error}
+
+
+async def test_step_reconfigure_reachable_range(hass: HomeAssistant) -> None:
+    """Test for reconfigure step of a reachable range entry."""
+    config_entry = await setup_integration(hass, get_mock_reachable_range_config_entry())
+
+    result = await config_entry.start_reconfigure_flow(hass)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == ENTRY_TYPE_REACHABLE_RANGE
+
+    updated_data = {**get_mock_reachable_range_config_data(), CONF_NAME: "Home", CONF_TIME_BUDGET: 30}
+    del updated_data[CONF_ENTRY_TYPE]
+    with patch("custom_components.tomtom_travel_time.config_flow.is_valid_reachable_range", return_value=True):
+        result2 = await hass.config_entries.flow.async_configure(result["flow_id"], user_input=updated_data)
+
+    assert result2["type"] == FlowResultType.ABORT
+    assert result2["reason"] == "reconfigure_successful"
+
+    assert config_entry.title == "Home"
+    assert config_entry.data[CONF_TIME_BUDGET] == 30
+    assert config_entry.data[CONF_ENTRY_TYPE] == ENTRY_TYPE_REACHABLE_RANGE
+
+
+async def test_options_flow_reachable_range(hass: HomeAssistant) -> None:
+    """Test that the options flow of a reachable range entry has no calendar."""
+    config_entry = await setup_integration(hass, get_mock_reachable_range_config_entry())
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["data_schema"]
+    assert CONF_CALENDAR not in result["data_schema"].schema
+
+    result2 = await hass.config_entries.options.async_configure(result["flow_id"], user_input=MOCK_UPDATE_CONFIG)
+
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert config_entry.options == MOCK_UPDATE_CONFIG
+
+    await unload_integration(hass, config_entry)
@@ -1,16 +1,40 @@
 """Test coordinator."""
 
-from unittest.mock import AsyncMock, patch
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from _pytest.logging import LogCaptureFixture
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed, load_fixture
 
-from custom_components.tomtom_travel_time.coordinator import TomTomDataUpdateCoordinator
-from custom_components.tomtom_travel_time.model import TomTomTravelTimeData
+from custom_components.tomtom_travel_time.cache import origin_cell_key
+from custom_components.tomtom_travel_time.const import (
+    CONF_BEST_ORDER,
+    CONF_CALENDAR,
+    CONF_LOCATIONS,
+    CONF_ORIGIN_CELL_SIZE,
+    CONF_PAUSE_ENTITY,
+    DEFAULT_OPTIONS,
+)
+from custom_components.tomtom_travel_time.coordinator import (
+    DATA_ORIGIN_CACHE,
+    TomTomDataUpdateCoordinator,
+    TomTomReachableRangeCoordinator,
+    optimized_waypoint_order,
+)
+from custom_components.tomtom_travel_time.helpers import lat_lon_from_coordinates
+from custom_components.tomtom_travel_time.model import CachedRoute, ReachableRangeData, TomTomTravelTimeData
+from tomtom_apis.models import LatLon
+from tomtom_apis.routing.models import CalculatedRouteResponse
 
-from . import get_mock_config_entry
+from . import get_mock_config_entry, get_mock_reachable_range_config_entry
+from .test_prefetch import register_calendar
+
+# Origin, three stops and destination.
+STOPS = ["52.377956, 4.897071", "52.3731, 4.8926", "52.0907, 5.1214", "52.0705, 4.3007", "51.926517, 4.462456"]
 
 
 async def test_async_update_data_success(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
@@ -25,12 +49,65 @@ async def test_async_update_data_success(hass: HomeAssistant, mock_routing_api:
     mock_routing_api.get_calculate_route.assert_awaited_once()
 
 
+async def test_async_update_data_coordinates_parsed_once(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that coordinates aren't resolved again on every refresh."""
+    with patch("custom_components.tomtom_travel_time.coordinator.lat_lon_from_user_input") as mock_lat_lon_from_user_input:
+        coordinator = TomTomDataUpdateCoordinator(
+            hass=hass,
+            config_entry=get_mock_config_entry(),
+            api_key="dummy_api",
+        )
+
+        await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+
+    mock_lat_lon_from_user_input.assert_not_called()
+    locations = mock_routing_api.get_calculate_route.call_args.kwargs["locations"].locations
+    assert locations == [LatLon(lat=52.377956, lon=4.897071), LatLon(lat=51.926517, lon=4.462456)]
+
+
+@pytest.mark.usefixtures("mocked_data")
+@pytest.mark.parametrize(("cell_size", "requests"), [(500, 1), (None, 2)])
+async def test_async_update_data_origin_cell(hass: HomeAssistant, mock_routing_api: AsyncMock, cell_size: int | None, requests: int) -> None:
+    """Test that nearby origins share a route to the same destination when the origin is snapped to a grid."""
+    for origin in ("52.37795, 4.89707", "52.37805, 4.89702"):
+        config_entry = get_mock_config_entry(data={CONF_LOCATIONS: [origin, "51.926517, 4.462456"]}, options={CONF_ORIGIN_CELL_SIZE: cell_size})
+        coordinator = TomTomDataUpdateCoordinator(hass=hass, config_entry=config_entry, api_key="dummy_api")
+
+        result = await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+        assert result == TomTomTravelTimeData(duration=6, distance=1.146, delay=2)
+
+    assert mock_routing_api.get_calculate_route.await_count == requests
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_async_update_data_origin_cell_cache(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that the origin cache only keeps the travel time data and the encoded geometry of a route."""
+    coordinators = []
+    for origin in ("52.37795, 4.89707", "52.37805, 4.89702"):
+        config_entry = get_mock_config_entry(data={CONF_LOCATIONS: [origin, "51.926517, 4.462456"]}, options={CONF_ORIGIN_CELL_SIZE: 500})
+        coordinator = TomTomDataUpdateCoordinator(hass=hass, config_entry=config_entry, api_key="dummy_api")
+        coordinator.keep_geometry = True
+        await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+        coordinators.append(coordinator)
+
+    cache = hass.data[DATA_ORIGIN_CACHE]
+    assert len(cache) == 1
+    cached = cache.get(origin_cell_key([LatLon(lat=52.37795, lon=4.89707), LatLon(lat=51.926517, lon=4.462456)], coordinators[0].options, 500))
+    assert isinstance(cached, CachedRoute)
+    assert cached.data == TomTomTravelTimeData(duration=6, distance=1.146, delay=2)
+    assert cached.geometry.points == 30
+    assert mock_routing_api.get_calculate_route.await_count == 1
+    # The route from the cache has the geometry of the requested route.
+    assert coordinators[1].geometry == coordinators[0].geometry == cached.geometry
+
+
 async def test_async_update_data_api_invalid_location(hass: HomeAssistant, caplog: LogCaptureFixture) -> None:
     """Test failure due to invalid location."""
+    config_entry = get_mock_config_entry(data={CONF_LOCATIONS: ["zone.unknown", "51.926517, 4.462456"]})
     with patch("custom_components.tomtom_travel_time.coordinator.lat_lon_from_user_input", return_value=None):
         coordinator = TomTomDataUpdateCoordinator(
             hass=hass,
-            config_entry=get_mock_config_entry(),
+            config_entry=config_entry,
             api_key="dummy_api",
         )
 
@@ -48,3 +125,223 @@ async def test_async_update_data_api_failure(hass: HomeAssistant, mock_routing_a
     )
     with pytest.raises(UpdateFailed):
         await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+
+
+async def test_async_update_data_prefetch_idle(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that no route is requested when there is no departure within the prefetch window."""
+    register_calendar(hass, [])
+    config_entry = get_mock_config_entry()
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(config_entry, options={**config_entry.options, CONF_CALENDAR: "calendar.work"})
+    coordinator = TomTomDataUpdateCoordinator(
+        hass=hass,
+        config_entry=config_entry,
+        api_key="dummy_api",
+    )
+    coordinator.data = TomTomTravelTimeData(duration=30, distance=25.0, delay=5)
+
+    result = await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+
+    assert result is coordinator.data
+    assert coordinator.update_interval == timedelta(minutes=30)
+    mock_routing_api.get_calculate_route.assert_not_awaited()
+
+    # Removing the calendar reloads the entry, the new coordinator uses the regular update interval.
+    hass.config_entries.async_update_entry(config_entry, options=DEFAULT_OPTIONS)
+    coordinator = TomTomDataUpdateCoordinator(
+        hass=hass,
+        config_entry=config_entry,
+        api_key="dummy_api",
+    )
+    await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+
+    assert coordinator.prefetch is None
+    assert coordinator.update_interval == timedelta(minutes=5)
+    mock_routing_api.get_calculate_route.assert_awaited_once()
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_async_update_data_prefetch_event(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that the event location is used as destination within the prefetch window."""
+    start = dt_util.utcnow() + timedelta(minutes=30)
+    register_calendar(hass, [{"summary": "Meeting", "start": start.isoformat(), "location": "51.92, 4.47"}])
+    config_entry = get_mock_config_entry()
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(config_entry, options={**config_entry.options, CONF_CALENDAR: "calendar.work"})
+    coordinator = TomTomDataUpdateCoordinator(
+        hass=hass,
+        config_entry=config_entry,
+        api_key="dummy_api",
+    )
+
+    await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+
+    locations = mock_routing_api.get_calculate_route.call_args.kwargs["locations"].locations
+    assert locations == [LatLon(lat=52.377956, lon=4.897071), LatLon(lat=51.92, lon=4.47)]
+    assert coordinator.update_interval == timedelta(minutes=5)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_async_update_data_paused(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that no routes are requested while the pause entity is on, and that turning it off refreshes right away."""
+    hass.states.async_set("input_boolean.away", "on")
+    config_entry = get_mock_config_entry(options={CONF_PAUSE_ENTITY: "input_boolean.away"})
+    coordinator = TomTomDataUpdateCoordinator(hass=hass, config_entry=config_entry, api_key="dummy_api")
+    coordinator.async_add_listener(lambda: None)
+
+    # The first refresh requests a route, so the entities have a state.
+    await coordinator.async_refresh()
+    assert coordinator.paused
+    assert mock_routing_api.get_calculate_route.await_count == 1
+
+    await coordinator.async_refresh()
+    assert coordinator.update_interval is None
+    assert mock_routing_api.get_calculate_route.await_count == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=1))
+    await hass.async_block_till_done()
+    assert mock_routing_api.get_calculate_route.await_count == 1
+
+    hass.states.async_set("input_boolean.away", "off")
+    await hass.async_block_till_done()
+    assert not coordinator.paused
+    assert coordinator.update_interval == timedelta(minutes=5)
+    assert mock_routing_api.get_calculate_route.await_count == 2
+
+    await coordinator.async_shutdown()
+    hass.states.async_set("input_boolean.away", "on")
+    hass.states.async_set("input_boolean.away", "off")
+    await hass.async_block_till_done()
+    assert mock_routing_api.get_calculate_route.await_count == 2
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_async_update_data_without_listeners(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that a coordinator doesn't poll when no entity listens to it, for example when all entities are disabled."""
+    coordinator = TomTomDataUpdateCoordinator(hass=hass, config_entry=get_mock_config_entry(), api_key="dummy_api")
+    await coordinator.async_refresh()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=1))
+    await hass.async_block_till_done()
+
+    mock_routing_api.get_calculate_route.assert_awaited_once()
+
+
+@pytest.mark.usefixtures("mocked_reachable_range")
+async def test_reachable_range_update_data_success(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test successful reachable range update."""
+    coordinator = TomTomReachableRangeCoordinator(
+        hass=hass,
+        config_entry=get_mock_reachable_range_config_entry(),
+        api_key="dummy_api",
+    )
+    result = await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+    assert isinstance(result, ReachableRangeData)
+    assert result.center == LatLon(lat=52.3676, lon=4.9041)
+    assert len(result.polygon) == 16
+    assert mock_routing_api.get_calculate_reachable_range.await_args.kwargs["params"].timeBudgetInSec == 1200
+
+
+async def test_reachable_range_update_data_invalid_center(hass: HomeAssistant) -> None:
+    """Test reachable range failure due to an invalid center."""
+    with patch("custom_components.tomtom_travel_time.coordinator.lat_lon_from_user_input", return_value=None):
+        coordinator = TomTomReachableRangeCoordinator(
+            hass=hass,
+            config_entry=get_mock_reachable_range_config_entry(),
+            api_key="dummy_api",
+        )
+
+        with pytest.raises(UpdateFailed, match="Cannot determine center"):
+            await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+
+
+async def test_reachable_range_update_data_api_failure(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test reachable range API failure."""
+    mock_routing_api.get_calculate_reachable_range.side_effect = Exception("API error")
+    coordinator = TomTomReachableRangeCoordinator(
+        hass=hass,
+        config_entry=get_mock_reachable_range_config_entry(),
+        api_key="dummy_api",
+    )
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+
+
+def mock_best_order(mock_routing_api: AsyncMock, optimized: list[int]) -> CalculatedRouteResponse:
+    """Answer best order requests with the route of the fixture and the optimized index of each stop, return the route response."""
+    route_response = CalculatedRouteResponse.from_json(load_fixture("response.json"))
+    response = MagicMock()
+    response.deserialize = AsyncMock(return_value=route_response)
+    response.dict = AsyncMock(
+        return_value={"optimizedWaypoints": [{"providedIndex": provided, "optimizedIndex": index} for provided, index in enumerate(optimized)]},
+    )
+    mock_routing_api.get.return_value = response
+    return route_response
+
+
+def get_best_order_config_entry(locations: list[str]) -> MockConfigEntry:
+    """Create a mock config entry that orders its stops."""
+    return get_mock_config_entry(data={CONF_LOCATIONS: locations}, options={CONF_BEST_ORDER: True})
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_async_update_data_best_order(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that the best order is computed once, and the route is requested in that order while traffic stays the same."""
+    mock_best_order(mock_routing_api, [1, 2, 0])
+    coordinator = TomTomDataUpdateCoordinator(hass=hass, config_entry=get_best_order_config_entry(STOPS), api_key="dummy_api")
+
+    result = await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+
+    assert result == TomTomTravelTimeData(duration=6, distance=1.146, delay=2, waypoint_order=(2, 0, 1))
+    mock_routing_api.get.assert_awaited_once()
+    params = mock_routing_api.get.await_args_list[0].kwargs["params"]
+    assert params.computeBestOrder
+    mock_routing_api.get_calculate_route.assert_not_awaited()
+
+    result = await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+
+    assert result.waypoint_order == (2, 0, 1)
+    mock_routing_api.get.assert_awaited_once()
+    kwargs = mock_routing_api.get_calculate_route.await_args_list[0].kwargs
+    assert kwargs["locations"].locations == [lat_lon_from_coordinates(STOPS[index]) for index in (0, 3, 1, 2, 4)]
+    assert kwargs["params"].computeBestOrder is None
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_async_update_data_best_order_traffic_change(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that the best order is computed again after traffic changed significantly."""
+    mock_best_order(mock_routing_api, [1, 0, 2])
+    coordinator = TomTomDataUpdateCoordinator(hass=hass, config_entry=get_best_order_config_entry(STOPS), api_key="dummy_api")
+    await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+
+    mock_routing_api.get_calculate_route.return_value.routes[0].summary.trafficDelayInSeconds += 4 * 60
+    await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+    await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+    assert mock_routing_api.get.await_count == 1
+
+    mock_routing_api.get_calculate_route.return_value.routes[0].summary.trafficDelayInSeconds += 60
+    await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+    assert mock_routing_api.get.await_count == 1
+
+    result = await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+    assert mock_routing_api.get.await_count == 2
+    assert result.waypoint_order == (1, 0, 2)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_async_update_data_best_order_one_stop(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that a route with a single stop isn't ordered."""
+    coordinator = TomTomDataUpdateCoordinator(hass=hass, config_entry=get_best_order_config_entry(STOPS[:3]), api_key="dummy_api")
+
+    result = await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+
+    assert result.waypoint_order is None
+    mock_routing_api.get.assert_not_awaited()
+
+
+def test_optimized_waypoint_order() -> None:
+    """Test that stops keep their provided order when TomTom didn't reorder them."""
+    assert optimized_waypoint_order(
+        {"optimizedWaypoints": [{"providedIndex": 0, "optimizedIndex": 1}, {"providedIndex": 1, "optimizedIndex": 0}]}, 2
+    ) == (1, 0)
+    assert optimized_waypoint_order({}, 3) == (0, 1, 2)
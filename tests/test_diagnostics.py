@@ -6,10 +6,10 @@ from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.components.diagnostics import get_diagnostics_for_config_entry
 from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
 
-from custom_components.tomtom_travel_time.const import DOMAIN
+from custom_components.tomtom_travel_time.const import CONF_FORECAST, DOMAIN
 from custom_components.tomtom_travel_time.diagnostics import TO_REDACT
 
-from . import setup_integration, unload_integration
+from . import get_mock_config_entry, get_mock_reachable_range_config_entry, setup_integration, unload_integration
 
 
 @pytest.mark.usefixtures("mocked_data")
@@ -29,4 +29,39 @@ async def test_config_entry_diagnostics(hass: HomeAssistant, hass_client: Client
     assert result["data"]["distance"] == 1.146
     assert result["data"]["duration"] == 6
 
+    # Only the last characters of the API key are shown.
+    assert result["api_keys"]["..._key"]["requests"] == 1
+    assert result["metrics"]["requests"] == {"calculate_route": 1}
+    assert result["metrics"]["error_rate"] == 0
+    assert "forecast" not in result
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_reachable_range")
+async def test_reachable_range_diagnostics(hass: HomeAssistant, hass_client: ClientSessionGenerator) -> None:
+    """Test reachable range config entry diagnostics."""
+    config_entry = await setup_integration(hass, get_mock_reachable_range_config_entry())
+
+    result = await get_diagnostics_for_config_entry(hass, hass_client, config_entry)
+
+    assert result["config_entry"]["entry_id"] == "test_range_entry"
+    assert result["data"]["center"] == {"lat": 52.3676, "lon": 4.9041}
+    assert result["data"]["boundary_points"] == 16
+    assert result["data"]["bounding_box"] == [52.2676, 4.7441, 52.45999, 5.0641]
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_forecast_diagnostics(hass: HomeAssistant, hass_client: ClientSessionGenerator) -> None:
+    """Test that the forecast and its accuracy are part of the diagnostics."""
+    config_entry = get_mock_config_entry(options={CONF_FORECAST: True})
+    await setup_integration(hass, config_entry)
+
+    result = await get_diagnostics_for_config_entry(hass, hass_client, config_entry)
+
+    assert result["forecast"]["forecasts"] == {"15": 6.0, "30": 6.0, "60": 6.0}
+    assert result["forecast"]["accuracy"]["15"] == {"samples": 0, "mean_absolute_error": None, "persistence_error": None}
+
     await unload_integration(hass, config_entry)
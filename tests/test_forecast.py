@@ -0,0 +1,86 @@
+"""Test the travel time forecast."""
+
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.tomtom_travel_time.forecast import ForecastModel
+from custom_components.tomtom_travel_time.model import TomTomTravelTimeData
+
+START = datetime(2026, 6, 1, 7, 0, tzinfo=dt_util.UTC)
+
+
+def update(model: ForecastModel, minutes: float, duration: float, delay: float = 0) -> None:
+    """Add a sample the number of minutes after the start."""
+    model.update(START + timedelta(minutes=minutes), TomTomTravelTimeData(duration=duration, distance=10, delay=delay))
+
+
+def test_forecast_stable() -> None:
+    """Test that a stable duration is forecast to stay the same."""
+    model = ForecastModel()
+    for minutes in range(0, 30, 5):
+        update(model, minutes, 20)
+
+    assert model.forecasts == {15: 20.0, 30: 20.0, 60: 20.0}
+
+
+def test_forecast_trend() -> None:
+    """Test that a rising duration is forecast to keep rising, but slower further ahead."""
+    model = ForecastModel()
+    for minutes, duration in ((0, 20), (5, 22), (10, 24), (15, 26)):
+        update(model, minutes, duration)
+
+    assert model.level is not None
+    assert model.level < model.forecasts[15] < model.forecasts[30] < model.forecasts[60]
+    assert model.forecasts[60] - model.forecasts[30] < model.forecasts[30] - model.forecasts[15]
+
+
+def test_forecast_free_flow() -> None:
+    """Test that a falling duration isn't forecast below the duration without traffic."""
+    model = ForecastModel()
+    for minutes, duration, delay in ((0, 30, 20), (5, 24, 14), (10, 18, 8), (15, 12, 2)):
+        update(model, minutes, duration, delay)
+
+    assert model.forecasts[60] == 10.0
+
+
+def test_forecast_profile() -> None:
+    """Test that the usual change at the same time of the week is blended in."""
+    model = ForecastModel()
+    update(model, 0, 20)
+    update(model, 30, 40)
+
+    # A week later, after a gap that restarts the trend.
+    update(model, 7 * 24 * 60, 20)
+
+    assert model.trend == 0
+    assert model.forecasts[15] == 20.0
+    assert model.forecasts[30] == 30.0
+
+
+def test_forecast_saved() -> None:
+    """Test that a saved model forecasts with the weekly profile of the model it was saved from."""
+    model = ForecastModel()
+    update(model, 0, 20)
+    update(model, 30, 40)
+
+    restored = ForecastModel(model.saved())
+    update(restored, 7 * 24 * 60, 20)
+
+    assert restored.forecasts[30] == 30.0
+
+
+def test_forecast_accuracy() -> None:
+    """Test that forecasts are checked at their target time, and forecasts that weren't checked in time are dropped."""
+    model = ForecastModel()
+    for minutes, duration in ((0, 20), (5, 20), (10, 20), (15, 24), (20, 24)):
+        update(model, minutes, duration)
+
+    accuracy = model.as_dict()["accuracy"]
+    assert accuracy[15] == {"samples": 2, "mean_absolute_error": 4.0, "persistence_error": 4.0}
+    assert accuracy[30] == {"samples": 0, "mean_absolute_error": None, "persistence_error": None}
+
+    # The 30 and 60 minute forecasts of before the gap are missed.
+    update(model, 180, 24)
+
+    assert model.as_dict()["accuracy"][30]["samples"] == 0
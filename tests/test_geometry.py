@@ -0,0 +1,56 @@
+"""Test geometry."""
+
+import pytest
+
+from custom_components.tomtom_travel_time.geometry import ReachablePolygon, encode_polyline, grid_cell
+
+# A square with a notch cut out of the top.
+NOTCHED_SQUARE = [(0.0, 0.0), (0.0, 4.0), (4.0, 4.0), (4.0, 3.0), (2.0, 2.0), (4.0, 1.0), (4.0, 0.0)]
+
+
+@pytest.mark.parametrize("bands", [1, 2, 32])
+@pytest.mark.parametrize(
+    ("lat", "lon", "expected"),
+    [
+        (1.0, 1.0, True),
+        (1.0, 2.0, True),
+        (3.9, 0.5, True),
+        (3.5, 2.0, False),
+        (5.0, 2.0, False),
+        (-1.0, 2.0, False),
+        (2.0, 4.5, False),
+    ],
+)
+def test_contains(bands: int, lat: float, lon: float, *, expected: bool) -> None:
+    """Test point in polygon checks, independent of the number of bands."""
+    polygon = ReachablePolygon(NOTCHED_SQUARE, bands=bands)
+    assert polygon.contains(lat, lon) is expected
+
+
+def test_bounding_box() -> None:
+    """Test the bounding box of a polygon."""
+    polygon = ReachablePolygon(NOTCHED_SQUARE)
+    assert polygon.bounding_box == (0.0, 0.0, 4.0, 4.0)
+    assert len(polygon) == len(NOTCHED_SQUARE)
+
+
+@pytest.mark.parametrize("points", [[], [(1.0, 1.0)], [(0.0, 0.0), (1.0, 1.0)]])
+def test_contains_degenerate(points: list[tuple[float, float]]) -> None:
+    """Test that a polygon with less than three points contains nothing."""
+    polygon = ReachablePolygon(points)
+    assert not polygon.contains(0.5, 0.5)
+
+
+def test_encode_polyline() -> None:
+    """Test the encoded polyline format, with the example of the format documentation."""
+    assert encode_polyline([(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    assert encode_polyline([]) == ""
+
+
+def test_grid_cell() -> None:
+    """Test that points within a cell share it, and that cells are about as wide as they are high away from the equator."""
+    assert grid_cell(52.3780, 4.8970, 500) == grid_cell(52.3781, 4.8971, 500)
+    assert grid_cell(52.3780, 4.8970, 500) != grid_cell(52.3880, 4.8970, 500)
+    # 0.008 degrees of longitude is about 545 meters at this latitude, but 890 meters at the equator.
+    assert grid_cell(52.3780, 4.8951, 500)[1] != grid_cell(52.3780, 4.9031, 500)[1]
+    assert grid_cell(0.001, 0.0001, 1000) == grid_cell(0.001, 0.0081, 1000)
@@ -1,11 +1,20 @@
 """Test helpers."""
 
 from collections.abc import Generator
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-
-from custom_components.tomtom_travel_time.helpers import UserInputLatLan, ValidationError, is_valid_config_entry, lat_lon_from_user_input
+from homeassistant.core import HomeAssistant
+
+from custom_components.tomtom_travel_time.helpers import (
+    UserInputLatLan,
+    ValidationError,
+    allowed_config_path,
+    is_valid_config_entry,
+    is_valid_reachable_range,
+    lat_lon_from_user_input,
+)
 from tomtom_apis.models import LatLon
 
 
@@ -16,6 +25,16 @@ def fixture_mock_find_coordinates() -> Generator[MagicMock]:
         yield mock
 
 
+def test_allowed_config_path(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test that a file must be in the config directory or an allowed directory."""
+    assert allowed_config_path(hass, "tomtom.db") is not None
+    assert allowed_config_path(hass, "../tomtom.db") is None
+    assert allowed_config_path(hass, str(tmp_path / "tomtom.db")) is None
+
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    assert allowed_config_path(hass, str(tmp_path / "tomtom.db")) is not None
+
+
 async def test_lat_lon_from_user_input_float() -> None:
     """Test lat_lon_from_user_input with float input."""
     hass = MagicMock()
@@ -40,10 +59,9 @@ async def test_lat_lon_from_user_input_find_coordinates(mock_find_coordinates: M
     assert not result.geocoded
 
 
-@patch("custom_components.tomtom_travel_time.helpers.GeocodingApi")
-async def test_lat_lon_from_user_input_geocode(mock_geocoding_api: AsyncMock) -> None:
+@patch("tomtom_apis.places.GeocodingApi")
+async def test_lat_lon_from_user_input_geocode(mock_geocoding_api: AsyncMock, hass: HomeAssistant) -> None:
     """Test lat_lon_from_user_input with geocoding."""
-    hass = MagicMock()
     api_key = "dummy"
     mock_api_instance = AsyncMock()
     mock_api_instance.__aenter__.return_value = mock_api_instance
@@ -56,9 +74,8 @@ async def test_lat_lon_from_user_input_geocode(mock_geocoding_api: AsyncMock) ->
     assert result.geocoded
 
 
-async def test_lat_lon_from_user_input_none(mock_geocoding_api: AsyncMock) -> None:
+async def test_lat_lon_from_user_input_none(mock_geocoding_api: AsyncMock, hass: HomeAssistant) -> None:
     """Test lat_lon_from_user_input returns None if all location resolution fails."""
-    hass = MagicMock()
     api_key = "dummy"
     mock_api_instance = AsyncMock()
     mock_api_instance.__aenter__.return_value = mock_api_instance
@@ -68,34 +85,46 @@ async def test_lat_lon_from_user_input_none(mock_geocoding_api: AsyncMock) -> No
     assert result is None
 
 
-@patch("custom_components.tomtom_travel_time.helpers.RoutingApi")
-async def test_is_valid_config_entry_success(mock_routing_api: AsyncMock) -> None:
+async def test_is_valid_config_entry_success(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
     """Test is_valid_config_entry with valid locations."""
-    hass = MagicMock()
     api_key = "dummy"
     locations = [LatLon(lat=1.0, lon=2.0), LatLon(lat=3.0, lon=4.0)]
-    mock_api_instance = AsyncMock()
-    mock_api_instance.__aenter__.return_value = mock_api_instance
-    mock_api_instance.get_calculate_route.return_value.routes = [MagicMock()]
-    mock_routing_api.return_value = mock_api_instance
+    mock_routing_api.__aenter__.return_value = mock_routing_api
+    mock_routing_api.get_calculate_route.return_value.routes = [MagicMock()]
     result = await is_valid_config_entry(hass, api_key, locations)
     assert result is True
+    assert mock_routing_api.get_calculate_route.call_args.kwargs["params"].key == api_key
 
 
-async def test_is_valid_config_entry_failure(mock_routing_api: AsyncMock) -> None:
+async def test_is_valid_config_entry_failure(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
     """Test is_valid_config_entry with invalid locations."""
-    hass = MagicMock()
     api_key = "dummy"
     locations = [LatLon(lat=1.0, lon=2.0), LatLon(lat=3.0, lon=4.0)]
-    mock_api_instance = AsyncMock()
-    mock_api_instance.__aenter__.return_value = mock_api_instance
-    mock_api_instance.get_calculate_route.return_value.routes = []
-    mock_routing_api.return_value = mock_api_instance
+    mock_routing_api.__aenter__.return_value = mock_routing_api
+    mock_routing_api.get_calculate_route.return_value.routes = []
     with pytest.raises(ValidationError) as exc:
         await is_valid_config_entry(hass, api_key, locations)
     assert exc.value.error_key == "cannot_plan_route"
 
 
+@pytest.mark.usefixtures("mocked_reachable_range")
+async def test_is_valid_reachable_range_success(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test is_valid_reachable_range with a valid center."""
+    mock_routing_api.__aenter__.return_value = mock_routing_api
+    result = await is_valid_reachable_range(hass, "dummy", LatLon(lat=52.3676, lon=4.9041), 20)
+    assert result is True
+    assert mock_routing_api.get_calculate_reachable_range.call_args.kwargs["params"].key == "dummy"
+
+
+async def test_is_valid_reachable_range_failure(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test is_valid_reachable_range without a boundary."""
+    mock_routing_api.__aenter__.return_value = mock_routing_api
+    mock_routing_api.get_calculate_reachable_range.return_value.reachableRange.boundary = []
+    with pytest.raises(ValidationError) as exc:
+        await is_valid_reachable_range(hass, "dummy", LatLon(lat=52.3676, lon=4.9041), 20)
+    assert exc.value.error_key == "cannot_calculate_reachable_range"
+
+
 def test_validation_error() -> None:
     """Test ValidationError initialization and string representation."""
     err = ValidationError("key", {"foo": "bar"})
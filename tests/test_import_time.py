@@ -0,0 +1,52 @@
+"""Import time budget, the integration is imported on every start of Home Assistant, together with its config flow and diagnostics.
+
+The budget can be raised with the TOMTOM_IMPORT_BUDGET environment variable, in seconds, for slow machines.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+IMPORT_BUDGET = float(os.environ.get("TOMTOM_IMPORT_BUDGET", "0.5"))
+# Modules that are only imported on first use, like the Places API for free-text locations, search and imports.
+LAZY_MODULES = ("tomtom_apis.places", "tomtom_apis.places.models")
+
+# Home Assistant has these loaded before the integration is, so they don't count for the integration. The import is timed in a new
+# interpreter, as the test session already imported everything.
+IMPORT_SCRIPT = """
+import json
+import sys
+import time
+
+import homeassistant.components.http
+import homeassistant.config_entries
+import homeassistant.helpers.aiohttp_client
+import homeassistant.helpers.config_validation
+import homeassistant.helpers.update_coordinator
+
+start = time.perf_counter()
+import custom_components.tomtom_travel_time
+# Home Assistant preloads these platforms when it loads the integration.
+import custom_components.tomtom_travel_time.config_flow
+import custom_components.tomtom_travel_time.diagnostics
+seconds = time.perf_counter() - start
+
+print(json.dumps({"seconds": seconds, "modules": sorted(sys.modules)}))
+"""
+
+
+def test_import_time() -> None:
+    """Test that importing the integration and its preloaded platforms stays within the budget, and heavy modules are imported on first use."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    report = json.loads(result.stdout.splitlines()[-1])
+
+    assert not set(LAZY_MODULES) & set(report["modules"])
+    assert report["seconds"] < IMPORT_BUDGET, f"Importing took {report['seconds']:.3f} seconds"
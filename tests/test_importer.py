@@ -0,0 +1,93 @@
+"""Test bulk route import."""
+
+import asyncio
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.tomtom_travel_time.const import CONF_LOCATIONS, DOMAIN
+from custom_components.tomtom_travel_time.importer import RateLimiter, async_import_routes, load_routes_file
+from custom_components.tomtom_travel_time.model import ImportRow
+
+from . import setup_integration
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_import_routes(hass: HomeAssistant, mock_geocode: AsyncMock, mock_batch: AsyncMock) -> None:
+    """Test that identical addresses are geocoded once, routes are validated in one batch and failures are reported per row."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    rows = [
+        ImportRow(row=1, name="Home to work", locations=["52.377956, 4.897071", "Dam 1, Amsterdam"]),
+        ImportRow(row=2, name="Work to Rotterdam", locations=["dam 1,  amsterdam", "Coolsingel 40, Rotterdam"]),
+        ImportRow(row=3, name="Same as row 1", locations=["52.377956,4.897071", "DAM 1, AMSTERDAM"]),
+        ImportRow(row=4, name="Too short", locations=["Dam 1, Amsterdam"]),
+        ImportRow(row=5, name="Unknown", locations=["Dam 1, Amsterdam", "Nowhere 1"]),
+        ImportRow(row=6, name="No route", locations=["90.0, 0.0", "Dam 1, Amsterdam"]),
+    ]
+
+    await async_import_routes(hass, "test_api_key", rows)
+    await hass.async_block_till_done()
+
+    assert [(row.row, row.error, row.detail) for row in rows] == [
+        (1, None, None),
+        (2, None, None),
+        (3, "duplicate", "1"),
+        (4, "at_least_two_locations", None),
+        (5, "cannot_determine_location", "Nowhere 1"),
+        (6, "cannot_plan_route", None),
+    ]
+    # Three unique addresses, coordinates aren't geocoded.
+    assert mock_geocode.await_count == 3
+    mock_batch.assert_awaited_once()
+    assert mock_batch.await_args
+    assert len(mock_batch.await_args.kwargs["data"].batchItems) == 3
+
+    entries = hass.config_entries.async_entries(DOMAIN)
+    assert [entry.title for entry in entries] == ["Home to work", "Work to Rotterdam"]
+    assert entries[0].entry_id == rows[0].entry_id
+    # Geocoded addresses are stored as coordinates.
+    assert entries[0].data[CONF_LOCATIONS] == ["52.377956, 4.897071", "52.3731,4.8926"]
+
+
+@pytest.mark.usefixtures("mocked_data", "mock_geocode", "mock_batch")
+async def test_import_routes_already_configured(hass: HomeAssistant) -> None:
+    """Test that a route of an existing entry isn't imported again."""
+    await setup_integration(hass)
+    rows = [ImportRow(row=1, name="Existing", locations=["52.37796, 4.89707", "51.926517, 4.462456"])]
+
+    await async_import_routes(hass, "test_api_key", rows)
+
+    assert rows[0].error == "already_configured"
+    assert len(hass.config_entries.async_entries(DOMAIN)) == 1
+
+
+async def test_rate_limiter() -> None:
+    """Test that the rate limiter spaces the start of calls."""
+    limiter = RateLimiter(rate=50, concurrency=2)
+    starts: list[float] = []
+
+    async def call() -> None:
+        async with limiter:
+            starts.append(time.monotonic())
+
+    await asyncio.gather(*(call() for _ in range(5)))
+
+    assert starts[-1] - starts[0] >= 4 / 50 * 0.9
+
+
+def test_load_routes_file(tmp_path: Path) -> None:
+    """Test loading routes from CSV and YAML files."""
+    csv_file = tmp_path / "routes.csv"
+    csv_file.write_text('Home to work,"52.377956, 4.897071","Dam 1, Amsterdam",\n\nSingle,zone.home\n', encoding="utf-8")
+    yaml_file = tmp_path / "routes.yaml"
+    yaml_file.write_text("- name: Home to work\n  locations:\n    - zone.home\n    - Dam 1, Amsterdam\n", encoding="utf-8")
+
+    assert load_routes_file(csv_file) == [
+        {"name": "Home to work", "locations": ["52.377956, 4.897071", "Dam 1, Amsterdam"]},
+        {"name": "Single", "locations": ["zone.home"]},
+    ]
+    assert load_routes_file(yaml_file) == [{"name": "Home to work", "locations": ["zone.home", "Dam 1, Amsterdam"]}]
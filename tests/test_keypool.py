@@ -0,0 +1,157 @@
+"""Test API key pool."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import ClientResponseError
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.tomtom_travel_time.const import CONF_DAILY_QUOTA, CONF_KEY_POOL, KEY_POOL_COOLDOWN
+from custom_components.tomtom_travel_time.keypool import async_call_with_key, async_get_key_pool
+from tomtom_apis import TomTomAPIClientError
+
+from . import get_mock_config_entry
+
+
+def add_loaded_entry(hass: HomeAssistant, api_key: str, *, shared: bool = True, daily_quota: int = 2500) -> MockConfigEntry:
+    """Add a loaded config entry with the given API key."""
+    config_entry = get_mock_config_entry(api_key, data={CONF_API_KEY: api_key}, options={CONF_KEY_POOL: shared, CONF_DAILY_QUOTA: daily_quota})
+    config_entry.add_to_hass(hass)
+    config_entry.mock_state(hass, ConfigEntryState.LOADED)
+    return config_entry
+
+
+def client_error(status: int) -> TomTomAPIClientError:
+    """Return a client error like the TomTom client raises it for the given status."""
+    exception = TomTomAPIClientError("Client error")
+    exception.__cause__ = ClientResponseError(MagicMock(), (), status=status)
+    return exception
+
+
+async def test_unshared_key(hass: HomeAssistant) -> None:
+    """Test that a key that isn't shared is only used by itself."""
+    add_loaded_entry(hass, "key_aaaa")
+    add_loaded_entry(hass, "key_bbbb", shared=False)
+    call = AsyncMock(return_value="result")
+
+    for _ in range(3):
+        assert await async_call_with_key(hass, "key_bbbb", "test", call) == "result"
+
+    assert [args.args[0] for args in call.await_args_list] == ["key_bbbb"] * 3
+    usage = async_get_key_pool(hass).as_dict()
+    assert usage["...bbbb"]["requests"] == 3
+    assert usage["...bbbb"]["shared"] is False
+
+
+async def test_weighted_round_robin(hass: HomeAssistant) -> None:
+    """Test that requests are spread over the shared keys by remaining quota."""
+    add_loaded_entry(hass, "key_aaaa", daily_quota=300)
+    add_loaded_entry(hass, "key_bbbb", daily_quota=100)
+    call = AsyncMock()
+
+    for _ in range(8):
+        await async_call_with_key(hass, "key_bbbb", "test", call)
+
+    keys = [args.args[0] for args in call.await_args_list]
+    assert keys.count("key_aaaa") == 6
+    assert keys.count("key_bbbb") == 2
+    # Smooth round-robin interleaves the keys instead of exhausting one first.
+    assert "key_bbbb" in keys[:4]
+
+
+async def test_quotas_follow_entries(hass: HomeAssistant) -> None:
+    """Test that the quotas are collected once, and again when an entry is unloaded."""
+    add_loaded_entry(hass, "key_aaaa")
+    config_entry = add_loaded_entry(hass, "key_bbbb")
+    call = AsyncMock()
+
+    with patch.object(hass.config_entries, "async_loaded_entries", wraps=hass.config_entries.async_loaded_entries) as mock_loaded_entries:
+        for _ in range(4):
+            await async_call_with_key(hass, "key_aaaa", "test", call)
+        assert mock_loaded_entries.call_count == 1
+        assert {args.args[0] for args in call.await_args_list} == {"key_aaaa", "key_bbbb"}
+
+        config_entry.mock_state(hass, ConfigEntryState.NOT_LOADED)
+        call.reset_mock()
+        for _ in range(4):
+            await async_call_with_key(hass, "key_aaaa", "test", call)
+        assert mock_loaded_entries.call_count == 2
+        assert {args.args[0] for args in call.await_args_list} == {"key_aaaa"}
+
+
+async def test_failover(hass: HomeAssistant) -> None:
+    """Test that a rejected key is skipped and the request is retried with the next key."""
+    add_loaded_entry(hass, "key_aaaa", daily_quota=300)
+    add_loaded_entry(hass, "key_bbbb", daily_quota=100)
+
+    async def call(key: str) -> str:
+        if key == "key_aaaa":
+            raise client_error(403)
+        return key
+
+    assert await async_call_with_key(hass, "key_aaaa", "test", call) == "key_bbbb"
+    assert await async_call_with_key(hass, "key_aaaa", "test", call) == "key_bbbb"
+
+    usage = async_get_key_pool(hass).as_dict()
+    assert usage["...aaaa"]["requests"] == 1
+    assert usage["...aaaa"]["failures"] == 1
+    assert usage["...aaaa"]["cooldown_until"] is not None
+    assert usage["...bbbb"]["requests"] == 2
+
+
+@pytest.mark.parametrize("status", [400, 404])
+async def test_no_failover_on_request_error(hass: HomeAssistant, status: int) -> None:
+    """Test that client errors that aren't caused by the key are raised without trying other keys."""
+    add_loaded_entry(hass, "key_aaaa")
+    add_loaded_entry(hass, "key_bbbb")
+    call = AsyncMock(side_effect=client_error(status))
+
+    with pytest.raises(TomTomAPIClientError):
+        await async_call_with_key(hass, "key_aaaa", "test", call)
+
+    call.assert_awaited_once()
+
+
+async def test_all_keys_rejected(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Test that the error is raised when all keys are rejected, and that keys are used again after the cooldown."""
+    add_loaded_entry(hass, "key_aaaa")
+    add_loaded_entry(hass, "key_bbbb")
+    call = AsyncMock(side_effect=client_error(429))
+
+    with pytest.raises(TomTomAPIClientError):
+        await async_call_with_key(hass, "key_aaaa", "test", call)
+    assert call.await_count == 2
+
+    # While all keys cool down, the key of the caller is still tried once.
+    call.reset_mock()
+    with pytest.raises(TomTomAPIClientError):
+        await async_call_with_key(hass, "key_aaaa", "test", call)
+    assert [args.args[0] for args in call.await_args_list] == ["key_aaaa"]
+
+    freezer.tick(timedelta(seconds=KEY_POOL_COOLDOWN + 1))
+    call.reset_mock(side_effect=True)
+    for _ in range(4):
+        await async_call_with_key(hass, "key_aaaa", "test", call)
+    assert {args.args[0] for args in call.await_args_list} == {"key_aaaa", "key_bbbb"}
+
+
+async def test_daily_reset(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Test that the usage is reset on a new day."""
+    freezer.move_to("2026-01-01 12:00:00+00:00")
+    add_loaded_entry(hass, "key_aaaa", daily_quota=2)
+    call = AsyncMock()
+
+    await async_call_with_key(hass, "key_aaaa", "test", call)
+    await async_call_with_key(hass, "key_aaaa", "test", call)
+    assert async_get_key_pool(hass).as_dict()["...aaaa"]["remaining"] == 0
+
+    freezer.move_to("2026-01-02 00:00:01+00:00")
+    await async_call_with_key(hass, "key_aaaa", "test", call)
+    usage = async_get_key_pool(hass).as_dict()["...aaaa"]
+    assert usage["day"] == "2026-01-02"
+    assert usage["remaining"] == 1
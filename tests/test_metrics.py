@@ -0,0 +1,78 @@
+"""Test the metrics."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.tomtom_travel_time.cache import async_get_cache
+from custom_components.tomtom_travel_time.coordinator import DATA_ORIGIN_CACHE
+from custom_components.tomtom_travel_time.keypool import async_call_with_key
+from custom_components.tomtom_travel_time.metrics import Histogram, MetricsRegistry, async_get_metrics
+from tomtom_apis import TomTomAPIServerError
+
+
+def test_histogram() -> None:
+    """Test that values are counted in the first bucket with an upper bound of at least the value, and reported cumulatively."""
+    histogram = Histogram((0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.cumulative() == [2, 3, 4]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(3.65)
+
+
+def test_prometheus_text() -> None:
+    """Test the counters, histograms and caches in the Prometheus text format."""
+    metrics = MetricsRegistry()
+    metrics.record_request("calculate_route", 0.2)
+    metrics.record_request("calculate_route", 20, TomTomAPIServerError("Server error"))
+
+    text = metrics.as_prometheus()
+
+    assert text.endswith("\n")
+    lines = text.splitlines()
+    assert "# TYPE tomtom_travel_time_requests_total counter" in lines
+    assert 'tomtom_travel_time_requests_total{endpoint="calculate_route"} 2' in lines
+    assert 'tomtom_travel_time_request_errors_total{exception="TomTomAPIServerError"} 1' in lines
+    assert "# TYPE tomtom_travel_time_request_duration_seconds histogram" in lines
+    assert 'tomtom_travel_time_request_duration_seconds_bucket{endpoint="calculate_route",le="0.1"} 0' in lines
+    assert 'tomtom_travel_time_request_duration_seconds_bucket{endpoint="calculate_route",le="0.25"} 1' in lines
+    assert 'tomtom_travel_time_request_duration_seconds_bucket{endpoint="calculate_route",le="+Inf"} 2' in lines
+    assert 'tomtom_travel_time_request_duration_seconds_count{endpoint="calculate_route"} 2' in lines
+
+
+async def test_cache_metrics(hass: HomeAssistant) -> None:
+    """Test that caches are reported by name, with their hits, misses and size."""
+    cache = async_get_cache(hass, DATA_ORIGIN_CACHE, 60, 10)
+    assert async_get_cache(hass, DATA_ORIGIN_CACHE, 60, 10) is cache
+
+    cache.get("key")
+    cache.set("key", None)  # type: ignore[arg-type]
+    cache.get("key")
+    cache.get("key")
+
+    metrics = async_get_metrics(hass)
+    assert metrics.as_dict()["caches"] == {"origin_cache": {"size": 1, "hits": 2, "misses": 1, "hit_ratio": 0.6667}}
+    assert 'tomtom_travel_time_cache_hits_total{cache="origin_cache"} 2' in metrics.as_prometheus().splitlines()
+
+
+async def test_requests_with_key(hass: HomeAssistant) -> None:
+    """Test that requests through the key pool are counted per endpoint, with failed requests by exception type."""
+    call = AsyncMock(return_value="result")
+    failing_call = AsyncMock(side_effect=TomTomAPIServerError("Server error"))
+
+    with patch("custom_components.tomtom_travel_time.metrics.time.perf_counter", side_effect=[10.0, 10.5, 20.0, 21.0, 30.0, 40.0]):
+        await async_call_with_key(hass, "key_aaaa", "geocode", call)
+        await async_call_with_key(hass, "key_aaaa", "geocode", call)
+        with pytest.raises(TomTomAPIServerError):
+            await async_call_with_key(hass, "key_aaaa", "search", failing_call)
+
+    summary = async_get_metrics(hass).as_dict()
+    assert summary["requests"] == {"geocode": 2, "search": 1}
+    assert summary["errors"] == {"TomTomAPIServerError": 1}
+    assert summary["error_rate"] == 0.3333
+    assert summary["mean_duration"] == {"geocode": 0.75, "search": 10.0}
@@ -0,0 +1,110 @@
+"""Test calendar prefetch."""
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JsonValueType
+
+from custom_components.tomtom_travel_time.model import TomTomTravelTimeData, UpcomingEvent, UserInputLatLan
+from custom_components.tomtom_travel_time.prefetch import CalendarPrefetch
+from tomtom_apis import TomTomAPIServerError
+from tomtom_apis.models import LatLon
+
+NOW = datetime(2025, 5, 15, 8, 0, tzinfo=dt_util.UTC)
+CALENDAR = "calendar.work"
+DATA = TomTomTravelTimeData(duration=30, distance=25.0, delay=5)
+
+
+def register_calendar(hass: HomeAssistant, events: list[JsonValueType]) -> None:
+    """Register a fake calendar get_events service that returns the given events."""
+
+    async def get_events(call: ServiceCall) -> ServiceResponse:
+        return {call.data["entity_id"]: {"events": events}}
+
+    hass.services.async_register("calendar", "get_events", get_events, supports_response=SupportsResponse.ONLY)
+
+
+def event_at(start: datetime, location: str = "Coolsingel 40, Rotterdam") -> UpcomingEvent:
+    """Return an event for the given start."""
+    return UpcomingEvent(summary="Meeting", start=start, location=location)
+
+
+async def test_async_update_next_event(hass: HomeAssistant) -> None:
+    """Test that the first upcoming timed event with a location is selected."""
+    register_calendar(
+        hass,
+        [
+            {"summary": "All day", "start": "2025-05-15", "location": "Somewhere"},
+            {"summary": "Past", "start": "2025-05-15T07:00:00+00:00", "location": "Somewhere"},
+            {"summary": "No location", "start": "2025-05-15T08:30:00+00:00", "location": ""},
+            {"summary": "Later", "start": "2025-05-15T12:00:00+00:00", "location": "Later place"},
+            {"summary": "Next", "start": "2025-05-15T10:00:00+00:00", "location": "Next place"},
+        ],
+    )
+    prefetch = CalendarPrefetch(hass, CALENDAR, "dummy")
+
+    await prefetch.async_update(NOW)
+
+    assert prefetch.event == UpcomingEvent(summary="Next", start=datetime(2025, 5, 15, 10, 0, tzinfo=dt_util.UTC), location="Next place")
+    assert prefetch.departure(DATA) == datetime(2025, 5, 15, 9, 30, tzinfo=dt_util.UTC)
+
+
+async def test_async_update_unavailable(hass: HomeAssistant) -> None:
+    """Test that regular updates are used when the calendar cannot be read."""
+    prefetch = CalendarPrefetch(hass, CALENDAR, "dummy")
+
+    await prefetch.async_update(NOW)
+
+    assert prefetch.event is None
+    assert prefetch.should_refresh(NOW, DATA)
+    assert prefetch.next_interval(NOW, DATA) == timedelta(minutes=5)
+
+
+@pytest.mark.parametrize(
+    ("event", "should_refresh", "interval"),
+    [
+        (None, False, timedelta(minutes=30)),
+        (event_at(NOW + timedelta(hours=5)), False, timedelta(minutes=30)),
+        (event_at(NOW + timedelta(minutes=100)), False, timedelta(minutes=10)),
+        (event_at(NOW + timedelta(minutes=90)), True, timedelta(minutes=5)),
+        (event_at(NOW + timedelta(minutes=50)), True, timedelta(minutes=5)),
+        (event_at(NOW + timedelta(minutes=42)), True, timedelta(minutes=3)),
+        (event_at(NOW + timedelta(minutes=32)), True, timedelta(minutes=1)),
+        (event_at(NOW + timedelta(minutes=10)), True, timedelta(minutes=1)),
+    ],
+)
+async def test_refresh_schedule(hass: HomeAssistant, event: UpcomingEvent | None, *, should_refresh: bool, interval: timedelta) -> None:
+    """Test that refreshes happen more often as the departure gets closer."""
+    register_calendar(hass, [])
+    prefetch = CalendarPrefetch(hass, CALENDAR, "dummy")
+    await prefetch.async_update(NOW)
+    prefetch.event = event
+
+    assert prefetch.should_refresh(NOW, DATA) is should_refresh
+    assert prefetch.should_refresh(NOW, None)
+    assert prefetch.next_interval(NOW, DATA) == interval
+
+
+@pytest.mark.parametrize(
+    ("side_effect", "expected"),
+    [
+        (lambda *_: UserInputLatLan(location=LatLon(lat=51.92, lon=4.47), geocoded=True), LatLon(lat=51.92, lon=4.47)),
+        (lambda *_: None, None),
+        (TomTomAPIServerError, None),
+    ],
+)
+async def test_async_destination(hass: HomeAssistant, side_effect: Callable | type[Exception], expected: LatLon | None) -> None:
+    """Test that event locations are resolved once."""
+    prefetch = CalendarPrefetch(hass, CALENDAR, "dummy")
+    assert await prefetch.async_destination() is None
+
+    prefetch.event = event_at(NOW)
+    with patch("custom_components.tomtom_travel_time.prefetch.lat_lon_from_user_input", AsyncMock(side_effect=side_effect)) as mock_lat_lon:
+        assert await prefetch.async_destination() == expected
+        assert await prefetch.async_destination() == expected
+
+    assert mock_lat_lon.await_count == (2 if side_effect is TomTomAPIServerError else 1)
@@ -0,0 +1,82 @@
+"""Test the refresh profiler."""
+
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from pytest_homeassistant_custom_component.components.diagnostics import get_diagnostics_for_config_entry
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from custom_components.tomtom_travel_time.const import ATTR_REFRESHES, DOMAIN, PROFILE_TIMEOUT, SERVICE_PROFILE
+from custom_components.tomtom_travel_time.profiler import DATA_PROFILE_SUMMARY, DATA_PROFILER
+
+from . import setup_integration, unload_integration
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_profile(hass: HomeAssistant, hass_client: ClientSessionGenerator, tmp_path: Path) -> None:
+    """Test profiling refreshes, the profile file and the summary in the diagnostics."""
+    hass.config.config_dir = str(tmp_path)
+    config_entry = await setup_integration(hass)
+    coordinator = config_entry.runtime_data
+
+    await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {ATTR_REFRESHES: 2}, blocking=True)
+    assert DATA_PROFILER in hass.data
+
+    # Only one profile at a time.
+    with pytest.raises(ServiceValidationError) as exception:
+        await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {ATTR_REFRESHES: 2}, blocking=True)
+    assert exception.value.translation_key == "profile_running"
+
+    await coordinator.async_refresh()
+    assert DATA_PROFILER in hass.data
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert DATA_PROFILER not in hass.data
+    summary = hass.data[DATA_PROFILE_SUMMARY]
+    assert Path(summary["file"]).parent == tmp_path
+    files = await hass.async_add_executor_job(lambda: [str(path) for path in tmp_path.glob("*.prof")])
+    assert summary["file"] in files
+    assert summary["refreshes"] == 2
+    assert any("_async_update_data" in function["function"] for function in summary["functions"])
+
+    result = await get_diagnostics_for_config_entry(hass, hass_client, config_entry)
+    assert result["profile"]["refreshes"] == 2
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_profile_timeout(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test that profiling stops when the refreshes take too long."""
+    hass.config.config_dir = str(tmp_path)
+    config_entry = await setup_integration(hass)
+
+    await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {ATTR_REFRESHES: 1000}, blocking=True)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=PROFILE_TIMEOUT + 1))
+    await hass.async_block_till_done()
+
+    assert DATA_PROFILER not in hass.data
+    assert hass.data[DATA_PROFILE_SUMMARY]["refreshes"] < 1000
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_profile_other_profiler(hass: HomeAssistant) -> None:
+    """Test that profiling can't start when another profiler is active."""
+    await setup_integration(hass)
+
+    with (
+        patch("cProfile.Profile.enable", side_effect=ValueError("Another profiling tool is already active")),
+        pytest.raises(HomeAssistantError) as exception,
+    ):
+        await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {}, blocking=True)
+
+    assert exception.value.translation_key == "cannot_start_profiler"
+    assert DATA_PROFILER not in hass.data
@@ -0,0 +1,94 @@
+"""Test the record and replay of TomTom responses."""
+
+import gzip
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.common import load_fixture
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.tomtom_travel_time.replay import (
+    DATA_TOMTOM_SESSION,
+    ENV_RECORD,
+    ENV_REPLAY,
+    ReplaySession,
+    append_archive,
+    async_get_tomtom_session,
+    request_key,
+)
+from tomtom_apis import ApiOptions, TomTomAPIClientError
+from tomtom_apis.models import LatLon, LatLonList
+from tomtom_apis.routing import RoutingApi
+from tomtom_apis.routing.models import CalculateRouteParams
+
+LOCATIONS = LatLonList(locations=[LatLon(lat=52.377956, lon=4.897071), LatLon(lat=51.926517, lon=4.462456)])
+ROUTE_URL = "https://api.tomtom.com/routing/1/calculateRoute/52.377956,4.897071:51.926517,4.462456/json"
+
+
+def replayed(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch, path: Path) -> RoutingApi:
+    """Return a Routing API client that replays the archive."""
+    hass.data.pop(DATA_TOMTOM_SESSION, None)
+    monkeypatch.delenv(ENV_RECORD, raising=False)
+    monkeypatch.setenv(ENV_REPLAY, str(path))
+    return RoutingApi(ApiOptions(api_key="secret_key"), async_get_tomtom_session(hass))
+
+
+async def test_session(hass: HomeAssistant) -> None:
+    """Test that the session of Home Assistant is used when neither recording nor replaying."""
+    assert async_get_tomtom_session(hass) is async_get_clientsession(hass)
+
+
+async def test_record_and_replay(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Test that a recorded route is replayed without a request, and the API key isn't recorded."""
+    path = tmp_path / "tomtom.jsonl.gz"
+    aioclient_mock.get(re.compile("calculateRoute"), text=load_fixture("response.json"), headers={"Content-Type": "application/json"})
+    monkeypatch.setenv(ENV_RECORD, str(path))
+    routing_api = RoutingApi(ApiOptions(api_key="secret_key"), async_get_tomtom_session(hass))
+
+    recorded = await routing_api.get_calculate_route(locations=LOCATIONS, params=CalculateRouteParams(maxAlternatives=0))
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        archive = file.read()
+    assert "secret_key" not in archive
+
+    routing_api = replayed(hass, monkeypatch, path)
+    response = await routing_api.get_calculate_route(locations=LOCATIONS, params=CalculateRouteParams(maxAlternatives=0))
+
+    assert response == recorded
+    assert response.routes[0].summary.travelTimeInSeconds == 301
+    assert aioclient_mock.call_count == 1
+
+
+async def test_replay_not_recorded(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test that a request that wasn't recorded fails like an unknown route."""
+    path = tmp_path / "tomtom.jsonl.gz"
+    append_archive(path, {"request": "GET /other", "status": 200, "content_type": "application/json", "seconds": 0.1, "body": "{}"})
+    routing_api = replayed(hass, monkeypatch, path)
+
+    with pytest.raises(TomTomAPIClientError):
+        await routing_api.get_calculate_route(locations=LOCATIONS, params=CalculateRouteParams(maxAlternatives=0))
+
+
+@pytest.mark.parametrize(("latency", "sleep"), [(None, None), ("recorded", 0.25), ("0.1", 0.1)])
+async def test_replay_in_turn(hass: HomeAssistant, tmp_path: Path, latency: str | None, sleep: float | None) -> None:
+    """Test that the responses of a request are served in turn, with the recorded or a fixed latency."""
+    path = tmp_path / "tomtom.jsonl.gz"
+    key = request_key("GET", ROUTE_URL, {"key": "secret_key", "departAt": "now", "maxAlternatives": "0"}, None)
+    for body in ("first", "second"):
+        append_archive(path, {"request": key, "status": 200, "content_type": "application/json", "seconds": 0.25, "body": body})
+    session = ReplaySession(hass, path, latency)
+
+    with patch("custom_components.tomtom_travel_time.replay.asyncio.sleep") as mock_sleep:
+        responses = [await session.request("GET", ROUTE_URL, params={"key": "other_key", "maxAlternatives": "0"}) for _ in range(3)]
+
+    assert [await response.text() for response in responses] == ["first", "second", "first"]
+    assert [call.args[0] for call in mock_sleep.await_args_list] == ([sleep] * 3 if sleep else [])
@@ -0,0 +1,328 @@
+"""Scale and soak test, many entries refreshing against a local fake of TomTom.
+
+The number of entries and the simulated duration can be raised with the TOMTOM_SCALE_ENTRIES and TOMTOM_SCALE_HOURS environment
+variables, for example to run 500 entries for a simulated day before a release. The entry counts of the setup time test are set with
+TOMTOM_SCALE_SETUP_ENTRIES, a comma separated list. Tests that assert on wall-clock time are marked slow, and only run with -m slow.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+from datetime import timedelta
+from functools import partial
+from unittest.mock import patch
+from urllib.parse import unquote
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_API_KEY, CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed, load_fixture
+
+from custom_components.tomtom_travel_time.const import CONF_LOCATIONS, DEFAULT_OPTIONS, DEFAULT_SCAN_INTERVAL, DOMAIN
+from tomtom_apis import ApiOptions
+
+_LOGGER = logging.getLogger(__name__)
+
+ENTRIES = int(os.environ.get("TOMTOM_SCALE_ENTRIES", "100"))
+HOURS = float(os.environ.get("TOMTOM_SCALE_HOURS", "2"))
+SETUP_ENTRIES = tuple(int(count) for count in os.environ.get("TOMTOM_SCALE_SETUP_ENTRIES", "10,100,1000").split(","))
+# Every tenth entry has an address as destination, which is geocoded on every refresh.
+ADDRESS_EVERY = 10
+
+BUDGET_ENTRIES = 50
+# Memory per entry for everything, including the entities and registries of Home Assistant, and for what the integration itself retains.
+MAX_MEMORY_PER_ENTRY = 128 * 1024
+MAX_INTEGRATION_MEMORY_PER_ENTRY = 6 * 1024
+# Memory allocated by a line in one of these files is attributed to the integration.
+INTEGRATION_FILES = "*/custom_components/tomtom_travel_time/*"
+INTEGRATION_LOGGER = "custom_components.tomtom_travel_time"
+MAX_LOOP_LAG_P99 = 0.25
+MAX_TIMERS_PER_ENTRY = 4
+# Setup time per entry of the most entries, compared to the lowest setup time per entry. Setup that is quadratic in the number of entries
+# grows with the number of entries instead.
+MAX_SETUP_GROWTH = 3
+
+
+@dataclass
+class ScaleReport:
+    """Outcome of a scale run."""
+
+    entries: int
+    setup_seconds: float
+    memory_per_entry: float
+    integration_memory_per_entry: float
+    timers: int
+    requests: dict[str, int]
+    loop_lag: list[float] = field(default_factory=list)
+
+    def percentile(self, percentile: int) -> float:
+        """Return a loop lag percentile in seconds."""
+        if len(self.loop_lag) < 2:
+            return max(self.loop_lag, default=0.0)
+        return statistics.quantiles(self.loop_lag, n=100)[percentile - 1]
+
+    def summary(self) -> str:
+        """Return a one line summary."""
+        return (
+            f"{self.entries} entries, setup {self.setup_seconds:.2f}s, {self.memory_per_entry / 1024:.1f} KiB per entry "
+            f"of which {self.integration_memory_per_entry / 1024:.1f} KiB retained by the integration, {self.timers} timers, "
+            f"loop lag p50 {self.percentile(50) * 1000:.1f}ms p99 {self.percentile(99) * 1000:.1f}ms, requests {dict(self.requests)}"
+        )
+
+
+class FakeTomTom:
+    """Local fake of the TomTom Routing and Geocoding APIs, with the route fixture for every route and a position derived from the query."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.requests: Counter[str] = Counter()
+        self._route = load_fixture("response.json")
+        app = web.Application()
+        app.router.add_get("/routing/1/calculateRoute/{locations}/json", self._calculate_route)
+        app.router.add_get("/search/2/geocode/{query}.json", self._geocode)
+        self.server = TestServer(app)
+
+    @property
+    def base_url(self) -> str:
+        """Return the base URL of the server, to use instead of the TomTom API."""
+        return str(self.server.make_url(""))
+
+    async def start(self) -> None:
+        """Start the server."""
+        await self.server.start_server()
+
+    async def close(self) -> None:
+        """Stop the server."""
+        await self.server.close()
+
+    async def _calculate_route(self, _: web.Request) -> web.Response:
+        """Return the route fixture."""
+        self.requests["calculate_route"] += 1
+        return web.Response(text=self._route, content_type="application/json")
+
+    async def _geocode(self, request: web.Request) -> web.Response:
+        """Return a single result with a stable position for the query."""
+        self.requests["geocode"] += 1
+        query = unquote(request.match_info["query"])
+        offset = sum(map(ord, query)) % 1000 / 10000
+        result = {
+            "type": "Point Address",
+            "id": query,
+            "score": 1.0,
+            "address": {"freeformAddress": query},
+            "position": {"lat": 52 + offset, "lon": 4 + offset},
+        }
+        summary = {"query": query, "queryType": "NON_NEAR", "queryTime": 1, "numResults": 1, "offset": 0, "totalResults": 1, "fuzzyLevel": 1}
+        return web.Response(text=json.dumps({"summary": summary, "results": [result]}), content_type="application/json")
+
+
+class LoopLagMonitor:
+    """Measures how long the event loop is blocked, by yielding to the loop continuously and timing the gaps between resumes."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.samples: list[float] = []
+        self._previous = time.perf_counter()
+        self._task: asyncio.Task[None] | None = None
+
+    async def _run(self) -> None:
+        """Yield to the loop and record the time it took to get back."""
+        self.skip()
+        while True:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            self.samples.append(now - self._previous)
+            self._previous = now
+
+    def skip(self) -> None:
+        """Don't count the time until now, for work of the test itself, like firing the timers."""
+        self._previous = time.perf_counter()
+
+    def start(self) -> None:
+        """Start measuring, the task isn't tracked by Home Assistant so waiting for it to be done doesn't wait for the monitor."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop measuring."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+@pytest.fixture(name="mock_routing_api")
+def fixture_mock_routing_api() -> None:
+    """Use the real Routing API client against the fake."""
+
+
+@pytest.fixture(name="mock_geocoding_api")
+def fixture_mock_geocoding_api() -> None:
+    """Use the real Geocoding API client against the fake."""
+
+
+@pytest.fixture(name="fake_tomtom")
+async def fixture_fake_tomtom(socket_enabled: None) -> AsyncGenerator[FakeTomTom]:  # pylint: disable=unused-argument # noqa: ARG001
+    """Start the fake TomTom and point the API clients at it."""
+    fake = FakeTomTom()
+    await fake.start()
+    api_options = partial(ApiOptions, base_url=fake.base_url)
+
+    with (
+        patch("custom_components.tomtom_travel_time.coordinator.ApiOptions", api_options),
+        patch("custom_components.tomtom_travel_time.helpers.ApiOptions", api_options),
+    ):
+        yield fake
+
+    await fake.close()
+
+
+def create_entries(hass: HomeAssistant, count: int) -> list[MockConfigEntry]:
+    """Add entries with routes that are distinct after rounding, so they don't share a coordinator or cached routes."""
+    entries: list[MockConfigEntry] = []
+    for index in range(count):
+        offset = index / 1000
+        destination = f"Street {index}, Amsterdam" if index % ADDRESS_EVERY == 0 else f"{51.9 - offset:.4f}, {4.4 - offset:.4f}"
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            entry_id=f"scale_{index}",
+            title=f"Route {index}",
+            data={
+                CONF_NAME: f"Route {index}",
+                CONF_API_KEY: "scale_api_key",
+                CONF_LOCATIONS: [f"{52.3 + offset:.4f}, {4.8 + offset:.4f}", destination],
+            },
+            options=DEFAULT_OPTIONS,
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+
+    return entries
+
+
+def refreshes(hours: float) -> int:
+    """Return the number of refreshes per entry, including the first refresh on setup."""
+    return int(timedelta(hours=hours) / timedelta(seconds=DEFAULT_SCAN_INTERVAL)) + 1
+
+
+def integration_memory(snapshot: tracemalloc.Snapshot) -> int:
+    """Return the memory still allocated by code of the integration, like coordinators, models and cached locations."""
+    traces = snapshot.filter_traces([tracemalloc.Filter(inclusive=True, filename_pattern=INTEGRATION_FILES)])
+    return sum(statistic.size for statistic in traces.statistics("filename"))
+
+
+async def run_scale(hass: HomeAssistant, fake: FakeTomTom, entries: int, hours: float, *, trace_refreshes: bool = False) -> ScaleReport:
+    """Set up the entries, then simulate hours of refreshes, and report the cost.
+
+    Memory is traced during setup. Tracing the refreshes too shows what is retained after them, but slows down the event loop.
+    """
+    retained = 0
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        config_entries = create_entries(hass, entries)
+
+        start = time.perf_counter()
+        assert await hass.config_entries.async_setup(config_entries[0].entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        setup_seconds = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0] - baseline
+
+        if not trace_refreshes:
+            retained = integration_memory(tracemalloc.take_snapshot())
+            tracemalloc.stop()
+
+        assert all(entry.state is ConfigEntryState.LOADED for entry in config_entries)
+
+        monitor = LoopLagMonitor()
+        monitor.start()
+        now = dt_util.utcnow()
+        interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+        for tick in range(1, refreshes(hours)):
+            async_fire_time_changed(hass, now + tick * interval + timedelta(seconds=1))
+            monitor.skip()
+            # Refreshes of coordinators that aren't bound to an entry run as background tasks.
+            await hass.async_block_till_done(wait_background_tasks=True)
+        await monitor.stop()
+
+        if trace_refreshes:
+            retained = integration_memory(tracemalloc.take_snapshot())
+    finally:
+        tracemalloc.stop()
+
+    return ScaleReport(
+        entries=entries,
+        setup_seconds=setup_seconds,
+        memory_per_entry=memory / entries,
+        integration_memory_per_entry=retained / entries,
+        timers=len(hass.loop._scheduled),  # type: ignore[attr-defined] # pylint: disable=protected-access # noqa: SLF001
+        requests=dict(fake.requests),
+        loop_lag=monitor.samples,
+    )
+
+
+async def setup_seconds_per_entry(hass: HomeAssistant, entries: int) -> float:
+    """Set up the entries and return the setup time per entry, the entries are removed again afterwards."""
+    config_entries = create_entries(hass, entries)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(hass.config_entries.async_setup(entry.entry_id) for entry in config_entries))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    seconds = time.perf_counter() - start
+
+    assert all(entry.state is ConfigEntryState.LOADED for entry in config_entries)
+    for entry in config_entries:
+        await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+    return seconds / entries
+
+
+@pytest.mark.slow
+async def test_scale(hass: HomeAssistant, fake_tomtom: FakeTomTom) -> None:
+    """Test that many entries stay within the memory, timer, loop lag and request budgets."""
+    report = await run_scale(hass, fake_tomtom, ENTRIES, HOURS)
+    _LOGGER.info("Scale report: %s", report.summary())
+
+    addresses = len(range(0, ENTRIES, ADDRESS_EVERY))
+
+    assert report.requests["calculate_route"] == ENTRIES * refreshes(HOURS)
+    assert report.requests["geocode"] == addresses * refreshes(HOURS)
+    assert report.memory_per_entry < MAX_MEMORY_PER_ENTRY
+    assert report.timers < ENTRIES * MAX_TIMERS_PER_ENTRY
+    assert report.percentile(99) < MAX_LOOP_LAG_P99
+
+
+async def test_memory_budget(hass: HomeAssistant, fake_tomtom: FakeTomTom, caplog: LogCaptureFixture) -> None:
+    """Test that the integration doesn't retain more memory per entry than its budget, also after an hour of refreshes."""
+    # Captured debug records keep their arguments, like the locations of every request, which isn't memory of the integration.
+    caplog.set_level(logging.INFO, logger=INTEGRATION_LOGGER)
+    report = await run_scale(hass, fake_tomtom, BUDGET_ENTRIES, 1, trace_refreshes=True)
+    _LOGGER.info("Memory budget report: %s", report.summary())
+
+    assert report.requests["calculate_route"] == BUDGET_ENTRIES * refreshes(1)
+    assert report.memory_per_entry < MAX_MEMORY_PER_ENTRY
+    assert report.integration_memory_per_entry < MAX_INTEGRATION_MEMORY_PER_ENTRY
+
+
+@pytest.mark.slow
+@pytest.mark.usefixtures("fake_tomtom")
+async def test_setup_time(hass: HomeAssistant) -> None:
+    """Test that the setup time per entry stays about the same from few to many entries, so setup doesn't grow quadratically."""
+    assert await async_setup_component(hass, DOMAIN, {})
+
+    per_entry = {entries: await setup_seconds_per_entry(hass, entries) for entries in SETUP_ENTRIES}
+    _LOGGER.info("Setup time per entry: %s", {entries: f"{seconds * 1000:.1f}ms" for entries, seconds in per_entry.items()})
+
+    assert per_entry[max(SETUP_ENTRIES)] < MAX_SETUP_GROWTH * min(per_entry.values())
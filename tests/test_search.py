@@ -0,0 +1,71 @@
+"""Test location search."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.tomtom_travel_time.cache import TTLCache
+from custom_components.tomtom_travel_time.model import SearchCandidate
+from custom_components.tomtom_travel_time.search import DATA_SEARCH_CACHE, async_search_locations, candidate_matches, search_terms
+from tomtom_apis.models import LatLon
+
+CANDIDATE = SearchCandidate(label="Rotterdam Centraal, Stationsplein 1, 3013 AJ Rotterdam", location=LatLon(lat=51.9244, lon=4.4689))
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("rott", True),
+        ("rotterdam cent", True),
+        ("stationsplein, rotterdam", True),
+        ("centraal amsterdam", False),
+        ("terdam", False),
+    ],
+)
+def test_candidate_matches(query: str, expected: bool) -> None:  # noqa: FBT001
+    """Test that every word of the query has to start a word of the label."""
+    assert candidate_matches(CANDIDATE, search_terms(query)) is expected
+
+
+async def test_search_locations(hass: HomeAssistant, mock_search: AsyncMock) -> None:
+    """Test that locations are searched biased towards home, and labeled with the name of a point of interest."""
+    candidates = await async_search_locations(hass, "dummy_api", "  Rotterdam ")
+
+    assert candidates == (CANDIDATE,)
+    mock_search.assert_awaited_once()
+    kwargs = mock_search.await_args_list[0].kwargs
+    assert kwargs["query"] == "rotterdam"
+    params = kwargs["params"]
+    assert params.typeahead
+    assert (params.lat, params.lon) == (hass.config.latitude, hass.config.longitude)
+
+
+async def test_search_locations_too_short(hass: HomeAssistant, mock_search: AsyncMock) -> None:
+    """Test that short queries aren't searched."""
+    assert await async_search_locations(hass, "dummy_api", "da") == ()
+    mock_search.assert_not_awaited()
+
+
+async def test_search_locations_prefix_cache(hass: HomeAssistant, mock_search: AsyncMock) -> None:
+    """Test that a query that extends a cached query is answered from the cache."""
+    assert len(await async_search_locations(hass, "dummy_api", "Dam")) == 2
+    assert [candidate.label for candidate in await async_search_locations(hass, "dummy_api", "Damr")] == ["Damrak 1, 1012 LG Amsterdam"]
+    assert len(await async_search_locations(hass, "dummy_api", "DAM")) == 2
+    mock_search.assert_awaited_once()
+
+    # Nothing in the cached results matches, so TomTom is searched.
+    assert await async_search_locations(hass, "dummy_api", "Damstraat") == ()
+    assert mock_search.await_count == 2
+
+
+async def test_search_locations_prefix_cache_cut_off(hass: HomeAssistant, mock_search: AsyncMock) -> None:
+    """Test that cached results that were cut off at the limit aren't reused for longer queries."""
+    hass.data[DATA_SEARCH_CACHE] = cache = TTLCache[str, tuple[SearchCandidate, ...]](60)
+    cache.set("dam", (CANDIDATE,) * 8)
+
+    assert len(await async_search_locations(hass, "dummy_api", "dam")) == 8
+    mock_search.assert_not_awaited()
+
+    assert len(await async_search_locations(hass, "dummy_api", "dam 1")) == 2
+    mock_search.assert_awaited_once()
@@ -1,9 +1,28 @@
 """Tests sensor."""
 
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock
+
 import pytest
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.tomtom_travel_time.const import (
+    CONF_BEST_ORDER,
+    CONF_FORECAST,
+    CONF_LOCATIONS,
+    DOMAIN,
+    FORECAST_HORIZONS,
+    FORECAST_SAVE_DELAY,
+    FORECAST_STORE_VERSION,
+)
+from custom_components.tomtom_travel_time.forecast import profile_slot
 
-from . import setup_integration, unload_integration
+from . import get_mock_config_entry, setup_integration, unload_integration
+from .test_coordinator import STOPS, mock_best_order
 
 
 @pytest.mark.parametrize(
@@ -24,3 +43,88 @@ async def test_state(hass: HomeAssistant, entity: str, value: str) -> None:
     assert state.state == value
 
     await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_forecast_state(hass: HomeAssistant) -> None:
+    """Test that forecast sensors are added with the option, and forecast the current duration after the first update."""
+    config_entry = get_mock_config_entry(options={CONF_FORECAST: True})
+    await setup_integration(hass, config_entry)
+
+    for minutes in FORECAST_HORIZONS:
+        state = hass.states.get(f"sensor.from_a_to_b_expected_duration_in_{minutes}_minutes")
+        assert state
+        assert state.state == "6.0"
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_forecast_removed(hass: HomeAssistant, entity_registry: er.EntityRegistry) -> None:
+    """Test that the coordinator stops forecasting when the last forecast sensor is removed."""
+    config_entry = get_mock_config_entry(options={CONF_FORECAST: True})
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+
+    *others, last = FORECAST_HORIZONS
+    for minutes in others:
+        entity_registry.async_remove(f"sensor.from_a_to_b_expected_duration_in_{minutes}_minutes")
+    await hass.async_block_till_done()
+    assert coordinator.forecast is not None
+
+    entity_registry.async_remove(f"sensor.from_a_to_b_expected_duration_in_{last}_minutes")
+    await hass.async_block_till_done()
+    assert coordinator.forecast is None
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_forecast_saved(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test that the weekly profile is loaded in setup and saved after a delay, and removed with the entry."""
+    key = f"{DOMAIN}.forecast.test_entry"
+    weekday, slot = profile_slot(dt_util.utcnow() + timedelta(days=1))
+    hass_storage[key] = {"version": FORECAST_STORE_VERSION, "key": key, "data": {"profile": [[weekday, slot, 30.0]]}}
+    config_entry = get_mock_config_entry(options={CONF_FORECAST: True})
+    await setup_integration(hass, config_entry)
+    forecast = config_entry.runtime_data.forecast
+    assert forecast is not None
+    assert forecast.as_dict()["profile_slots"] == 2
+
+    # The next update schedules the save.
+    await config_entry.runtime_data.async_refresh()
+    for _ in range(2):
+        # Every update pushes the save back, the first timer moves itself to the later save when it fires.
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=FORECAST_SAVE_DELAY + 1))
+        await hass.async_block_till_done()
+    assert len(hass_storage[key]["data"]["profile"]) == 2
+
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert key not in hass_storage
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_forecast_disabled(hass: HomeAssistant) -> None:
+    """Test that forecast sensors aren't added without the option, and the coordinator doesn't forecast."""
+    config_entry = await setup_integration(hass)
+
+    assert hass.states.get("sensor.from_a_to_b_expected_duration_in_15_minutes") is None
+    assert config_entry.runtime_data.forecast is None
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_waypoint_order_state(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that the best order of the stops is numbered by their position in the entry, with the stops in that order as attribute."""
+    mock_best_order(mock_routing_api, [1, 2, 0])
+    config_entry = get_mock_config_entry(data={CONF_LOCATIONS: STOPS}, options={CONF_BEST_ORDER: True})
+    await setup_integration(hass, config_entry)
+
+    state = hass.states.get("sensor.from_a_to_b_best_order_of_stops")
+    assert state
+    assert state.state == "3, 1, 2"
+    assert state.attributes["stops"] == [STOPS[3], STOPS[1], STOPS[2]]
+
+    await unload_integration(hass, config_entry)
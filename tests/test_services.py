@@ -0,0 +1,297 @@
+"""Test services."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.const import CONF_API_KEY, CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.setup import async_setup_component
+
+from custom_components.tomtom_travel_time.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_FILE,
+    ATTR_ROUTES,
+    CONF_LOCATIONS,
+    CONF_VEHICLE_TYPE,
+    DOMAIN,
+    SERVICE_CALCULATE_ROUTE,
+    SERVICE_IMPORT_ROUTES,
+)
+from tomtom_apis import TomTomAPIServerError
+
+from . import get_mock_config_entry, get_mock_reachable_range_config_entry, setup_integration, unload_integration
+
+LOCATIONS = ["52.377956, 4.897071", "51.926517, 4.462456"]
+# Locations of imported routes, the route of the mock entry would be skipped as a duplicate.
+IMPORT_LOCATIONS = ["52.3731, 4.8926", "51.926517, 4.462456"]
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_calculate_route(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test the calculate route service."""
+    config_entry = await setup_integration(hass)
+    mock_routing_api.get_calculate_route.reset_mock()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CALCULATE_ROUTE,
+        {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, CONF_LOCATIONS: LOCATIONS},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        "duration": 6,
+        "distance": 1.146,
+        "delay": 2,
+        "locations": ["52.377956,4.897071", "51.926517,4.462456"],
+    }
+    mock_routing_api.get_calculate_route.assert_awaited_once()
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_calculate_route_cached(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that repeated calls with nearly identical locations are served from the cache."""
+    config_entry = await setup_integration(hass)
+    mock_routing_api.get_calculate_route.reset_mock()
+
+    for locations in (LOCATIONS, ["52.377951, 4.897069", "51.926517, 4.462456"]):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CALCULATE_ROUTE,
+            {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, CONF_LOCATIONS: locations},
+            blocking=True,
+            return_response=True,
+        )
+    mock_routing_api.get_calculate_route.assert_awaited_once()
+
+    # Different options result in a different cache key.
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CALCULATE_ROUTE,
+        {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, CONF_LOCATIONS: LOCATIONS, CONF_VEHICLE_TYPE: "bicycle"},
+        blocking=True,
+        return_response=True,
+    )
+    assert mock_routing_api.get_calculate_route.await_count == 2
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_calculate_route_invalid_entry(hass: HomeAssistant) -> None:
+    """Test the calculate route service with an unknown config entry."""
+    config_entry = await setup_integration(hass)
+
+    with pytest.raises(ServiceValidationError) as exc:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CALCULATE_ROUTE,
+            {ATTR_CONFIG_ENTRY_ID: "unknown", CONF_LOCATIONS: LOCATIONS},
+            blocking=True,
+            return_response=True,
+        )
+    assert exc.value.translation_key == "invalid_config_entry"
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_reachable_range")
+async def test_calculate_route_reachable_range_entry(hass: HomeAssistant) -> None:
+    """Test that the calculate route service rejects a reachable range entry."""
+    config_entry = await setup_integration(hass, get_mock_reachable_range_config_entry())
+
+    with pytest.raises(ServiceValidationError) as exc:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CALCULATE_ROUTE,
+            {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, CONF_LOCATIONS: LOCATIONS},
+            blocking=True,
+            return_response=True,
+        )
+    assert exc.value.translation_key == "invalid_config_entry"
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_calculate_route_entry_not_loaded(hass: HomeAssistant) -> None:
+    """Test the calculate route service with a config entry that is not loaded."""
+    config_entry = await setup_integration(hass)
+    other_entry = get_mock_config_entry("other_entry")
+    other_entry.add_to_hass(hass)
+
+    with pytest.raises(ServiceValidationError) as exc:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CALCULATE_ROUTE,
+            {ATTR_CONFIG_ENTRY_ID: other_entry.entry_id, CONF_LOCATIONS: LOCATIONS},
+            blocking=True,
+            return_response=True,
+        )
+    assert exc.value.translation_key == "config_entry_not_loaded"
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_calculate_route_cannot_determine_location(hass: HomeAssistant) -> None:
+    """Test the calculate route service with a location that cannot be resolved."""
+    config_entry = await setup_integration(hass)
+
+    with (
+        patch("custom_components.tomtom_travel_time.services.lat_lon_from_user_input", return_value=None),
+        pytest.raises(ServiceValidationError) as exc,
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CALCULATE_ROUTE,
+            {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, CONF_LOCATIONS: LOCATIONS},
+            blocking=True,
+            return_response=True,
+        )
+    assert exc.value.translation_key == "cannot_determine_location"
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_calculate_route_api_error(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test the calculate route service when the API fails."""
+    config_entry = await setup_integration(hass)
+    mock_routing_api.get_calculate_route.side_effect = TomTomAPIServerError
+
+    with pytest.raises(HomeAssistantError) as exc:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CALCULATE_ROUTE,
+            {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, CONF_LOCATIONS: LOCATIONS},
+            blocking=True,
+            return_response=True,
+        )
+    assert exc.value.translation_key == "cannot_calculate_route"
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_data", "mock_batch")
+async def test_import_routes(hass: HomeAssistant) -> None:
+    """Test the import routes service with a list of routes."""
+    config_entry = await setup_integration(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_IMPORT_ROUTES,
+        {
+            ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+            ATTR_ROUTES: [{CONF_NAME: "Home to work", CONF_LOCATIONS: IMPORT_LOCATIONS}, {CONF_LOCATIONS: IMPORT_LOCATIONS[:1]}],
+        },
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+
+    assert response
+    assert response["created"] == 1
+    assert response["failed"] == 1
+    rows = response[ATTR_ROUTES]
+    assert isinstance(rows, list)
+    assert rows[1] == {
+        "row": 2,
+        "name": "TomTom Travel Time",
+        "locations": IMPORT_LOCATIONS[:1],
+        "error": "at_least_two_locations",
+        "detail": None,
+        "entry_id": None,
+    }
+    assert len(hass.config_entries.async_entries(DOMAIN)) == 2
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_data", "mock_batch")
+async def test_import_routes_file(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test the import routes service with a CSV file in the config directory."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "routes.csv").write_text(f'Home to work,"{IMPORT_LOCATIONS[0]}","{IMPORT_LOCATIONS[1]}"\n', encoding="utf-8")
+    config_entry = await setup_integration(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_IMPORT_ROUTES,
+        {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, ATTR_FILE: "routes.csv"},
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+
+    assert response
+    assert response["created"] == 1
+    assert hass.config_entries.async_entries(DOMAIN)[1].title == "Home to work"
+    assert hass.config_entries.async_entries(DOMAIN)[1].data[CONF_API_KEY] == "test_api_key"
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_data")
+@pytest.mark.parametrize(
+    ("file", "content", "translation_key"),
+    [
+        ("../routes.csv", None, "import_file_not_allowed"),
+        ("missing.csv", None, "invalid_import_file"),
+        ("routes.yaml", "name: Not a list", "invalid_import_file"),
+    ],
+)
+async def test_import_routes_invalid_file(hass: HomeAssistant, tmp_path: Path, file: str, content: str | None, translation_key: str) -> None:
+    """Test the import routes service with a file that can't be used."""
+    hass.config.config_dir = str(tmp_path / "config")
+    (tmp_path / "config").mkdir()
+    if content is not None:
+        (tmp_path / "config" / file).write_text(content, encoding="utf-8")
+    config_entry = await setup_integration(hass)
+
+    with pytest.raises(ServiceValidationError) as exc:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_ROUTES,
+            {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, ATTR_FILE: file},
+            blocking=True,
+            return_response=True,
+        )
+    assert exc.value.translation_key == translation_key
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_import_routes_api_error(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test the import routes service when the batch request fails."""
+    mock_routing_api.post.side_effect = TomTomAPIServerError
+    config_entry = await setup_integration(hass)
+
+    with pytest.raises(HomeAssistantError) as exc:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_ROUTES,
+            {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, ATTR_ROUTES: [{CONF_LOCATIONS: IMPORT_LOCATIONS}]},
+            blocking=True,
+            return_response=True,
+        )
+    assert exc.value.translation_key == "cannot_validate_routes"
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_import_routes_invalid_config_entry(hass: HomeAssistant) -> None:
+    """Test that the import routes service needs an existing entry for the API key."""
+    assert await async_setup_component(hass, DOMAIN, {})
+
+    with pytest.raises(ServiceValidationError) as exc:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_ROUTES,
+            {ATTR_CONFIG_ENTRY_ID: "missing", ATTR_ROUTES: [{CONF_LOCATIONS: IMPORT_LOCATIONS}]},
+            blocking=True,
+            return_response=True,
+        )
+    assert exc.value.translation_key == "invalid_config_entry"
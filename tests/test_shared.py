@@ -0,0 +1,87 @@
+"""Test shared coordinators."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from custom_components.tomtom_travel_time.cache import entry_route_key
+from custom_components.tomtom_travel_time.const import CONF_LOCATIONS, DEFAULT_OPTIONS
+from custom_components.tomtom_travel_time.shared import DATA_SHARED_COORDINATORS, async_find_duplicate_entry
+
+from . import get_mock_config_data, get_mock_config_entry, setup_integration, unload_integration
+
+
+def test_entry_route_key() -> None:
+    """Test that coordinates are rounded, and entity locations are compared by text."""
+    data = get_mock_config_data()
+    key = entry_route_key(data, DEFAULT_OPTIONS)
+
+    assert key == entry_route_key({**data, CONF_LOCATIONS: ["52.3779561,4.8970712", "51.926517, 4.462456"]}, DEFAULT_OPTIONS)
+    assert key != entry_route_key({**data, CONF_LOCATIONS: ["51.926517, 4.462456", "52.377956, 4.897071"]}, DEFAULT_OPTIONS)
+    assert key != entry_route_key(data, {**DEFAULT_OPTIONS, "vehicle_type": "bicycle"})
+    assert key != entry_route_key({**data, "api_key": "other_api_key"}, DEFAULT_OPTIONS)
+    assert entry_route_key({**data, CONF_LOCATIONS: ["Device_Tracker.Phone ", "zone.home"]}, DEFAULT_OPTIONS) == entry_route_key(
+        {**data, CONF_LOCATIONS: ["device_tracker.phone", "zone.home"]},
+        DEFAULT_OPTIONS,
+    )
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_shared_coordinator(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that entries with an identical route share one coordinator, which is shut down when the last entry is unloaded."""
+    first = get_mock_config_entry("first")
+    second = get_mock_config_entry("second")
+    first.add_to_hass(hass)
+    second.add_to_hass(hass)
+    # Setting up the integration sets up both entries at the same time.
+    assert await hass.config_entries.async_setup(first.entry_id)
+    await hass.async_block_till_done()
+
+    assert first.runtime_data is second.runtime_data
+    assert len(hass.data[DATA_SHARED_COORDINATORS]) == 1
+    mock_routing_api.get_calculate_route.assert_awaited_once()
+
+    await unload_integration(hass, first)
+    assert len(hass.data[DATA_SHARED_COORDINATORS]) == 1
+    assert second.state is ConfigEntryState.LOADED
+
+    await unload_integration(hass, second)
+    assert not hass.data[DATA_SHARED_COORDINATORS]
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_shared_coordinator_options_changed(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that an entry moves to another coordinator when its options change."""
+    first = await setup_integration(hass, get_mock_config_entry("first"))
+    second = await setup_integration(hass, get_mock_config_entry("second"))
+    assert first.runtime_data is second.runtime_data
+
+    hass.config_entries.async_update_entry(second, options={**DEFAULT_OPTIONS, "vehicle_type": "bicycle"})
+    await hass.async_block_till_done()
+
+    assert first.runtime_data is not second.runtime_data
+    assert len(hass.data[DATA_SHARED_COORDINATORS]) == 2
+    assert mock_routing_api.get_calculate_route.await_count == 2
+
+
+async def test_shared_coordinator_not_ready(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that a failed first refresh releases the coordinator."""
+    mock_routing_api.get_calculate_route.side_effect = Exception("API error")
+    config_entry = get_mock_config_entry()
+    config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+
+    assert config_entry.state is ConfigEntryState.SETUP_RETRY
+    assert not hass.data[DATA_SHARED_COORDINATORS]
+
+
+async def test_find_duplicate_entry(hass: HomeAssistant) -> None:
+    """Test finding an entry with an identical route."""
+    config_entry = get_mock_config_entry()
+    config_entry.add_to_hass(hass)
+
+    assert async_find_duplicate_entry(hass, get_mock_config_data(), DEFAULT_OPTIONS) is config_entry
+    assert async_find_duplicate_entry(hass, get_mock_config_data(), {**DEFAULT_OPTIONS, "route_type": "eco"}) is None
@@ -0,0 +1,245 @@
+"""Test the shared result store."""
+
+import sqlite3
+from pathlib import Path
+from typing import cast
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryError
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.tomtom_travel_time.const import (
+    CONF_BEST_ORDER,
+    CONF_LOCAL_ENGINE,
+    CONF_LOCATIONS,
+    CONF_SHARED_STORE,
+    SHARED_STORE_MEMORY,
+    SHARED_STORE_WAIT,
+)
+from custom_components.tomtom_travel_time.coordinator import TomTomDataUpdateCoordinator
+from custom_components.tomtom_travel_time.helpers import lat_lon_from_user_input
+from custom_components.tomtom_travel_time.model import TomTomTravelTimeData
+from custom_components.tomtom_travel_time.store import (
+    MemorySharedStore,
+    SQLiteSharedStore,
+    async_get_or_refresh,
+    async_get_shared_store,
+)
+from tomtom_apis.models import LatLon
+
+from . import get_mock_config_entry
+from .test_backend import ENGINE, OSRM_RESPONSE, ROUTE_URL
+from .test_coordinator import STOPS, mock_best_order
+
+
+def other_instance(store: MemorySharedStore) -> MemorySharedStore:
+    """Return a store of another instance, with its own owner ID on the same values and claims."""
+    other = MemorySharedStore()
+    other._results = store._results  # pylint: disable=protected-access # noqa: SLF001
+    other._claims = store._claims  # pylint: disable=protected-access # noqa: SLF001
+    return other
+
+
+async def test_shared_store_not_allowed(hass: HomeAssistant) -> None:
+    """Test that a store file must be in the config directory or an allowed directory."""
+    with pytest.raises(ConfigEntryError):
+        async_get_shared_store(hass, "/etc/tomtom.db")
+
+
+async def test_memory_store(hass: HomeAssistant) -> None:
+    """Test that values expire after their TTL, and a claim excludes only other owners."""
+    store = async_get_shared_store(hass, SHARED_STORE_MEMORY)
+    assert isinstance(store, MemorySharedStore)
+    assert async_get_shared_store(hass, SHARED_STORE_MEMORY) is store
+
+    with patch("custom_components.tomtom_travel_time.store.time.time", return_value=1000.0) as mock_time:
+        await store.async_set("key", {"value": 1}, 60)
+        assert await store.async_get("key") == {"value": 1}
+
+        mock_time.return_value = 1060.0
+        assert await store.async_get("key") is None
+
+    assert await store.async_claim("key", 30)
+    assert await store.async_claim("key", 30)
+    other = other_instance(store)
+    assert not await other.async_claim("key", 30)
+    await store.async_release("key")
+    assert await other.async_claim("key", 30)
+
+
+async def test_sqlite_store(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test that two instances on the same file see each other's values and claims."""
+    first = SQLiteSharedStore(hass, tmp_path / "tomtom.db")
+    second = SQLiteSharedStore(hass, tmp_path / "tomtom.db")
+
+    assert await first.async_claim("key", 30)
+    assert not await second.async_claim("key", 30)
+
+    await first.async_set("key", {"duration": 6.0}, 60)
+    await first.async_release("key")
+
+    assert await second.async_get("key") == {"duration": 6.0}
+    assert await second.async_claim("key", 30)
+    assert await second.async_get("other") is None
+
+
+async def test_sqlite_store_expired_claim(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test that a claim of an instance that stopped can be taken over once it expired."""
+    first = SQLiteSharedStore(hass, tmp_path / "tomtom.db")
+    second = SQLiteSharedStore(hass, tmp_path / "tomtom.db")
+
+    with patch("custom_components.tomtom_travel_time.store.time.time", return_value=1000.0) as mock_time:
+        assert await first.async_claim("key", 30)
+        mock_time.return_value = 1030.0
+        assert await second.async_claim("key", 30)
+
+
+async def test_sqlite_store_error(hass: HomeAssistant, tmp_path: Path, caplog: LogCaptureFixture) -> None:
+    """Test that an unusable store is logged, and values are refreshed locally."""
+    store = SQLiteSharedStore(hass, tmp_path / "missing" / "tomtom.db")
+
+    assert await store.async_get("key") is None
+    assert await store.async_claim("key", 30)
+    await store.async_set("key", {"value": 1}, 60)
+    await store.async_release("key")
+
+    assert "Cannot use the shared store" in caplog.text
+
+
+async def test_get_or_refresh() -> None:
+    """Test that a published value is used, and a missing value is refreshed, published and released."""
+    store = MemorySharedStore()
+    refresh = AsyncMock(return_value={"value": 1})
+
+    assert await async_get_or_refresh(store, "key", 60, refresh) == {"value": 1}
+    assert await async_get_or_refresh(store, "key", 60, refresh) == {"value": 1}
+
+    refresh.assert_awaited_once()
+    assert not store._claims  # pylint: disable=protected-access # noqa: SLF001
+
+
+async def test_get_or_refresh_waits_for_claim() -> None:
+    """Test that the result of the instance with the claim is awaited."""
+    store = MemorySharedStore()
+    other = other_instance(store)
+    assert await other.async_claim("key", 30)
+    refresh = AsyncMock(return_value={"value": 2})
+
+    async def publish(_: float) -> None:
+        await other.async_set("key", {"value": 1}, 60)
+
+    with patch("custom_components.tomtom_travel_time.store.asyncio.sleep", side_effect=publish) as mock_sleep:
+        assert await async_get_or_refresh(store, "key", 60, refresh) == {"value": 1}
+
+    mock_sleep.assert_awaited_once()
+    refresh.assert_not_awaited()
+
+
+async def test_get_or_refresh_claim_timeout() -> None:
+    """Test that the value is refreshed anyway when the instance with the claim doesn't publish it in time."""
+    store = MemorySharedStore()
+    other = other_instance(store)
+    assert await other.async_claim("key", 30)
+    refresh = AsyncMock(return_value={"value": 2})
+
+    with patch("custom_components.tomtom_travel_time.store.asyncio.sleep") as mock_sleep:
+        assert await async_get_or_refresh(store, "key", 60, refresh) == {"value": 2}
+
+    assert mock_sleep.await_count == SHARED_STORE_WAIT
+    refresh.assert_awaited_once()
+    # The claim of the other instance is left alone.
+    assert await other.async_claim("key", 30)
+    assert not await store.async_claim("key", 30)
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_coordinators_share_route(hass: HomeAssistant, mock_routing_api: AsyncMock, tmp_path: Path) -> None:
+    """Test that coordinators of different instances on the same store request the route once."""
+    path = str(tmp_path / "tomtom.db")
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    config_entry = get_mock_config_entry(options={CONF_SHARED_STORE: path})
+
+    first = TomTomDataUpdateCoordinator(hass=hass, config_entry=config_entry, api_key="dummy_api")
+    second = TomTomDataUpdateCoordinator(hass=hass, config_entry=config_entry, api_key="dummy_api")
+    # The second coordinator acts like another instance, with its own owner ID for the claims.
+    second._store = SQLiteSharedStore(hass, Path(path))  # pylint: disable=protected-access # noqa: SLF001
+
+    results = [await coordinator._async_update_data() for coordinator in (first, second)]  # pylint: disable=protected-access # noqa: SLF001
+
+    assert results == [TomTomTravelTimeData(duration=6, distance=1.146, delay=2)] * 2
+    mock_routing_api.get_calculate_route.assert_awaited_once()
+
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM claims").fetchone() == (0,)
+
+
+async def test_geocode_shared(hass: HomeAssistant, mock_geocode: AsyncMock) -> None:
+    """Test that a geocoded location is published, and used by other instances without geocoding again."""
+    store = MemorySharedStore()
+
+    first = await lat_lon_from_user_input(hass, "dummy_api", "Dam 1, Amsterdam", store)
+    second = await lat_lon_from_user_input(hass, "dummy_api", " dam 1,  amsterdam", store)
+
+    assert first is not None
+    assert second is not None
+    assert first.location == second.location == LatLon(lat=52.3731, lon=4.8926)
+    assert second.geocoded
+    mock_geocode.assert_awaited_once()
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_coordinators_share_geometry(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that an instance that uses the shared result keeps the geometry of the route for a map."""
+    config_entry = get_mock_config_entry(options={CONF_SHARED_STORE: SHARED_STORE_MEMORY})
+
+    first = TomTomDataUpdateCoordinator(hass=hass, config_entry=config_entry, api_key="dummy_api")
+    second = TomTomDataUpdateCoordinator(hass=hass, config_entry=config_entry, api_key="dummy_api")
+    second._store = other_instance(cast("MemorySharedStore", first._store))  # pylint: disable=protected-access # noqa: SLF001
+    second.keep_geometry = True
+
+    for coordinator in (first, second):
+        await coordinator._async_update_data()  # pylint: disable=protected-access # noqa: SLF001
+
+    mock_routing_api.get_calculate_route.assert_awaited_once()
+    assert first.geometry is None
+    assert second.geometry is not None
+    assert second.geometry.points == 30
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_coordinators_best_order_not_shared(hass: HomeAssistant, mock_routing_api: AsyncMock) -> None:
+    """Test that a route with its stops in the best order and the route along the same stops as given aren't shared."""
+    mock_best_order(mock_routing_api, [1, 2, 0])
+    options = {CONF_SHARED_STORE: SHARED_STORE_MEMORY}
+    data = {CONF_LOCATIONS: STOPS}
+
+    best_order = TomTomDataUpdateCoordinator(
+        hass=hass,
+        config_entry=get_mock_config_entry(data=data, options={**options, CONF_BEST_ORDER: True}),
+        api_key="dummy_api",
+    )
+    as_given = TomTomDataUpdateCoordinator(hass=hass, config_entry=get_mock_config_entry(data=data, options=options), api_key="dummy_api")
+
+    assert (await best_order._async_update_data()).waypoint_order == (2, 0, 1)  # pylint: disable=protected-access # noqa: SLF001
+    assert (await as_given._async_update_data()).waypoint_order is None  # pylint: disable=protected-access # noqa: SLF001
+    mock_routing_api.get_calculate_route.assert_awaited_once()
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_coordinators_local_engine_not_shared(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, mock_routing_api: AsyncMock) -> None:
+    """Test that the estimate of a local engine isn't shared with entries that use the TomTom route."""
+    aioclient_mock.get(ROUTE_URL, json=OSRM_RESPONSE)
+    options = {CONF_SHARED_STORE: SHARED_STORE_MEMORY}
+    local = TomTomDataUpdateCoordinator(
+        hass=hass,
+        config_entry=get_mock_config_entry(options={**options, CONF_LOCAL_ENGINE: f"{ENGINE}/"}),
+        api_key="dummy_api",
+    )
+    tomtom = TomTomDataUpdateCoordinator(hass=hass, config_entry=get_mock_config_entry(options=options), api_key="dummy_api")
+
+    assert await local._async_update_data() == TomTomTravelTimeData(duration=27, distance=25.0, delay=2)  # pylint: disable=protected-access # noqa: SLF001
+    assert await tomtom._async_update_data() == TomTomTravelTimeData(duration=6, distance=1.146, delay=2)  # pylint: disable=protected-access # noqa: SLF001
+    assert mock_routing_api.get_calculate_route.await_count == 2
@@ -0,0 +1,43 @@
+"""Test thresholds."""
+
+import pytest
+
+from custom_components.tomtom_travel_time.model import TomTomTravelTimeData
+from custom_components.tomtom_travel_time.threshold import Threshold
+
+
+def data(delay: float) -> TomTomTravelTimeData:
+    """Return travel time data with the delay."""
+    return TomTomTravelTimeData(duration=30, distance=25.0, delay=delay)
+
+
+@pytest.mark.parametrize(
+    ("delays", "expected"),
+    [
+        ([5, 9, 10], [False, False, True]),
+        ([10, 9, 8, 7.9], [True, True, True, False]),
+        ([7, 9, 10, 8, 9], [False, False, True, True, True]),
+    ],
+)
+def test_hysteresis(delays: list[float], expected: list[bool]) -> None:
+    """Test that the threshold is crossed at the limit, and cleared below the limit minus the hysteresis."""
+    threshold = Threshold("delay", 10, 2)
+    states: list[bool | None] = []
+    for delay in delays:
+        threshold.update(data(delay))
+        states.append(threshold.is_on)
+
+    assert states == expected
+
+
+def test_changed() -> None:
+    """Test that an update only reports a change when the threshold is crossed or cleared."""
+    threshold = Threshold("delay", 10, 2)
+
+    assert not threshold.update(None)
+    assert threshold.is_on is None
+    assert threshold.update(data(5))
+    assert not threshold.update(data(9))
+    assert threshold.update(data(10))
+    assert not threshold.update(data(11))
+    assert threshold.update(None)
@@ -0,0 +1,114 @@
+"""Test HTTP views."""
+
+from http import HTTPStatus
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from custom_components.tomtom_travel_time.const import CONF_ROUTE_GEOMETRY, DOMAIN
+from custom_components.tomtom_travel_time.geometry import encode_polyline
+from custom_components.tomtom_travel_time.shared import DATA_SHARED_COORDINATORS
+
+from . import get_mock_config_entry, get_mock_reachable_range_config_entry, setup_integration, unload_integration
+
+
+def get_mock_geometry_config_entry(entry_id: str = "test_entry", *, route_geometry: bool = True) -> MockConfigEntry:
+    """Create a mock config entry that serves its route geometry."""
+    return get_mock_config_entry(entry_id, options={CONF_ROUTE_GEOMETRY: route_geometry})
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_route_geometry(hass: HomeAssistant, hass_client: ClientSessionGenerator) -> None:
+    """Test that the geometry is served with an ETag, and a matching ETag is answered without a body."""
+    config_entry = await setup_integration(hass, get_mock_geometry_config_entry())
+    client = await hass_client()
+
+    response = await client.get(f"/api/{DOMAIN}/route_geometry/{config_entry.entry_id}")
+
+    assert response.status == HTTPStatus.OK
+    result = await response.json()
+    assert result["points"] == 30
+    assert result["precision"] == 5
+    # The route of the fixture starts in Berlin.
+    assert result["polyline"].startswith(encode_polyline([(52.50931, 13.42937)]))
+    etag = response.headers["ETag"]
+    assert etag == f'"{config_entry.runtime_data.geometry.etag}"'
+
+    response = await client.get(f"/api/{DOMAIN}/route_geometry/{config_entry.entry_id}", headers={"If-None-Match": etag})
+
+    assert response.status == HTTPStatus.NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert await response.read() == b""
+
+    # A refresh with the same route keeps the ETag.
+    await config_entry.runtime_data.async_refresh()
+    response = await client.get(f"/api/{DOMAIN}/route_geometry/{config_entry.entry_id}", headers={"If-None-Match": etag})
+    assert response.status == HTTPStatus.NOT_MODIFIED
+
+    await unload_integration(hass, config_entry)
+
+    response = await client.get(f"/api/{DOMAIN}/route_geometry/{config_entry.entry_id}")
+    assert response.status == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.usefixtures("mocked_data", "mocked_reachable_range")
+async def test_route_geometry_not_found(hass: HomeAssistant, hass_client: ClientSessionGenerator) -> None:
+    """Test that only entries with the option serve their geometry, and that it isn't kept without the option."""
+    config_entry = await setup_integration(hass, get_mock_geometry_config_entry(route_geometry=False))
+    range_entry = get_mock_reachable_range_config_entry()
+    range_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(range_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_client()
+
+    for entry_id in (config_entry.entry_id, range_entry.entry_id, "unknown"):
+        response = await client.get(f"/api/{DOMAIN}/route_geometry/{entry_id}")
+        assert response.status == HTTPStatus.NOT_FOUND
+
+    assert config_entry.runtime_data.geometry is None
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_route_geometry_requires_auth(hass: HomeAssistant, hass_client_no_auth: ClientSessionGenerator) -> None:
+    """Test that the geometry isn't served to clients that aren't authenticated."""
+    config_entry = await setup_integration(hass, get_mock_geometry_config_entry())
+    client = await hass_client_no_auth()
+
+    response = await client.get(f"/api/{DOMAIN}/route_geometry/{config_entry.entry_id}")
+
+    assert response.status == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_route_geometry_shared(hass: HomeAssistant) -> None:
+    """Test that a shared coordinator keeps the geometry while one of its entries serves it."""
+    first = get_mock_geometry_config_entry("first", route_geometry=False)
+    second = get_mock_geometry_config_entry("second")
+    first.add_to_hass(hass)
+    second.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(first.entry_id)
+    await hass.async_block_till_done()
+
+    (shared,) = hass.data[DATA_SHARED_COORDINATORS].values()
+    assert shared.coordinator.keep_geometry
+
+    await unload_integration(hass, second)
+
+    assert not shared.coordinator.keep_geometry
+
+
+@pytest.mark.usefixtures("mocked_data")
+async def test_metrics(hass: HomeAssistant, hass_client: ClientSessionGenerator) -> None:
+    """Test that the metrics are served in the Prometheus text format."""
+    config_entry = await setup_integration(hass)
+    client = await hass_client()
+
+    response = await client.get(f"/api/{DOMAIN}/metrics")
+
+    assert response.status == HTTPStatus.OK
+    assert response.headers["Content-Type"] == "text/plain; version=0.0.4; charset=utf-8"
+    assert 'tomtom_travel_time_requests_total{endpoint="calculate_route"} 1' in (await response.text()).splitlines()
+
+    await unload_integration(hass, config_entry)